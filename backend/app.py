@@ -1,214 +1,995 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, send_file, Response, g
 from flask_cors import CORS
 import os
 import mysql.connector
-from database import create_connection, init_db
-from docx_parser import DocxQuestionParser
+from database import (get_connection, init_db, pool_stats, QUESTION_INSERT_COLUMNS,
+                      insert_questions_bulk, insert_questions_per_row, BULK_INSERT_CHUNK_SIZE,
+                      upsert_questions, find_document, record_document)
+from question_stats import (stat_deltas, apply_stat_deltas, read_stats, ensure_stats_seeded,
+                            start_reconciler)
+from docx_parser import DocxQuestionParser, parse_docx_files, PARSER_VERSION
+from jobs import JobManager
+from cache import TTLCache
+from image_store import ImageStore, ImageCatalog, file_sha256
+from uploads import StreamingUploadRequest, claim_upload, upload_info, upload_sha256
+from thumbnails import ThumbnailCache, ThumbnailError, OUTPUT_FORMATS, thumbnails_available
+from text_classify import count_scripts, search_terms, highlight_snippet, question_fingerprint
+from logging_setup import configure_logging
+from metrics import REGISTRY, REQUEST_SECONDS, CONTENT_TYPE as METRICS_CONTENT_TYPE, stage_timer, set_current_operation
 from werkzeug.utils import secure_filename
 import json
-import traceback
+import logging
+from collections import Counter
+import uuid
+import base64
+import threading
+import time
+import shutil
+import tempfile
+import zipfile
 from datetime import datetime
-import re  # Add this import for language detection
 
 app = Flask(__name__)
+# Uploaded files stream straight to uniquely named temp files, see uploads.py
+app.request_class = StreamingUploadRequest
 CORS(app)
 
 # Configuration
 app.config['UPLOAD_FOLDER'] = 'uploads'
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_UPLOAD_MB', 512)) * 1024 * 1024  # whole request body
+app.config['UPLOAD_TEMP_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'incoming')  # streamed uploads
+app.config['UPLOAD_CHECKSUM'] = os.environ.get('UPLOAD_CHECKSUM', 'sha256')  # computed while streaming; '' = off
+app.config['BULK_INSERT'] = True  # chunked multi-row INSERTs instead of one statement per question
+app.config['INSERT_CHUNK_SIZE'] = BULK_INSERT_CHUNK_SIZE
+app.config['ASYNC_UPLOADS'] = False  # default for uploads that don't pass async=true
+app.config['INGEST_WORKERS'] = int(os.environ.get('INGEST_WORKERS', 2))
+app.config['STREAM_BATCH_SIZE'] = 500  # rows fetched per round trip when streaming NDJSON
+app.config['QUERY_CACHE_SIZE'] = int(os.environ.get('QUERY_CACHE_SIZE', 1024))  # cached questions + list pages
+app.config['QUERY_CACHE_TTL'] = int(os.environ.get('QUERY_CACHE_TTL', 30))  # seconds
+app.config['LIST_CACHE_MAX_PAGE'] = 5  # only the first pages of /api/questions are cached
+app.config['LIST_TEXT_PREVIEW_CHARS'] = int(os.environ.get('LIST_TEXT_PREVIEW_CHARS', 200))  # compact list view
+app.config['SEARCH_SNIPPET_CHARS'] = 160  # length of the highlighted excerpts in search results
+app.config['IMAGE_CACHE_MAX_AGE'] = 24 * 60 * 60  # Cache-Control max-age for legacy /api/images names, seconds
+app.config['IMMUTABLE_IMAGE_MAX_AGE'] = 365 * 24 * 60 * 60  # content-addressed (hashed) image names
+app.config['COUNT_CACHE_TTL'] = 60  # seconds an approximate list total may be reused
+app.config['IMAGE_NEGATIVE_TTL'] = int(os.environ.get('IMAGE_NEGATIVE_TTL', 60))  # seconds a missing image name is remembered
+app.config['THUMBNAIL_CACHE_MAX_BYTES'] = int(os.environ.get('THUMBNAIL_CACHE_MAX_MB', 256)) * 1024 * 1024  # ?w=/?h= derivatives
+app.config['THUMBNAIL_MAX_DIMENSION'] = 2048  # largest w/h a client may request
+app.config['PARSE_WORKERS'] = int(os.environ.get('PARSE_WORKERS', 0)) or None  # None = one per core
+app.config['PARSE_ENGINE'] = os.environ.get('PARSE_ENGINE', 'python-docx')  # or 'lxml' (streaming table reader)
+app.config['PARSE_CACHE_MAX_BYTES'] = int(os.environ.get('PARSE_CACHE_MAX_MB', 256)) * 1024 * 1024  # 0 disables
 ALLOWED_EXTENSIONS = {'docx'}
+ARCHIVE_EXTENSIONS = {'zip'}  # zips of .docx files for batch uploads
+app.config['ZIP_MAX_FILES'] = int(os.environ.get('ZIP_MAX_FILES', 200))  # .docx members per batch upload
+app.config['ZIP_MAX_UNCOMPRESSED_BYTES'] = int(os.environ.get('ZIP_MAX_UNCOMPRESSED_MB', 1024)) * 1024 * 1024
+
+app.config['STATS_RECONCILE_INTERVAL'] = int(os.environ.get('STATS_RECONCILE_INTERVAL', 900))  # seconds
+app.config['LOG_LEVEL'] = os.environ.get('LOG_LEVEL', 'INFO')  # DEBUG adds per-row parse and request detail
+app.config['LOG_FORMAT'] = os.environ.get('LOG_FORMAT', 'text')  # or 'json', one object per record
+
+# Log through a queue listener thread so request and parse paths never block on output
+configure_logging(app.config['LOG_LEVEL'], app.config['LOG_FORMAT'])
+logger = logging.getLogger(__name__)
 
 # Initialize database
 init_db()
 
+# Statistics are served from summary tables; seed them once and recount periodically
+_stats_connection = get_connection()
+if _stats_connection:
+    try:
+        ensure_stats_seeded(_stats_connection)
+    except Exception as e:
+        logger.error("❌ Error seeding statistics: %s", e)
+    finally:
+        _stats_connection.close()
+stats_reconciler = start_reconciler(get_connection, app.config['STATS_RECONCILE_INTERVAL'])
+
+# Background workers for async uploads
+job_manager = JobManager(max_workers=app.config['INGEST_WORKERS'])
+
+# Content-addressed image store shared with DocxQuestionParser
+image_store = ImageStore(os.path.join(app.config['UPLOAD_FOLDER'], 'images'))
+
+# Answers /api/images lookups from memory; kept current by save_questions
+image_catalog = ImageCatalog(image_store, negative_ttl=app.config['IMAGE_NEGATIVE_TTL'])
+logger.info("🖼️ Indexed %d images", image_catalog.build())
+
+# Resized/re-encoded images for /api/images?w=&h=&format=; needs Pillow
+thumbnail_cache = ThumbnailCache(os.path.join(app.config['UPLOAD_FOLDER'], 'thumbnails'),
+                                 max_bytes=app.config['THUMBNAIL_CACHE_MAX_BYTES'])
+if not thumbnails_available():
+    logger.warning("⚠️ Pillow is not installed; /api/images will ignore w, h and format")
+
+# Read cache for single questions and list pages, invalidated by every write
+query_cache = TTLCache(maxsize=app.config['QUERY_CACHE_SIZE'], ttl=app.config['QUERY_CACHE_TTL'])
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    # DB connection hold times recorded during this request are labelled with its endpoint
+    set_current_operation(request.endpoint or 'unmatched')
+
+@app.after_request
+def record_request_latency(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        REQUEST_SECONDS.observe(time.perf_counter() - started, request.method,
+                                request.endpoint or 'unmatched', str(response.status_code))
+    return response
+
+@app.teardown_request
+def clear_request_operation(error=None):
+    set_current_operation(None)
+    # Upload temp files nobody claimed (sync uploads, rejected requests) go with the request
+    request.cleanup_uploads()
+
+def collect_pool_metrics():
+    stats = pool_stats()
+    yield 'qbk_db_pool_connections', 'gauge', 'Pooled connections by state', [
+        ({'state': 'open'}, stats['open']), ({'state': 'in_use'}, stats['in_use']),
+        ({'state': 'idle'}, stats['idle']), ({'state': 'overflow'}, stats['overflow'])]
+    yield 'qbk_db_pool_size', 'gauge', 'Configured pool size and overflow limit', [
+        ({'limit': 'size'}, stats['size']), ({'limit': 'max_overflow'}, stats['max_overflow'])]
+    for counter in ('checkouts', 'timeouts', 'connections_created', 'connections_recycled',
+                    'failed_health_checks', 'overflow_closed'):
+        yield f'qbk_db_pool_{counter}_total', 'counter', f'Pool {counter.replace("_", " ")} since start', [
+            ({}, stats[counter])]
+
+def collect_cache_metrics():
+    stats = query_cache.stats()
+    yield 'qbk_query_cache_entries', 'gauge', 'Entries in the question/list read cache', [({}, stats['size'])]
+    yield 'qbk_query_cache_hit_ratio', 'gauge', 'Read cache hits / lookups since start', [({}, stats['hit_rate'])]
+    for counter in ('hits', 'misses', 'evictions', 'expirations', 'invalidations'):
+        yield f'qbk_query_cache_{counter}_total', 'counter', f'Read cache {counter} since start', [({}, stats[counter])]
+
+def collect_image_metrics():
+    stats = image_catalog.stats()
+    yield 'qbk_image_index_entries', 'gauge', 'Images known to the /api/images index', [
+        ({'kind': 'hashed'}, stats['hashed']), ({'kind': 'legacy'}, stats['legacy']),
+        ({'kind': 'negative'}, stats['negative_entries'])]
+    for counter in ('hits', 'misses'):
+        yield f'qbk_image_index_{counter}_total', 'counter', f'Image lookups answered as {counter} since start', [
+            ({}, stats[counter])]
+
+def collect_thumbnail_metrics():
+    stats = thumbnail_cache.stats()
+    yield 'qbk_thumbnail_cache_bytes', 'gauge', 'Bytes of rendered image derivatives on disk', [({}, stats['bytes'])]
+    yield 'qbk_thumbnail_cache_entries', 'gauge', 'Rendered image derivatives on disk', [({}, stats['entries'])]
+    for counter in ('hits', 'renders', 'evictions', 'failures'):
+        yield f'qbk_thumbnail_cache_{counter}_total', 'counter', f'Thumbnail cache {counter} since start', [
+            ({}, stats[counter])]
+
+REGISTRY.add_collector(collect_pool_metrics)
+REGISTRY.add_collector(collect_cache_metrics)
+REGISTRY.add_collector(collect_image_metrics)
+REGISTRY.add_collector(collect_thumbnail_metrics)
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def is_archive(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ARCHIVE_EXTENSIONS
+
 def get_language_detection(text):
     """Enhanced language detection with better accuracy"""
     if not text:
         return 'english'
     
     # Count Hindi and English characters
-    hindi_chars = len(re.findall(r'[\u0900-\u097F]', text))
-    english_chars = len(re.findall(r'[a-zA-Z]', text))
+    hindi_chars, english_chars = count_scripts(text)
     
     # If Hindi characters significantly outnumber English, it's Hindi
     if hindi_chars > english_chars * 0.5:  # More flexible threshold
         return 'hindi'
     return 'english'
 
-@app.route('/api/upload-questions', methods=['POST'])
-def upload_questions():
-    """Upload and parse DOCX questions with enhanced error handling"""
-    if 'file' not in request.files:
-        return jsonify({'error': 'No file uploaded'}), 400
+def list_cache_tags(language, question_type):
+    """Tags of every cached list page whose filters a (language, type) question matches"""
+    language = (language or '').lower()
+    question_type = (question_type or '').lower()
+    return [('list', '', ''), ('list', language, ''), ('list', '', question_type), ('list', language, question_type)]
+
+def invalidate_question_caches(question_id=None, classes=()):
+    """Drop the cached question and the list pages it could appear on.
     
-    file = request.files['file']
-    if file.filename == '':
-        return jsonify({'error': 'No file selected'}), 400
+    classes are the (language, question_type) pairs the write touched.
+    """
+    if question_id is not None:
+        query_cache.invalidate(('question', question_id))
+    tags = set()
+    for language, question_type in classes:
+        tags.update(list_cache_tags(language, question_type))
+    query_cache.invalidate_tags(*tags)
+
+def conditional_json(body, last_modified=None):
+    """JSON response carrying validators; answers 304 when the client's copy is current.
     
-    if not file or not allowed_file(file.filename):
-        return jsonify({'error': 'Invalid file type. Please upload .docx files only.'}), 400
+    The ETag is a digest of the serialized body, so it changes with any
+    visible change. Clients must revalidate (no-cache) but can reuse their
+    copy whenever it still matches.
+    """
+    response = jsonify(body)
+    response.add_etag(weak=True)
+    if last_modified:
+        response.last_modified = last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+def question_to_row(question):
+    """Map a parsed question dict to the column order of QUESTION_INSERT_COLUMNS"""
+    return (
+        question.get('question_text', ''),
+        question.get('question_text', ''),  # Using same as HTML for now
+        question.get('type', 'multiple_choice'),
+        json.dumps(question.get('options', [])),
+        question.get('correct_answer', ''),
+        question.get('solution', ''),
+        question.get('marks', 1),
+        question.get('image_path'),
+        question.get('solution_image_path'),  # New solution image field
+        get_language_detection(question.get('question_text', '')),
+        datetime.now(),
+        question.get('text_hash') or question_fingerprint(question.get('question_text', ''), question.get('options'),
+                                                          question.get('image_path'))
+    )
 
-    # Secure filename and save
-    filename = secure_filename(file.filename)
-    file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+class ArchiveLimitError(Exception):
+    """A zip upload would unpack to more files or bytes than the configured limits allow"""
+
+class IngestionError(Exception):
+    """Ingestion failure whose message is safe to return to the client as-is"""
     
-    try:
-        file.save(file_path)
-        print(f"✅ File saved: {file_path}")
-    except Exception as e:
-        return jsonify({'error': f'Error saving file: {str(e)}'}), 500
+    def __init__(self, message, files=None):
+        super().__init__(message)
+        self.files = files  # per-file reports for batch uploads
     
-    try:
-        # Parse the DOCX file
-        parser = DocxQuestionParser(app.config['UPLOAD_FOLDER'])
-        questions = parser.parse_docx(file_path)
-        
-        print(f"📊 Parsed {len(questions)} questions")
-        
-        # Enhanced language detection and statistics
-        language_stats = {
-            'english': 0,
-            'hindi': 0,
-            'with_question_images': 0,
-            'with_solution_images': 0,
-            'with_option_images': 0,
-            'multiple_choice': 0,
-            'other_types': 0
-        }
+    def to_response(self):
+        body = {'error': str(self)}
+        if self.files is not None:
+            body['files'] = self.files
+        return body
+
+def compute_upload_stats(questions):
+    """Language, type and image counters for a freshly parsed question list"""
+    language_stats = {
+        'english': 0,
+        'hindi': 0,
+        'with_question_images': 0,
+        'with_solution_images': 0,
+        'with_option_images': 0,
+        'multiple_choice': 0,
+        'other_types': 0
+    }
+    
+    # Debug print and statistics
+    for i, q in enumerate(questions):
+        language = get_language_detection(q.get('question_text', ''))
+        if language == "hindi":
+            language_stats['hindi'] += 1
+        else:
+            language_stats['english'] += 1
         
-        # Debug print and statistics
-        for i, q in enumerate(questions):
-            language = get_language_detection(q.get('question_text', ''))
-            if language == "hindi":
-                language_stats['hindi'] += 1
-            else:
-                language_stats['english'] += 1
+        if q.get('image_path'):
+            language_stats['with_question_images'] += 1
+        
+        if q.get('solution_image_path'):
+            language_stats['with_solution_images'] += 1
+        
+        # Check for option images
+        for option in q.get('options', []):
+            if option.get('image_path'):
+                language_stats['with_option_images'] += 1
+                break  # Count question once if any option has image
+        
+        if q.get('type') == 'multiple_choice':
+            language_stats['multiple_choice'] += 1
+        else:
+            language_stats['other_types'] += 1
             
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📝 Question %d (%s): %.80s...", i+1, language, q.get('question_text', ''))
             if q.get('image_path'):
-                language_stats['with_question_images'] += 1
-            
+                logger.debug("   📷 Question Image: %s", q.get('image_path'))
             if q.get('solution_image_path'):
-                language_stats['with_solution_images'] += 1
-            
-            # Check for option images
-            for option in q.get('options', []):
-                if option.get('image_path'):
-                    language_stats['with_option_images'] += 1
-                    break  # Count question once if any option has image
-            
-            if q.get('type') == 'multiple_choice':
-                language_stats['multiple_choice'] += 1
-            else:
-                language_stats['other_types'] += 1
-                
-            print(f"📝 Question {i+1} ({language}): {q.get('question_text', '')[:80]}...")
-            if q.get('image_path'):
-                print(f"   📷 Question Image: {q.get('image_path')}")
-            if q.get('solution_image_path'):
-                print(f"   📷 Solution Image: {q.get('solution_image_path')}")
+                logger.debug("   📷 Solution Image: %s", q.get('solution_image_path'))
             for j, opt in enumerate(q.get('options', [])):
                 if opt.get('image_path'):
-                    print(f"   📷 Option {chr(65+j)} Image: {opt.get('image_path')}")
+                    logger.debug("   📷 Option %s Image: %s", chr(65+j), opt.get('image_path'))
+    
+    logger.info("📈 Language Summary", extra={'event': 'upload_stats', **language_stats})
+    return language_stats
+
+def question_image_names(question):
+    """Image file names a parsed question refers to (question, solution and option images)"""
+    paths = [question.get('image_path'), question.get('solution_image_path')]
+    paths.extend(option.get('image_path') for option in question.get('options') or [] if isinstance(option, dict))
+    return [os.path.basename(path.replace('\\', '/')) for path in paths if path]
+
+def save_questions(questions, progress_callback=None):
+    """Upsert parsed questions in one transaction, keyed by their text fingerprint.
+    
+    Returns a list aligned with questions: (status, id) with status
+    'inserted', 'updated', 'unchanged' or 'duplicate' (see
+    database.upsert_questions), or None for questions skipped for having no
+    text. Uploads hold a named lock while they write so two uploads of the
+    same new question cannot both insert it.
+    """
+    connection = get_connection()
+    if not connection:
+        raise IngestionError('Database connection failed')
+    
+    cursor = None
+    locked = False
+    try:
+        cursor = connection.cursor()
+        rows = []
+        positions = []
         
-        print(f"📈 Language Summary: {language_stats}")
+        for position, question in enumerate(questions):
+            # Skip questions without text
+            if not question.get('question_text', '').strip():
+                continue
+            rows.append(question_to_row(question))
+            positions.append(position)
         
-        # Save to database with transaction
-        connection = create_connection()
-        if not connection:
-            return jsonify({'error': 'Database connection failed'}), 500
+        cursor.execute("SELECT GET_LOCK('qbk_question_upsert', 60)")
+        locked = cursor.fetchone()[0] == 1
+        if not locked:
+            raise IngestionError('Timed out waiting for another upload to finish saving')
+        
+        if app.config['BULK_INSERT']:
+            insert = lambda cursor, rows, progress_callback=None: insert_questions_bulk(
+                cursor, rows, app.config['INSERT_CHUNK_SIZE'], progress_callback=progress_callback)
+        else:
+            insert = insert_questions_per_row
+        row_outcomes, previous = upsert_questions(cursor, rows, app.config['INSERT_CHUNK_SIZE'], insert=insert,
+                                                  progress_callback=progress_callback)
+        
+        deltas = Counter()
+        classes = set()
+        changed_ids = []
+        for row, (status, question_id) in zip(rows, row_outcomes):
+            values = dict(zip(QUESTION_INSERT_COLUMNS, row))
+            if status == 'updated':
+                old = previous[question_id]
+                deltas.update(stat_deltas(old, -1))
+                classes.add((old['language'], old['question_type']))
+                values['created_at'] = old['created_at']
+                changed_ids.append(question_id)
+            elif status != 'inserted':
+                continue
+            deltas.update(stat_deltas(values))
+            classes.add((values['language'], values['question_type']))
+        apply_stat_deltas(cursor, deltas)
         
+        connection.commit()
+        for question in questions:
+            for name in question_image_names(question):
+                image_catalog.add(name)
+        invalidate_count_cache()
+        invalidate_question_caches(classes=classes)
+        for question_id in changed_ids:
+            invalidate_question_caches(question_id)
+        
+        outcomes = [None] * len(questions)
+        for position, outcome in zip(positions, row_outcomes):
+            outcomes[position] = outcome
+        return outcomes
+        
+    except IngestionError:
+        connection.rollback()
+        raise
+    except Exception as db_error:
+        connection.rollback()
+        logger.error("❌ Database error: %s", db_error)
+        raise IngestionError(f'Database error: {str(db_error)}')
+    finally:
+        if cursor:
+            if locked:
+                cursor.execute("SELECT RELEASE_LOCK('qbk_question_upsert')")
+                cursor.fetchone()
+            cursor.close()
+        connection.close()
+
+def known_document(sha256):
+    """Question ids of an identical document parsed before by this parser version,
+    or None when it has to be parsed (new, or some of its questions were deleted)"""
+    connection = get_connection()
+    if not connection:
+        raise IngestionError('Database connection failed')
+    try:
+        cursor = connection.cursor(dictionary=True)
+        question_ids = find_document(cursor, sha256, PARSER_VERSION)
+        if question_ids:
+            unique_ids = sorted(set(question_ids))
+            cursor.execute(f'SELECT COUNT(*) AS found FROM questions WHERE id IN ({", ".join(["%s"] * len(unique_ids))})',
+                           unique_ids)
+            if cursor.fetchone()['found'] != len(unique_ids):
+                question_ids = None
+        cursor.close()
+        return question_ids
+    finally:
+        connection.close()
+
+def remember_documents(documents):
+    """Store (sha256, filename, question_ids) fingerprints of freshly ingested documents"""
+    documents = [document for document in documents if document[0]]
+    if not documents:
+        return
+    connection = get_connection()
+    if not connection:
+        return
+    try:
+        cursor = connection.cursor()
+        for sha256, filename, question_ids in documents:
+            record_document(cursor, sha256, filename, PARSER_VERSION, question_ids)
+        connection.commit()
+        cursor.close()
+    except Exception as e:
+        # Only costs a re-parse of the same document next time
+        connection.rollback()
+        logger.warning("⚠️ Could not record document fingerprints: %s", e)
+    finally:
+        connection.close()
+
+def outcome_ids(outcomes):
+    """Response fields for a list of save_questions outcomes"""
+    ids = {'question_ids': [], 'inserted_ids': [], 'updated_ids': [], 'unchanged_ids': []}
+    for outcome in outcomes:
+        if outcome is None or outcome[0] == 'duplicate':
+            continue
+        status, question_id = outcome
+        ids['question_ids'].append(question_id)
+        ids[f'{status}_ids'].append(question_id)
+    return ids
+
+def unchanged_document_body(sha256, question_ids):
+    return {
+        'message': f'Document unchanged since its last upload; {len(question_ids)} questions already stored',
+        'question_ids': question_ids,
+        'inserted_ids': [],
+        'updated_ids': [],
+        'unchanged_ids': question_ids,
+        'document': {'sha256': sha256, 'status': 'unchanged'},
+        'summary': {'total_parsed': 0, 'total_saved': 0, 'skipped': 0, 'inserted': 0, 'updated': 0,
+                    'unchanged': len(question_ids), 'parse_skipped': True}
+    }
+
+def ingest_docx(file_path, job=None, document_sha256=None, force=False, filename=None):
+    """Parse a saved DOCX, store its questions and return the upload response body.
+    
+    When a background job is passed its progress counters are kept current.
+    A document whose SHA-256 was ingested before (by the same parser
+    version) is not parsed again unless force is set. filename is the
+    name the client uploaded (file_path is a temp name) and is recorded
+    with the document's fingerprint.
+    """
+    document_sha256 = document_sha256 or file_sha256(file_path)
+    if not force:
+        question_ids = known_document(document_sha256)
+        if question_ids is not None:
+            logger.info("⏭️ Skipping unchanged document %s", document_sha256[:12])
+            return unchanged_document_body(document_sha256, question_ids)
+    
+    if job:
+        job.update(stage='parsing', tables_processed=0, tables_total=None,
+                   questions_parsed=0, questions_inserted=0, questions_to_insert=None)
+    
+    try:
+        parser = DocxQuestionParser(app.config['UPLOAD_FOLDER'], engine=app.config['PARSE_ENGINE'],
+                                    cache_max_bytes=app.config['PARSE_CACHE_MAX_BYTES'])
+        parse_progress = None
+        if job:
+            parse_progress = lambda done, total, parsed: job.update(
+                tables_processed=done, tables_total=total, questions_parsed=parsed)
+        with stage_timer('upload.parse'):
+            questions = parser.parse_docx(file_path, progress_callback=parse_progress,
+                                          document_sha256=document_sha256)
+    except Exception as e:
+        logger.exception("❌ Error parsing file: %s", e)
+        raise IngestionError(f'Error parsing file: {str(e)}')
+    
+    logger.info("📊 Parsed %d questions", len(questions))
+    
+    # Enhanced language detection and statistics
+    with stage_timer('upload.language_detection'):
+        language_stats = compute_upload_stats(questions)
+    
+    # Save to database with transaction
+    insert_progress = None
+    if job:
+        job.update(stage='inserting', questions_parsed=len(questions),
+                   questions_to_insert=sum(1 for q in questions if q.get('question_text', '').strip()))
+        insert_progress = lambda inserted: job.update(questions_inserted=inserted)
+    with stage_timer('upload.db_insert'):
+        outcomes = save_questions(questions, insert_progress)
+    
+    ids = outcome_ids(outcomes)
+    remember_documents([(document_sha256, filename or os.path.basename(file_path), ids['question_ids'])])
+    summary = build_upload_summary(len(questions), outcomes, language_stats)
+    return dict(ids, **{
+        'message': upload_message(summary),
+        'document': {'sha256': document_sha256, 'status': 'parsed'},
+        'summary': summary
+    })
+
+def build_upload_summary(total_parsed, outcomes, language_stats):
+    counts = Counter(outcome[0] if outcome else 'skipped' for outcome in outcomes)
+    return {
+        'total_parsed': total_parsed,
+        'total_saved': counts['inserted'] + counts['updated'],
+        'skipped': counts['skipped'] + counts['duplicate'],
+        'inserted': counts['inserted'],
+        'updated': counts['updated'],
+        'unchanged': counts['unchanged'],
+        'english': language_stats['english'],
+        'hindi': language_stats['hindi'],
+        'with_question_images': language_stats['with_question_images'],
+        'with_solution_images': language_stats['with_solution_images'],
+        'with_option_images': language_stats['with_option_images'],
+        'multiple_choice': language_stats['multiple_choice'],
+        'other_types': language_stats['other_types']
+    }
+
+def upload_message(summary):
+    return (f"Uploaded {summary['inserted'] + summary['updated'] + summary['unchanged']} questions: "
+            f"{summary['inserted']} new, {summary['updated']} updated, {summary['unchanged']} unchanged "
+            f"({summary['skipped']} skipped)")
+
+def ingest_docx_batch(entries, job=None, force=False):
+    """Parse several saved DOCX files in a process pool and store all of
+    their questions with one upsert.
+    
+    entries are dicts with 'filename' and either 'path' or 'error' (files
+    that were rejected before parsing), plus 'sha256' when known. Every
+    file gets its own summary and a file that fails to parse is reported
+    without failing the others. Files ingested before are skipped as in
+    ingest_docx.
+    """
+    files = [{'filename': entry['filename'], 'status': 'error', 'error': entry.get('error')} for entry in entries]
+    parseable = []
+    for index, entry in enumerate(entries):
+        if not entry.get('path'):
+            continue
+        entry['sha256'] = entry.get('sha256') or file_sha256(entry['path'])
+        question_ids = None if force else known_document(entry['sha256'])
+        if question_ids is None:
+            parseable.append(index)
+        else:
+            body = unchanged_document_body(entry['sha256'], question_ids)
+            files[index].update(status='unchanged', error=None, question_ids=question_ids,
+                                document=body['document'], summary=body['summary'])
+    if job:
+        job.update(stage='parsing', files_total=len(entries), files_parsed=0,
+                   questions_parsed=0, questions_inserted=0, questions_to_insert=None)
+    
+    parse_progress = None
+    if job:
+        parse_progress = lambda done, total: job.update(files_parsed=done)
+    # Workers are separate processes, so their parse.* stages are not recorded here
+    parse_results = []
+    if parseable:
+        with stage_timer('upload.batch_parse'):
+            parse_results = parse_docx_files(app.config['UPLOAD_FOLDER'],
+                                             [entries[index]['path'] for index in parseable],
+                                             max_workers=app.config['PARSE_WORKERS'],
+                                             progress_callback=parse_progress, engine=app.config['PARSE_ENGINE'],
+                                             cache_max_bytes=app.config['PARSE_CACHE_MAX_BYTES'],
+                                             document_hashes=[entries[index]['sha256'] for index in parseable])
+    
+    to_save = []
+    parsed_files = []  # (index, questions)
+    for index, (questions, error) in zip(parseable, parse_results):
+        if error is not None:
+            files[index]['error'] = f'Error parsing file: {error}'
+            continue
+        to_save.extend(questions)
+        parsed_files.append((index, questions))
+    
+    total_parsed = sum(len(questions) for _, questions in parsed_files)
+    unchanged_files = sum(1 for report in files if report['status'] == 'unchanged')
+    logger.info("📊 Parsed %d questions from %d/%d files (%d unchanged)",
+                total_parsed, len(parsed_files), len(entries), unchanged_files)
+    if not parsed_files and not unchanged_files:
+        raise IngestionError('No valid DOCX files could be parsed', files)
+    
+    insert_progress = None
+    if job:
+        job.update(stage='inserting', questions_parsed=total_parsed,
+                   questions_to_insert=sum(1 for q in to_save if q.get('question_text', '').strip()))
+        insert_progress = lambda inserted: job.update(questions_inserted=inserted)
+    outcomes = []
+    if to_save:
+        with stage_timer('upload.db_insert'):
+            outcomes = save_questions(to_save, insert_progress)
+    
+    # Hand the merged outcomes back to the files they came from
+    offset = 0
+    overall_stats = None
+    documents = []
+    for index, questions in parsed_files:
+        with stage_timer('upload.language_detection'):
+            stats = compute_upload_stats(questions)
+        file_outcomes = outcomes[offset:offset + len(questions)]
+        offset += len(questions)
+        ids = outcome_ids(file_outcomes)
+        files[index].update(ids, status='ok', error=None,
+                            document={'sha256': entries[index]['sha256'], 'status': 'parsed'},
+                            summary=build_upload_summary(len(questions), file_outcomes, stats))
+        documents.append((entries[index]['sha256'], entries[index]['filename'], ids['question_ids']))
+        if overall_stats is None:
+            overall_stats = dict(stats)
+        else:
+            for key, value in stats.items():
+                overall_stats[key] += value
+    remember_documents(documents)
+    
+    failed = sum(1 for report in files if report['status'] == 'error')
+    summary = build_upload_summary(total_parsed, outcomes, overall_stats or compute_upload_stats([]))
+    summary['unchanged'] += sum(len(report['question_ids']) for report in files if report['status'] == 'unchanged')
+    summary.update({'files_total': len(files), 'files_succeeded': len(files) - failed, 'files_failed': failed,
+                    'files_unchanged': unchanged_files})
+    
+    ids = outcome_ids(outcomes)
+    for report in files:
+        if report['status'] == 'unchanged':
+            ids['question_ids'].extend(report['question_ids'])
+            ids['unchanged_ids'].extend(report['question_ids'])
+    return dict(ids, **{
+        'message': f"{upload_message(summary)} from {len(files) - failed} of {len(files)} files",
+        'summary': summary,
+        'files': files
+    })
+
+def remove_upload(file_path):
+    """Clean up an uploaded file once it has been ingested"""
+    try:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+            logger.debug("🧹 Cleaned up: %s", file_path)
+    except Exception as cleanup_error:
+        logger.warning("⚠️ Error cleaning up file: %s", cleanup_error)
+
+def run_ingestion_job(job, file_path, document_sha256=None, force=False, filename=None):
+    try:
+        return ingest_docx(file_path, job, document_sha256, force, filename)
+    finally:
+        remove_upload(file_path)
+
+def run_batch_ingestion_job(job, entries, batch_dir, force=False):
+    try:
         try:
-            cursor = connection.cursor()
-            inserted_ids = []
-            skipped_questions = 0
-            
-            for question in questions:
-                # Skip questions without text
-                if not question.get('question_text', '').strip():
-                    skipped_questions += 1
+            return ingest_docx_batch(entries, job, force)
+        except IngestionError as e:
+            job.update(files=e.files)
+            raise
+    finally:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+
+def extract_docx_from_zip(archive_path, archive_name, target_dir, extracted=None):
+    """Unpack the .docx members of an uploaded zip into target_dir
+    
+    extracted ({'files': n, 'bytes': n}) accumulates across the archives of
+    one request. The declared member sizes are checked against
+    ZIP_MAX_FILES / ZIP_MAX_UNCOMPRESSED_BYTES before anything is written,
+    raising ArchiveLimitError, so a zip bomb never reaches the disk
+    (zipfile never reads past a member's declared size).
+    """
+    extracted = extracted if extracted is not None else {'files': 0, 'bytes': 0}
+    entries = []
+    try:
+        with stage_timer('upload.zip_extract'), zipfile.ZipFile(archive_path) as archive:
+            members = []
+            for member in archive.infolist():
+                member_name = member.filename
+                if member.is_dir() or member_name.startswith('__MACOSX/'):
                     continue
-                
-                cursor.execute('''
-                    INSERT INTO questions 
-                    (question_text, question_html, question_type, options, correct_answer, 
-                     solution, marks, image_path, solution_image_path, language, created_at)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ''', (
-                    question.get('question_text', ''),
-                    question.get('question_text', ''),  # Using same as HTML for now
-                    question.get('type', 'multiple_choice'),
-                    json.dumps(question.get('options', [])),
-                    question.get('correct_answer', ''),
-                    question.get('solution', ''),
-                    question.get('marks', 1),
-                    question.get('image_path'),
-                    question.get('solution_image_path'),  # New solution image field
-                    get_language_detection(question.get('question_text', '')),
-                    datetime.now()
-                ))
-                inserted_ids.append(cursor.lastrowid)
-            
-            connection.commit()
+                # Never trust member paths: keep only a sanitised base name
+                members.append((member, f"{archive_name}/{member_name}",
+                                secure_filename(os.path.basename(member_name))))
             
-            return jsonify({
-                'message': f'Successfully uploaded {len(inserted_ids)} questions ({skipped_questions} skipped)',
-                'question_ids': inserted_ids,
-                'summary': {
-                    'total_parsed': len(questions),
-                    'total_saved': len(inserted_ids),
-                    'skipped': skipped_questions,
-                    'english': language_stats['english'],
-                    'hindi': language_stats['hindi'],
-                    'with_question_images': language_stats['with_question_images'],
-                    'with_solution_images': language_stats['with_solution_images'],
-                    'with_option_images': language_stats['with_option_images'],
-                    'multiple_choice': language_stats['multiple_choice'],
-                    'other_types': language_stats['other_types']
-                }
-            }), 200
+            docx_members = [member for member, _, safe_name in members if allowed_file(safe_name)]
+            extracted['files'] += len(docx_members)
+            extracted['bytes'] += sum(member.file_size for member in docx_members)
+            if extracted['files'] > app.config['ZIP_MAX_FILES']:
+                raise ArchiveLimitError(f"Too many files in zip upload. Maximum is "
+                                        f"{app.config['ZIP_MAX_FILES']} .docx files.")
+            if extracted['bytes'] > app.config['ZIP_MAX_UNCOMPRESSED_BYTES']:
+                limit_mb = app.config['ZIP_MAX_UNCOMPRESSED_BYTES'] // (1024 * 1024)
+                raise ArchiveLimitError(f'Zip upload too large. Maximum uncompressed size is {limit_mb}MB.')
             
-        except Exception as db_error:
-            connection.rollback()
-            print(f"❌ Database error: {db_error}")
-            return jsonify({'error': f'Database error: {str(db_error)}'}), 500
-        finally:
-            cursor.close()
-            connection.close()
-        
+            for member, display_name, safe_name in members:
+                if not allowed_file(safe_name):
+                    entries.append({'filename': display_name, 'error': 'Skipped: not a .docx file'})
+                    continue
+                member_path = os.path.join(target_dir, f"{uuid.uuid4().hex}_{safe_name}")
+                with archive.open(member) as source, open(member_path, 'wb') as target:
+                    shutil.copyfileobj(source, target)
+                entries.append({'filename': display_name, 'path': member_path})
+    except zipfile.BadZipFile as e:
+        entries.append({'filename': archive_name, 'error': f'Invalid zip archive: {str(e)}'})
+    return entries
+
+def save_batch_uploads(uploads, batch_dir):
+    """Save every uploaded DOCX (and the DOCX files inside uploaded zips) into batch_dir"""
+    entries = []
+    extracted = {'files': 0, 'bytes': 0}
+    for upload in uploads:
+        filename = secure_filename(upload.filename)
+        if is_archive(filename):
+            archive_path = claim_upload(request, upload)
+            try:
+                entries.extend(extract_docx_from_zip(archive_path, filename, batch_dir, extracted))
+            finally:
+                remove_upload(archive_path)
+        elif allowed_file(filename):
+            # Already on disk; a rename into the batch folder is enough
+            file_path = os.path.join(batch_dir, f"{uuid.uuid4().hex}_{filename}")
+            with stage_timer('upload.save_file'):
+                os.replace(claim_upload(request, upload), file_path)
+            entries.append({'filename': filename, 'path': file_path, 'sha256': upload_sha256(upload)})
+        else:
+            entries.append({'filename': upload.filename,
+                            'error': 'Invalid file type. Please upload .docx or .zip files only.'})
+    return entries
+
+def upload_question_batch(uploads, run_async, force=False):
+    """Multi-file / zip variant of upload_questions"""
+    batch_dir = tempfile.mkdtemp(prefix='batch_', dir=app.config['UPLOAD_FOLDER'])
+    try:
+        entries = save_batch_uploads(uploads, batch_dir)
+        logger.info("✅ Batch saved: %d files in %s", len(entries), batch_dir)
+    except ArchiveLimitError as e:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+        logger.warning("⚠️ Rejected zip upload: %s", e)
+        return jsonify({'error': str(e)}), 413
+    except Exception as e:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+        return jsonify({'error': f'Error saving file: {str(e)}'}), 500
+    
+    if run_async:
+        job = job_manager.submit('upload-questions-batch', run_batch_ingestion_job, entries, batch_dir, force,
+                                 description=f'{len(entries)} files')
+        return jsonify({
+            'message': 'Upload accepted for processing',
+            'job_id': job.id,
+            'status_url': f'/api/jobs/{job.id}'
+        }), 202
+    
+    try:
+        return jsonify(ingest_docx_batch(entries, force=force)), 200
+    except IngestionError as e:
+        status = 400 if e.files is not None else 500
+        return jsonify(e.to_response()), status
     except Exception as e:
-        print(f"❌ Error parsing file: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception("❌ Error processing batch upload: %s", e)
+        return jsonify({'error': f'Error processing upload: {str(e)}'}), 500
+    finally:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+
+@app.route('/api/upload-questions', methods=['POST'])
+def upload_questions():
+    """Upload and parse DOCX questions with enhanced error handling
+    
+    Pass async=true (query string or form field) to get a job id back
+    immediately and poll /api/jobs/<job_id> for progress and the summary.
+    Several files (repeated 'file' or 'files' fields) or a .zip of DOCX
+    files are parsed in parallel and reported per file. For a single file,
+    checksum=<hex> is compared with the digest (UPLOAD_CHECKSUM, sha256 by
+    default) computed while the upload streamed in.
+    
+    Re-uploads are idempotent: a document identical to one ingested before
+    is not parsed again (force=true overrides), and questions are upserted
+    by text fingerprint, reported as inserted, updated or unchanged.
+    """
+    uploads = request.files.getlist('file') + request.files.getlist('files')
+    if not uploads:
+        return jsonify({'error': 'No file uploaded'}), 400
+    
+    uploads = [upload for upload in uploads if upload.filename]
+    if not uploads:
+        return jsonify({'error': 'No file selected'}), 400
+    
+    run_async = request.values.get('async', str(app.config['ASYNC_UPLOADS'])).lower() == 'true'
+    force = request.values.get('force', '').lower() == 'true'
+    
+    if len(uploads) > 1 or is_archive(uploads[0].filename):
+        return upload_question_batch(uploads, run_async, force)
+    
+    file = uploads[0]
+    if not file or not allowed_file(file.filename):
+        return jsonify({'error': 'Invalid file type. Please upload .docx files only.'}), 400
+    
+    # The body was streamed into a uniquely named temp file while parsing the form,
+    # so concurrent uploads of the same name never share a path
+    upload = upload_info(file)
+    expected = (request.values.get('checksum') or '').lower()
+    checksum_name = app.config['UPLOAD_CHECKSUM']
+    if expected and checksum_name and expected != upload.get(checksum_name):
+        return jsonify({'error': f'Checksum mismatch: received {checksum_name} {upload.get(checksum_name)}',
+                        'upload': upload}), 400
+    file_path = claim_upload(request, file)
+    logger.info("✅ File received: %s (%s bytes) -> %s", file.filename, upload['size'], file_path)
+    
+    if run_async:
+        job = job_manager.submit('upload-questions', run_ingestion_job, file_path, upload_sha256(file), force,
+                                 secure_filename(file.filename), description=secure_filename(file.filename))
+        return jsonify({
+            'message': 'Upload accepted for processing',
+            'job_id': job.id,
+            'status_url': f'/api/jobs/{job.id}',
+            'upload': upload
+        }), 202
+    
+    try:
+        body = ingest_docx(file_path, document_sha256=upload_sha256(file), force=force,
+                           filename=secure_filename(file.filename))
+        body['upload'] = upload
+        return jsonify(body), 200
+    except IngestionError as e:
+        return jsonify({'error': str(e)}), 500
+    except Exception as e:
+        logger.exception("❌ Error parsing file: %s", e)
         return jsonify({'error': f'Error parsing file: {str(e)}'}), 500
     finally:
-        # Clean up uploaded file
+        remove_upload(file_path)
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Progress and final summary of a background ingestion job"""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict()), 200
+
+def encode_page_cursor(question):
+    """Opaque keyset token for the (created_at, id) position of a row"""
+    created_at = question['created_at']
+    raw = json.dumps([created_at.isoformat() if created_at else None, question['id']])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_page_cursor(token):
+    """Inverse of encode_page_cursor; raises ValueError on malformed tokens"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        created_at, question_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(created_at), int(question_id)
+    except Exception:
+        raise ValueError('Invalid pagination cursor')
+
+# Approximate totals for cursor pagination: (language, type) -> (count, fetched_at)
+_count_cache = {}
+_count_cache_lock = threading.Lock()
+
+def invalidate_count_cache():
+    with _count_cache_lock:
+        _count_cache.clear()
+
+def count_questions(cursor, count_query, params, cache_key, exact):
+    """Total for a filter set; non-exact lookups are served from a short-lived cache.
+    
+    Returns (total, is_estimate).
+    """
+    now = time.monotonic()
+    if not exact:
+        with _count_cache_lock:
+            cached = _count_cache.get(cache_key)
+        if cached and now - cached[1] < app.config['COUNT_CACHE_TTL']:
+            return cached[0], True
+    
+    cursor.execute(count_query, params)
+    total_result = cursor.fetchone()
+    total = total_result['total'] if total_result else 0
+    with _count_cache_lock:
+        _count_cache[cache_key] = (total, now)
+    return total, False
+
+# Columns a list request may select with fields=a,b,c; id and created_at are always included
+LIST_FIELD_COLUMNS = ('id', 'question_text', 'question_html', 'question_type', 'options', 'correct_answer',
+                      'solution', 'marks', 'image_path', 'solution_image_path', 'language', 'has_images',
+                      'created_at', 'updated_at')
+
+def list_projection(fields):
+    """SELECT list for the list endpoints' fields= parameter.
+    
+    'compact' (the default) returns id, a text preview, type, language,
+    marks and image flags, leaving question_html, solution and the options
+    JSON unread; the full question comes from /api/questions/<id>. 'full'
+    selects every column. Otherwise fields is a comma-separated subset of
+    LIST_FIELD_COLUMNS. Raises ValueError for unknown field names.
+    """
+    fields = (fields or 'compact').strip().lower()
+    if fields == 'compact':
+        preview = int(app.config['LIST_TEXT_PREVIEW_CHARS'])
+        return f'''id, LEFT(question_text, {preview}) AS question_text,
+            CHAR_LENGTH(question_text) > {preview} AS question_text_truncated,
+            question_type, language, marks, has_images,
+            (image_path IS NOT NULL AND image_path <> '') AS has_question_image,
+            (solution_image_path IS NOT NULL AND solution_image_path <> '') AS has_solution_image,
+            JSON_SEARCH(options, 'one', '_%', NULL, '$[*].image_path') IS NOT NULL AS has_option_images,
+            created_at'''
+    if fields == 'full':
+        return '*'
+    requested = [field.strip() for field in fields.split(',') if field.strip()]
+    unknown = [field for field in requested if field not in LIST_FIELD_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return ', '.join(column for column in LIST_FIELD_COLUMNS
+                     if column in requested or column in ('id', 'created_at'))
+
+def prepare_list_row(question):
+    """Decode the options JSON and normalize image path separators, for whichever columns were selected"""
+    if question.get('options'):
         try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                print(f"🧹 Cleaned up: {file_path}")
-        except Exception as cleanup_error:
-            print(f"⚠️ Error cleaning up file: {cleanup_error}")
+            question['options'] = json.loads(question['options'])
+        except:
+            question['options'] = []
+    for field in ('image_path', 'solution_image_path'):
+        if question.get(field) and '\\' in question[field]:
+            question[field] = question[field].replace('\\', '/')
+    for flag in ('question_text_truncated', 'has_images', 'has_question_image', 'has_solution_image',
+                 'has_option_images'):
+        if flag in question:
+            question[flag] = bool(question[flag])
+    return question
 
 @app.route('/api/questions', methods=['GET'])
 def get_questions():
-    """Get all questions with pagination and filtering support"""
+    """Get all questions with pagination and filtering support
+    
+    Offset pagination (page/per_page) is the default. Pass after=<cursor>
+    (or pagination=cursor for the first page) to page by keyset on
+    (created_at, id) instead, which costs the same at any depth. total=
+    exact|approx|none controls how the total is computed; cursor mode
+    defaults to approx, a cached count refreshed every COUNT_CACHE_TTL s.
+    fields=compact|full|a,b,c picks the columns, see list_projection.
+    """
+    connection = None
     try:
         # Get query parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 50, type=int)
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = min(max(request.args.get('per_page', 50, type=int), 1), 100)
         language = request.args.get('language', '')
         question_type = request.args.get('type', '')
+        after = request.args.get('after')
+        cursor_mode = after is not None or request.args.get('pagination') == 'cursor'
+        total_mode = request.args.get('total', 'approx' if cursor_mode else 'exact').lower()
+        fields = request.args.get('fields', 'compact').lower()
+        
+        if total_mode not in ('exact', 'approx', 'none'):
+            return jsonify({'error': 'total must be "exact", "approx" or "none"'}), 400
         
-        connection = create_connection()
+        try:
+            columns = list_projection(fields)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        after_key = None
+        if after:
+            try:
+                after_key = decode_page_cursor(after)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+        
+        # First pages are served from the read cache
+        cache_key = None
+        if not after and (cursor_mode or page <= app.config['LIST_CACHE_MAX_PAGE']):
+            cache_key = ('list', cursor_mode, None if cursor_mode else page, per_page,
+                         language.lower(), question_type.lower(), total_mode, fields)
+            cached = query_cache.get(cache_key)
+            if cached is not None:
+                return conditional_json(cached)
+        
+        connection = get_connection()
         if not connection:
             return jsonify({'error': 'Database connection failed'}), 500
         
         cursor = connection.cursor(dictionary=True)
         
         # Build query with filters
-        base_query = 'SELECT * FROM questions WHERE 1=1'
+        base_query = f'SELECT {columns} FROM questions WHERE 1=1'
         count_query = 'SELECT COUNT(*) as total FROM questions WHERE 1=1'
         params = []
         
@@ -222,55 +1003,87 @@ def get_questions():
             count_query += ' AND question_type = %s'
             params.append(question_type)
         
+        filter_params = list(params)
+        
         # Add ordering and pagination
-        base_query += ' ORDER BY created_at DESC LIMIT %s OFFSET %s'
-        offset = (page - 1) * per_page
-        params.extend([per_page, offset])
+        if cursor_mode:
+            if after_key:
+                base_query += ' AND (created_at < %s OR (created_at = %s AND id < %s))'
+                params.extend([after_key[0], after_key[0], after_key[1]])
+            # Fetch one extra row to learn whether another page exists
+            base_query += ' ORDER BY created_at DESC, id DESC LIMIT %s'
+            params.append(per_page + 1)
+        else:
+            base_query += ' ORDER BY created_at DESC, id DESC LIMIT %s OFFSET %s'
+            offset = (page - 1) * per_page
+            params.extend([per_page, offset])
         
         # Get total count
-        cursor.execute(count_query, params[:-2] if language or question_type else [])
-        total_result = cursor.fetchone()
-        total_questions = total_result['total'] if total_result else 0
+        total_questions, total_is_estimate = None, False
+        if total_mode != 'none':
+            total_questions, total_is_estimate = count_questions(
+                cursor, count_query, filter_params, (language, question_type), total_mode == 'exact')
         
         # Get paginated questions
         cursor.execute(base_query, params)
         questions = cursor.fetchall()
         
+        has_more = False
+        if cursor_mode and len(questions) > per_page:
+            questions = questions[:per_page]
+            has_more = True
+        
         # Parse JSON options and handle image paths
         for question in questions:
-            if question['options']:
-                try:
-                    question['options'] = json.loads(question['options'])
-                except:
-                    question['options'] = []
-            
-            # Ensure all image paths are properly formatted
-            if question['image_path'] and '\\' in question['image_path']:
-                question['image_path'] = question['image_path'].replace('\\', '/')
-            if question['solution_image_path'] and '\\' in question['solution_image_path']:
-                question['solution_image_path'] = question['solution_image_path'].replace('\\', '/')
+            prepare_list_row(question)
         
         cursor.close()
         connection.close()
         
-        return jsonify({
-            'questions': questions,
-            'pagination': {
+        if cursor_mode:
+            pagination = {
+                'mode': 'cursor',
+                'per_page': per_page,
+                'has_more': has_more,
+                'next_cursor': encode_page_cursor(questions[-1]) if has_more else None,
+                'total': total_questions,
+                'total_is_estimate': total_is_estimate
+            }
+        else:
+            pagination = {
                 'page': page,
                 'per_page': per_page,
                 'total': total_questions,
-                'pages': (total_questions + per_page - 1) // per_page
+                'pages': (total_questions + per_page - 1) // per_page if total_questions is not None else None,
+                'total_is_estimate': total_is_estimate
             }
-        }), 200
+        
+        body = {
+            'questions': questions,
+            'pagination': pagination
+        }
+        if cache_key:
+            query_cache.set(cache_key, body, tags=[('list', language.lower(), question_type.lower())])
+        
+        return conditional_json(body)
         
     except Exception as e:
-        print(f"❌ Error fetching questions: {e}")
+        logger.error("❌ Error fetching questions: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
+    finally:
+        if connection:
+            connection.close()
 
 @app.route('/api/questions/<int:question_id>', methods=['GET', 'PUT', 'DELETE'])
 def manage_question(question_id):
     """Manage individual questions (GET, UPDATE, DELETE)"""
-    connection = create_connection()
+    if request.method == 'GET':
+        # Cache hits never borrow a pooled connection
+        cached = query_cache.get(('question', question_id))
+        if cached is not None:
+            return conditional_json(cached, cached.get('updated_at'))
+    
+    connection = get_connection()
     if not connection:
         return jsonify({'error': 'Database connection failed'}), 500
     
@@ -290,7 +1103,8 @@ def manage_question(question_id):
                 
                 cursor.close()
                 connection.close()
-                return jsonify(question), 200
+                query_cache.set(('question', question_id), question)
+                return conditional_json(question, question.get('updated_at'))
             else:
                 cursor.close()
                 connection.close()
@@ -301,111 +1115,193 @@ def manage_question(question_id):
             if not data:
                 return jsonify({'error': 'No JSON data provided'}), 400
             
-            cursor = connection.cursor()
+            cursor = connection.cursor(dictionary=True)
+            
+            # Lock the current row; its old values are needed to adjust the stats counters
+            cursor.execute('''
+                SELECT language, question_type, options, image_path, solution_image_path, created_at
+                FROM questions WHERE id = %s FOR UPDATE
+            ''', (question_id,))
+            old_question = cursor.fetchone()
+            if not old_question:
+                connection.rollback()
+                cursor.close()
+                connection.close()
+                return jsonify({'error': 'Question not found'}), 404
+            
+            new_question = {
+                'question_text': data.get('question_text', ''),
+                'question_type': data.get('question_type', 'multiple_choice'),
+                'options': data.get('options', []),
+                'image_path': data.get('image_path', ''),
+                'solution_image_path': data.get('solution_image_path', ''),
+                'language': get_language_detection(data.get('question_text', '')),
+                'created_at': old_question['created_at']
+            }
             
             cursor.execute('''
                 UPDATE questions 
-                SET question_text = %s, question_type = %s, options = %s, 
+                SET question_text = %s, question_html = %s, question_type = %s, options = %s, 
                     correct_answer = %s, solution = %s, marks = %s,
-                    image_path = %s, solution_image_path = %s, language = %s, updated_at = %s
+                    image_path = %s, solution_image_path = %s, language = %s, updated_at = %s,
+                    text_hash = %s
                 WHERE id = %s
             ''', (
-                data.get('question_text', ''),
-                data.get('question_type', 'multiple_choice'),
-                json.dumps(data.get('options', [])),
+                new_question['question_text'],
+                new_question['question_text'],  # question_html, derived as on upload (question_to_row)
+                new_question['question_type'],
+                json.dumps(new_question['options']),
                 data.get('correct_answer', ''),
                 data.get('solution', ''),
                 data.get('marks', 1),
-                data.get('image_path', ''),
-                data.get('solution_image_path', ''),  # New solution image field
-                get_language_detection(data.get('question_text', '')),
+                new_question['image_path'],
+                new_question['solution_image_path'],  # New solution image field
+                new_question['language'],
                 datetime.now(),
+                # Edited content must stop matching the original upload and start matching re-uploads of the edit
+                question_fingerprint(new_question['question_text'], new_question['options'],
+                                     new_question['image_path']),
                 question_id
             ))
             
-            if cursor.rowcount == 0:
-                connection.rollback()
-                cursor.close()
-                connection.close()
-                return jsonify({'error': 'Question not found'}), 404
+            deltas = stat_deltas(old_question, -1)
+            deltas.update(stat_deltas(new_question))
+            apply_stat_deltas(cursor, deltas)
             
             connection.commit()
             cursor.close()
             connection.close()
+            invalidate_question_caches(question_id, [
+                (old_question['language'], old_question['question_type']),
+                (new_question['language'], new_question['question_type'])
+            ])
             
             return jsonify({'message': 'Question updated successfully'}), 200
         
         elif request.method == 'DELETE':
-            cursor = connection.cursor()
-            cursor.execute('DELETE FROM questions WHERE id = %s', (question_id,))
-            
-            if cursor.rowcount == 0:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute('''
+                SELECT language, question_type, options, image_path, solution_image_path, created_at
+                FROM questions WHERE id = %s FOR UPDATE
+            ''', (question_id,))
+            old_question = cursor.fetchone()
+            if not old_question:
                 connection.rollback()
                 cursor.close()
                 connection.close()
                 return jsonify({'error': 'Question not found'}), 404
             
+            cursor.execute('DELETE FROM questions WHERE id = %s', (question_id,))
+            apply_stat_deltas(cursor, stat_deltas(old_question, -1))
+            
             connection.commit()
             cursor.close()
             connection.close()
+            invalidate_count_cache()
+            invalidate_question_caches(question_id, [(old_question['language'], old_question['question_type'])])
             
             return jsonify({'message': 'Question deleted successfully'}), 200
             
     except Exception as e:
         connection.rollback()
-        print(f"❌ Error in manage_question: {e}")
+        logger.error("❌ Error in manage_question: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
+    finally:
+        # Always hand the pooled connection back (close() is idempotent)
+        connection.close()
+
+def stream_questions_ndjson(connection, query, params):
+    """Yield one JSON line per matching question, reading the rows through an
+    unbuffered (server-side) cursor in batches so memory stays flat"""
+    cursor = None
+    try:
+        cursor = connection.cursor(dictionary=True, buffered=False)
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(app.config['STREAM_BATCH_SIZE'])
+            if not rows:
+                break
+            lines = []
+            for question in rows:
+                lines.append(app.json.dumps(prepare_list_row(question)))
+            yield '\n'.join(lines) + '\n'
+    except Exception as e:
+        logger.error("❌ Error streaming questions: %s", e)
+        # Headers are already sent, so report the failure in-band
+        yield json.dumps({'error': 'Internal server error'}) + '\n'
+    finally:
+        if cursor:
+            try:
+                cursor.close()
+            except Exception:
+                pass  # unread rows after a client disconnect; the pool discards the connection
+        connection.close()
 
 @app.route('/api/questions/filter', methods=['GET'])
 def filter_questions():
-    """Filter questions by language with enhanced options"""
+    """Filter questions by language with enhanced options
+    
+    format=ndjson streams the matches as newline-delimited JSON, one
+    question per line, instead of building a single JSON document.
+    fields= selects columns as for /api/questions (compact by default).
+    """
     language = request.args.get('language', '').lower()
     question_type = request.args.get('type', '')
     has_images = request.args.get('has_images', '').lower()
+    stream = (request.args.get('format', '').lower() == 'ndjson'
+              or request.accept_mimetypes.best == 'application/x-ndjson')
     
     if language and language not in ['english', 'hindi']:
         return jsonify({'error': 'Language must be "english" or "hindi"'}), 400
     
-    connection = create_connection()
+    try:
+        columns = list_projection(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    query = f'SELECT {columns} FROM questions WHERE 1=1'
+    params = []
+    
+    if language:
+        query += ' AND language = %s'
+        params.append(language)
+    
+    if question_type:
+        query += ' AND question_type = %s'
+        params.append(question_type)
+    
+    # has_images is a stored generated column, see database.MIGRATIONS
+    if has_images == 'true':
+        query += ' AND has_images = 1'
+    elif has_images == 'false':
+        query += ' AND has_images = 0'
+    
+    query += ' ORDER BY created_at DESC, id DESC'
+    
+    connection = get_connection()
     if not connection:
         return jsonify({'error': 'Database connection failed'}), 500
     
+    if stream:
+        response = Response(stream_questions_ndjson(connection, query, params), mimetype='application/x-ndjson')
+        # Returns the connection even if the body is never iterated
+        response.call_on_close(connection.close)
+        return response
+    
     try:
         cursor = connection.cursor(dictionary=True)
         
-        query = 'SELECT * FROM questions WHERE 1=1'
-        params = []
-        
-        if language:
-            query += ' AND language = %s'
-            params.append(language)
-        
-        if question_type:
-            query += ' AND question_type = %s'
-            params.append(question_type)
-        
-        if has_images == 'true':
-            query += ' AND (image_path IS NOT NULL OR solution_image_path IS NOT NULL)'
-        elif has_images == 'false':
-            query += ' AND image_path IS NULL AND solution_image_path IS NULL'
-        
-        query += ' ORDER BY created_at DESC'
-        
         cursor.execute(query, params)
         questions = cursor.fetchall()
         
         # Parse JSON options
         for question in questions:
-            if question['options']:
-                try:
-                    question['options'] = json.loads(question['options'])
-                except:
-                    question['options'] = []
+            prepare_list_row(question)
         
         cursor.close()
         connection.close()
         
-        return jsonify({
+        return conditional_json({
             'questions': questions,
             'filters': {
                 'language': language,
@@ -413,130 +1309,204 @@ def filter_questions():
                 'has_images': has_images,
                 'count': len(questions)
             }
-        }), 200
+        })
         
     except Exception as e:
-        print(f"❌ Error filtering questions: {e}")
+        logger.error("❌ Error filtering questions: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
+    finally:
+        connection.close()
 
-@app.route('/api/questions/stats', methods=['GET'])
-def get_question_stats():
-    """Get comprehensive question statistics"""
-    connection = create_connection()
-    if not connection:
-        return jsonify({'error': 'Database connection failed'}), 500
+@app.route('/api/questions/search', methods=['GET'])
+def search_questions():
+    """Full-text search over question and solution text, most relevant first
     
+    q is split into terms that must all occur (each as a phrase, so the
+    ngram index matches whole terms); language and type filter as for
+    /api/questions. Results carry the compact list fields plus
+    <mark>-highlighted snippets of the question and solution.
+    """
+    connection = None
     try:
+        query_text = request.args.get('q', '').strip()
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
+        language = request.args.get('language', '').lower()
+        question_type = request.args.get('type', '')
+        
+        terms = search_terms(query_text)
+        if not terms:
+            return jsonify({'error': 'q must contain a search term of at least 2 characters'}), 400
+        if language and language not in ['english', 'hindi']:
+            return jsonify({'error': 'Language must be "english" or "hindi"'}), 400
+        
+        # Every term required, as a phrase; relevance still comes from natural-language scoring
+        boolean_query = ' '.join(f'+"{term}"' for term in terms)
+        where = ' WHERE MATCH(question_text, solution) AGAINST(%s IN BOOLEAN MODE)'
+        filter_params = [boolean_query]
+        if language:
+            where += ' AND language = %s'
+            filter_params.append(language)
+        if question_type:
+            where += ' AND question_type = %s'
+            filter_params.append(question_type)
+        
+        connection = get_connection()
+        if not connection:
+            return jsonify({'error': 'Database connection failed'}), 500
         cursor = connection.cursor(dictionary=True)
         
-        # Total questions by language
-        cursor.execute('''
-            SELECT language, COUNT(*) as count 
-            FROM questions 
-            GROUP BY language
-        ''')
-        language_stats = cursor.fetchall()
-        
-        # Questions by type
-        cursor.execute('''
-            SELECT question_type, COUNT(*) as count 
-            FROM questions 
-            GROUP BY question_type
-        ''')
-        type_stats = cursor.fetchall()
-        
-        # Questions with images
-        cursor.execute('''
-            SELECT 
-                COUNT(*) as total,
-                COUNT(image_path) as with_question_images,
-                COUNT(solution_image_path) as with_solution_images,
-                COUNT(*) - COUNT(image_path) - COUNT(solution_image_path) as without_images
-            FROM questions
-        ''')
-        image_stats = cursor.fetchone()
-        
-        # Questions with option images
-        cursor.execute('''
-            SELECT COUNT(*) as with_option_images
-            FROM questions 
-            WHERE JSON_CONTAINS_PATH(options, 'one', '$[*].image_path')
-        ''')
-        option_image_stats = cursor.fetchone()
-        
-        # Recent activity
-        cursor.execute('''
-            SELECT 
-                DATE(created_at) as date,
-                COUNT(*) as count
-            FROM questions 
-            WHERE created_at >= DATE_SUB(NOW(), INTERVAL 7 DAY)
-            GROUP BY DATE(created_at)
-            ORDER BY date DESC
-        ''')
-        recent_activity = cursor.fetchall()
+        cursor.execute('SELECT COUNT(*) AS total FROM questions' + where, filter_params)
+        total = cursor.fetchone()['total']
         
+        cursor.execute(
+            'SELECT id, question_text, solution, question_type, language, marks, has_images, created_at, '
+            'MATCH(question_text, solution) AGAINST(%s IN NATURAL LANGUAGE MODE) AS relevance '
+            'FROM questions' + where + ' ORDER BY relevance DESC, id DESC LIMIT %s OFFSET %s',
+            [' '.join(terms)] + filter_params + [per_page, (page - 1) * per_page])
+        rows = cursor.fetchall()
         cursor.close()
         connection.close()
         
-        return jsonify({
-            'language_distribution': language_stats,
-            'type_distribution': type_stats,
-            'image_stats': {
-                'total': image_stats['total'] if image_stats else 0,
-                'with_question_images': image_stats['with_question_images'] if image_stats else 0,
-                'with_solution_images': image_stats['with_solution_images'] if image_stats else 0,
-                'with_option_images': option_image_stats['with_option_images'] if option_image_stats else 0,
-                'without_images': image_stats['without_images'] if image_stats else 0
-            },
-            'recent_activity': recent_activity,
-            'summary': {
-                'total_questions': image_stats['total'] if image_stats else 0,
-                'total_languages': len(language_stats),
-                'total_types': len(type_stats)
+        width = app.config['SEARCH_SNIPPET_CHARS']
+        results = []
+        for row in rows:
+            question_text = row.pop('question_text')
+            solution = row.pop('solution')
+            row['has_images'] = bool(row['has_images'])
+            row['relevance'] = float(row['relevance'])
+            row['snippets'] = {
+                'question_text': highlight_snippet(question_text, terms, width),
+                'solution': highlight_snippet(solution, terms, width)
             }
-        }), 200
+            results.append(row)
+        
+        return conditional_json({
+            'questions': results,
+            'query': {'q': query_text, 'terms': terms, 'language': language, 'type': question_type},
+            'pagination': {
+                'page': page,
+                'per_page': per_page,
+                'total': total,
+                'pages': (total + per_page - 1) // per_page
+            }
+        })
         
     except Exception as e:
-        print(f"❌ Error getting stats: {e}")
+        logger.error("❌ Error searching questions: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
+    finally:
+        if connection:
+            connection.close()
+
+@app.route('/api/questions/stats', methods=['GET'])
+def get_question_stats():
+    """Get comprehensive question statistics
+    
+    Served from the question_stats summary tables, which every write keeps
+    current and a background job reconciles every STATS_RECONCILE_INTERVAL
+    seconds; 'freshness' says when they were last touched and recounted.
+    """
+    connection = get_connection()
+    if not connection:
+        return jsonify({'error': 'Database connection failed'}), 500
+    
+    try:
+        cursor = connection.cursor(dictionary=True)
+        stats = read_stats(cursor)
+        cursor.close()
+        
+        return jsonify(stats), 200
+        
+    except Exception as e:
+        logger.error("❌ Error getting stats: %s", e)
+        return jsonify({'error': 'Internal server error'}), 500
+    finally:
+        connection.close()
+
+def image_derivative_request():
+    """(width, height, format) asked for by ?w=&h=&format=, or None for the original image.
+    
+    Without an explicit format, resized images are WebP for clients that
+    accept it and PNG otherwise. Raises ValueError for invalid values.
+    """
+    width = request.args.get('w', type=int)
+    height = request.args.get('h', type=int)
+    output_format = request.args.get('format', '').lower()
+    if width is None and height is None and not output_format:
+        return None
+    limit = app.config['THUMBNAIL_MAX_DIMENSION']
+    for value in (width, height):
+        if value is not None and not 0 < value <= limit:
+            raise ValueError(f'w and h must be between 1 and {limit}')
+    if output_format and output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(OUTPUT_FORMATS)}")
+    if not output_format:
+        # Only an explicit image/webp counts; */* alone also covers clients without WebP support
+        accepts_webp = any(mimetype == 'image/webp' for mimetype, _ in request.accept_mimetypes)
+        output_format = 'webp' if accepts_webp else 'png'
+    return width, height, output_format
 
 @app.route('/api/images/<path:filename>')
 def serve_image(filename):
-    """Serve uploaded images with enhanced error handling"""
+    """Serve uploaded images, looked up in the in-memory image index
+    
+    w/h (fit inside, never upscaled) and format=webp|png return a cached
+    derivative instead of the original.
+    """
     try:
-        # Handle different path formats
-        if '\\' in filename:
-            filename = filename.replace('\\', '/')
+        # Handle different path formats; only the file name is used
+        actual_filename = os.path.basename(filename.replace('\\', '/'))
         
-        # Extract just the filename if full path is provided
-        actual_filename = os.path.basename(filename)
-        image_path = os.path.join(app.config['UPLOAD_FOLDER'], 'images', actual_filename)
+        try:
+            derivative = image_derivative_request()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        print(f"🔍 Looking for image at: {image_path}")
+        found = image_catalog.resolve(actual_filename)
+        if not found:
+            logger.debug("❌ Image not found: %s", actual_filename)
+            return jsonify({'error': 'Image not found'}), 404
         
-        if os.path.exists(image_path):
-            print(f"✅ Serving image: {actual_filename}")
-            return send_file(image_path)
-        else:
-            print(f"❌ Image not found: {image_path}")
-            # Try to find the image with different extensions
-            images_dir = os.path.join(app.config['UPLOAD_FOLDER'], 'images')
-            if os.path.exists(images_dir):
-                image_files = os.listdir(images_dir)
-                base_name = os.path.splitext(actual_filename)[0]
-                matching_files = [f for f in image_files if f.startswith(base_name)]
-                
-                if matching_files:
-                    actual_filename = matching_files[0]
-                    image_path = os.path.join(images_dir, actual_filename)
-                    print(f"🔄 Found alternative image: {actual_filename}")
-                    return send_file(image_path)
-            
+        image_path, immutable = found
+        max_age = app.config['IMMUTABLE_IMAGE_MAX_AGE' if immutable else 'IMAGE_CACHE_MAX_AGE']
+        try:
+            response = None
+            if derivative and thumbnails_available():
+                width, height, output_format = derivative
+                thumbnail_path = None
+                try:
+                    with stage_timer('images.thumbnail'):
+                        thumbnail_path = thumbnail_cache.get(actual_filename, image_path, width, height,
+                                                             output_format)
+                    response = send_file(thumbnail_path, mimetype=OUTPUT_FORMATS[output_format][1],
+                                         max_age=max_age)
+                    if not request.args.get('format'):
+                        response.vary.add('Accept')
+                except ThumbnailError as e:
+                    # EMF/WMF and other formats Pillow cannot read are served as they are
+                    logger.debug("⚠️ Serving original of %s: %s", actual_filename, e)
+                except FileNotFoundError:
+                    if thumbnail_path is None:
+                        raise  # the source itself is gone
+                    # Evicted between get() and send_file(); the next request renders it again
+                    thumbnail_cache.discard(thumbnail_path)
+                except OSError as e:
+                    # Could not write the derivative (disk full, out of file handles); not remembered
+                    logger.warning("⚠️ Serving original of %s, derivative not written: %s", actual_filename, e)
+            if response is None:
+                response = send_file(image_path, max_age=max_age)
+        except FileNotFoundError:
+            # Source deleted behind the index's back
+            image_catalog.discard(os.path.basename(image_path))
             return jsonify({'error': 'Image not found'}), 404
+        if immutable:
+            # Content-addressed names never change their bytes, so they can be cached forever
+            response.cache_control.immutable = True
+        return response
             
     except Exception as e:
-        print(f"❌ Error serving image {filename}: {e}")
+        logger.error("❌ Error serving image %s: %s", filename, e)
         return jsonify({'error': 'Image serving error'}), 500
 
 @app.route('/api/health', methods=['GET'])
@@ -544,7 +1514,7 @@ def health_check():
     """Enhanced health check with system status"""
     db_status = 'healthy'
     try:
-        connection = create_connection()
+        connection = get_connection()
         if connection:
             connection.close()
         else:
@@ -552,6 +1522,11 @@ def health_check():
     except:
         db_status = 'unhealthy'
     
+    try:
+        db_pool = pool_stats()
+    except Exception:
+        db_pool = None
+    
     # Check upload directory
     upload_dir_status = 'healthy' if os.path.exists(app.config['UPLOAD_FOLDER']) else 'unhealthy'
     images_dir_status = 'healthy' if os.path.exists(os.path.join(app.config['UPLOAD_FOLDER'], 'images')) else 'unhealthy'
@@ -562,6 +1537,8 @@ def health_check():
         'timestamp': datetime.now().isoformat(),
         'system': {
             'database': db_status,
+            'database_pool': db_pool,
+            'query_cache': query_cache.stats(),
             'upload_directory': upload_dir_status,
             'images_directory': images_dir_status
         },
@@ -573,14 +1550,31 @@ def health_check():
             'solution_images': True,
             'language_filtering': True,
             'pagination': True,
-            'statistics': True
+            'statistics': True,
+            'async_uploads': True,
+            'batch_uploads': True
         },
         'limits': {
-            'max_file_size': '16MB',
-            'allowed_extensions': list(ALLOWED_EXTENSIONS)
+            'max_file_size': f"{app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)}MB",
+            'allowed_extensions': list(ALLOWED_EXTENSIONS | ARCHIVE_EXTENSIONS)
         }
     })
 
+@app.route('/api/health/db-pool', methods=['GET'])
+def db_pool_stats():
+    """Connection pool statistics for sizing the pool"""
+    return jsonify(pool_stats()), 200
+
+@app.route('/api/health/cache', methods=['GET'])
+def query_cache_stats():
+    """Read cache hit, miss and eviction counters for tuning its size"""
+    return jsonify(query_cache.stats()), 200
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Prometheus text format: request latency, upload/parse stage durations, DB pool and cache counters"""
+    return Response(REGISTRY.render(), content_type=METRICS_CONTENT_TYPE)
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({'error': 'Endpoint not found'}), 404
@@ -591,7 +1585,8 @@ def internal_error(error):
 
 @app.errorhandler(413)
 def too_large(error):
-    return jsonify({'error': 'File too large. Maximum size is 16MB.'}), 413
+    limit_mb = app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)
+    return jsonify({'error': f'File too large. Maximum size is {limit_mb}MB.'}), 413
 
 if __name__ == '__main__':
     # Create necessary directories
@@ -0,0 +1,111 @@
+"""Compare per-row and chunked multi-row INSERTs for DOCX uploads.
+
+Runs against the MySQL database configured in database.DB_CONFIG using a
+scratch table (questions_bench) that is dropped afterwards.
+
+    python benchmarks/bench_bulk_insert.py
+    python benchmarks/bench_bulk_insert.py --sizes 100 1000 10000 --chunk-size 500 --repeat 3
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import create_connection, insert_questions_bulk, insert_questions_per_row
+from text_classify import question_fingerprint
+
+BENCH_TABLE = 'questions_bench'
+
+
+def make_rows(count):
+    rows = []
+    for i in range(count):
+        options = [
+            {"text": f"Option {chr(65 + j)} for question {i}", "is_correct": j == 2, "marks": 0, "image_path": None}
+            for j in range(4)
+        ]
+        text = f"Benchmark question {i}: which of the following statements is correct?"
+        rows.append((
+            text, text, 'multiple_choice', json.dumps(options), 'C',
+            f"Solution for question {i}", 1, None, None, 'english', datetime.now(), question_fingerprint(text, options)
+        ))
+    return rows
+
+
+def reset_table(cursor):
+    cursor.execute(f'DROP TABLE IF EXISTS {BENCH_TABLE}')
+    cursor.execute(f'''
+        CREATE TABLE {BENCH_TABLE} (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            question_text TEXT NOT NULL,
+            question_html TEXT,
+            question_type VARCHAR(32) NOT NULL,
+            options JSON,
+            correct_answer VARCHAR(500),
+            solution TEXT,
+            marks INT,
+            image_path VARCHAR(500),
+            solution_image_path VARCHAR(500),
+            language VARCHAR(16),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            text_hash CHAR(64)
+        )
+    ''')
+
+
+def run_once(connection, name, insert, rows):
+    cursor = connection.cursor()
+    reset_table(cursor)
+    started = time.perf_counter()
+    ids = insert(cursor, rows)
+    connection.commit()
+    elapsed = time.perf_counter() - started
+
+    # The returned ids must match what was actually stored, in order
+    cursor.execute(f'SELECT id FROM {BENCH_TABLE} ORDER BY id')
+    stored = [r[0] for r in cursor.fetchall()]
+    cursor.close()
+    if ids != stored:
+        raise AssertionError(f"{name} insert returned ids that do not match the stored rows")
+    return elapsed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    arg_parser.add_argument('--chunk-size', type=int, default=500)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    connection = create_connection()
+    if not connection:
+        sys.exit("Database connection failed")
+
+    modes = [
+        ('per_row', lambda cursor, rows: insert_questions_per_row(cursor, rows, table=BENCH_TABLE)),
+        ('bulk', lambda cursor, rows: insert_questions_bulk(cursor, rows, args.chunk_size, table=BENCH_TABLE)),
+    ]
+
+    print(f"{'questions':>10} {'mode':>8} {'best (s)':>10} {'rows/s':>12}")
+    try:
+        for size in args.sizes:
+            rows = make_rows(size)
+            results = {}
+            for name, insert in modes:
+                best = min(run_once(connection, name, insert, rows) for _ in range(args.repeat))
+                results[name] = best
+                print(f"{size:>10} {name:>8} {best:>10.4f} {size / best:>12.0f}")
+            print(f"{'':>10} {'speedup':>8} {results['per_row'] / results['bulk']:>10.1f}x")
+    finally:
+        cursor = connection.cursor()
+        cursor.execute(f'DROP TABLE IF EXISTS {BENCH_TABLE}')
+        cursor.close()
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Check that the python-docx and lxml parse engines produce the same
+questions, then time both.
+
+Every document is parsed by each engine into a scratch upload folder and
+the resulting question dicts must be identical, otherwise the script exits
+non-zero. --scale repeats the document body N times in a temporary copy to
+approximate long papers.
+
+    python benchmarks/bench_parse_engines.py uploads/question.docx --scale 200
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx_parser import DocxQuestionParser, PARSE_ENGINES
+
+DEFAULT_DOCX = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'uploads', 'question.docx')
+
+
+def scaled_copy(docx_path, scale, target_dir):
+    """Copy of docx_path whose body content is repeated `scale` times"""
+    target = os.path.join(target_dir, f'scaled_{scale}x_' + os.path.basename(docx_path))
+    with zipfile.ZipFile(docx_path) as source, zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED) as copy:
+        for item in source.infolist():
+            data = source.read(item.filename)
+            if item.filename == 'word/document.xml':
+                text = data.decode('utf-8')
+                start = text.index('>', text.index('<w:body')) + 1
+                end = text.rfind('<w:sectPr')
+                if end < start:
+                    end = text.rindex('</w:body>')
+                data = (text[:start] + text[start:end] * scale + text[end:]).encode('utf-8')
+            copy.writestr(item, data)
+    return target
+
+
+def parse(engine, docx_path, upload_folder):
+    parser = DocxQuestionParser(upload_folder, engine=engine)
+    started = time.perf_counter()
+    questions = parser.parse_docx(docx_path)
+    return questions, time.perf_counter() - started
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('docx', nargs='*', default=[DEFAULT_DOCX])
+    arg_parser.add_argument('--scale', type=int, default=1, help='repeat each document body this many times')
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix='qbk_parse_bench_')
+    failed = False
+    try:
+        for docx_path in args.docx:
+            if args.scale > 1:
+                docx_path = scaled_copy(docx_path, args.scale, scratch)
+
+            results = {}
+            for engine in PARSE_ENGINES:
+                timings = []
+                for _ in range(args.repeat):
+                    questions, elapsed = parse(engine, docx_path, os.path.join(scratch, engine))
+                    timings.append(elapsed)
+                results[engine] = (questions, min(timings))
+
+            reference = json.dumps(results[PARSE_ENGINES[0]][0], sort_keys=True, ensure_ascii=False)
+            print(f"\n{os.path.basename(docx_path)}: {len(results[PARSE_ENGINES[0]][0])} questions")
+            for engine, (questions, best) in results.items():
+                same = json.dumps(questions, sort_keys=True, ensure_ascii=False) == reference
+                failed = failed or not same
+                print(f"  {engine:<12} {best * 1000:>9.1f} ms  {'parity ok' if same else 'OUTPUT DIFFERS'}")
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    if failed:
+        sys.exit("Parse engines disagree")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""Show query plans and timings for the list/filter/stats queries before and
+after the index migrations in database.MIGRATIONS.
+
+Seeds a scratch table (questions_plan_bench) with synthetic rows, runs the
+queries with only the missing-column migration applied, then applies the
+index migration to the same table and runs them again.
+
+    python benchmarks/bench_query_plans.py --rows 200000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import (create_connection, insert_questions_bulk, MIGRATIONS, QUESTIONS_TABLE_DDL)
+
+BENCH_TABLE = 'questions_plan_bench'
+QUESTION_TYPES = ['multiple_choice', 'integer', 'fill_ups', 'true_false', 'comprehension']
+
+# name -> (query before the index migration, query after it)
+QUERIES = {
+    'list: language + type, newest first': (
+        f"SELECT * FROM {BENCH_TABLE} WHERE language = 'hindi' AND question_type = 'integer' "
+        f"ORDER BY created_at DESC, id DESC LIMIT 50",
+    ) * 2,
+    'list: unfiltered, keyset page': (
+        f"SELECT * FROM {BENCH_TABLE} WHERE (created_at < NOW() - INTERVAL 30 DAY) "
+        f"ORDER BY created_at DESC, id DESC LIMIT 50",
+    ) * 2,
+    'filter: with images': (
+        f"SELECT * FROM {BENCH_TABLE} WHERE (image_path IS NOT NULL OR solution_image_path IS NOT NULL) "
+        f"ORDER BY created_at DESC LIMIT 50",
+        f"SELECT * FROM {BENCH_TABLE} WHERE has_images = 1 ORDER BY created_at DESC, id DESC LIMIT 50",
+    ),
+    'count: language + type': (
+        f"SELECT COUNT(*) FROM {BENCH_TABLE} WHERE language = 'english' AND question_type = 'multiple_choice'",
+    ) * 2,
+    'stats: group by language': (
+        f"SELECT language, COUNT(*) FROM {BENCH_TABLE} GROUP BY language",
+    ) * 2,
+    'stats: recent activity': (
+        f"SELECT DATE(created_at), COUNT(*) FROM {BENCH_TABLE} "
+        f"WHERE created_at >= DATE_SUB(NOW(), INTERVAL 7 DAY) GROUP BY DATE(created_at)",
+    ) * 2,
+}
+
+
+def seed(connection, rows):
+    rng = random.Random(42)
+    now = datetime.now()
+    cursor = connection.cursor()
+    batch = []
+    for i in range(rows):
+        has_image = rng.random() < 0.2
+        batch.append((
+            f"Question {i}", f"Question {i}", rng.choice(QUESTION_TYPES), '[]', 'A', '', 1,
+            f"image{i}.png" if has_image else None, None,
+            rng.choice(['english', 'hindi']),
+            now - timedelta(minutes=rng.randint(0, 60 * 24 * 365)),
+            None
+        ))
+        if len(batch) == 5000:
+            insert_questions_bulk(cursor, batch, table=BENCH_TABLE)
+            batch = []
+    if batch:
+        insert_questions_bulk(cursor, batch, table=BENCH_TABLE)
+    connection.commit()
+    cursor.execute(f'ANALYZE TABLE {BENCH_TABLE}')
+    cursor.fetchall()
+    cursor.close()
+
+
+def explain(connection, query, repeat):
+    cursor = connection.cursor(dictionary=True)
+    cursor.execute('EXPLAIN ' + query)
+    plan = cursor.fetchall()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        cursor.execute(query)
+        cursor.fetchall()
+        timings.append(time.perf_counter() - started)
+    cursor.close()
+    return plan, min(timings)
+
+
+def report(label, plan, best):
+    print(f"  {label:<6} {best * 1000:>9.2f} ms")
+    for step in plan:
+        print(f"         type={step['type']} key={step['key']} rows={step['rows']} extra={step['Extra']}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--rows', type=int, default=100000)
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    connection = create_connection()
+    if not connection:
+        sys.exit("Database connection failed")
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f'DROP TABLE IF EXISTS {BENCH_TABLE}')
+        cursor.execute(QUESTIONS_TABLE_DDL.format(table=BENCH_TABLE))
+        # Migration 5 adds the text_hash column the seed rows fill
+        column_migrations = [m for m in MIGRATIONS if m[0] in (1, 5)]
+        index_migrations = [m for m in MIGRATIONS if m[0] not in (1, 5)]
+        for _, _, migrate in column_migrations:
+            migrate(cursor, BENCH_TABLE)
+
+        print(f"Seeding {args.rows} rows...")
+        seed(connection, args.rows)
+
+        before = {name: explain(connection, queries[0], args.repeat) for name, queries in QUERIES.items()}
+        for _, _, migrate in index_migrations:
+            migrate(cursor, BENCH_TABLE)
+        cursor.execute(f'ANALYZE TABLE {BENCH_TABLE}')
+        cursor.fetchall()
+        after = {name: explain(connection, queries[1], args.repeat) for name, queries in QUERIES.items()}
+
+        for name in QUERIES:
+            print(f"\n{name}")
+            report('before', *before[name])
+            report('after', *after[name])
+    finally:
+        cursor.execute(f'DROP TABLE IF EXISTS {BENCH_TABLE}')
+        cursor.close()
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
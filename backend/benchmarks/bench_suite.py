@@ -0,0 +1,243 @@
+"""Reproducible benchmark suite: synthetic papers through the parser and
+the Flask endpoints, with stored baselines.
+
+Parser scenarios generate bilingual papers with synthetic_docx and time
+DocxQuestionParser.parse_docx for every engine. Endpoint scenarios
+(--endpoints) upload papers and exercise the read endpoints through the
+Flask test client against a scratch MySQL database (DB_HOST/DB_USER/
+DB_PASSWORD as for the app, --database for the name; it is created if
+missing). The app relies on MySQL-only SQL (upserts, generated columns,
+GET_LOCK), so there is no SQLite stand-in.
+
+Each scenario reports p50/p99 latency and throughput. --save-baseline
+stores the results; later runs compare against the stored baseline and
+flag any scenario whose p50 grew by more than --tolerance.
+
+    python benchmarks/bench_suite.py --sizes 50,200 --repeat 5
+    python benchmarks/bench_suite.py --endpoints --save-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_docx import build_question_paper
+from docx_parser import DocxQuestionParser, PARSE_ENGINES
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'bench_suite.json')
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(samples)
+    rank = max(1, min(len(ordered), int(round(pct / 100 * len(ordered) + 0.5))))
+    return ordered[rank - 1]
+
+
+def summarize(samples, items_per_run, unit):
+    p50 = percentile(samples, 50)
+    return {
+        'runs': len(samples),
+        'p50_ms': round(p50 * 1000, 3),
+        'p99_ms': round(percentile(samples, 99) * 1000, 3),
+        'throughput': round(items_per_run / p50, 2) if p50 else None,
+        'unit': unit,
+    }
+
+
+def run_parse_scenarios(args, scratch):
+    results = {}
+    for size in args.sizes:
+        paper = os.path.join(scratch, f'paper_{size}.docx')
+        info = build_question_paper(paper, questions=size, image_ratio=args.image_ratio, seed=args.seed)
+        for engine in PARSE_ENGINES:
+            samples = []
+            for run in range(args.warmup + args.repeat):
+                # A fresh image folder each run, so image extraction always writes
+                upload_folder = os.path.join(scratch, f'parse_{engine}_{size}_{run}')
+                parser = DocxQuestionParser(upload_folder, engine=engine)
+                started = time.perf_counter()
+                questions = parser.parse_docx(paper)
+                elapsed = time.perf_counter() - started
+                shutil.rmtree(upload_folder, ignore_errors=True)
+                if run >= args.warmup:
+                    samples.append(elapsed)
+            if len(questions) != info['questions']:
+                sys.exit(f"parse/{engine}/{size}: expected {info['questions']} questions, got {len(questions)}")
+            results[f'parse/{engine}/{size}q'] = summarize(samples, info['questions'], 'questions/s')
+    return results
+
+
+def load_app(database, scratch):
+    """Import the app against a scratch database, with uploads kept in the scratch folder.
+    Returns None when the MySQL server cannot be reached."""
+    import mysql.connector
+    from database import DB_CONFIG
+
+    server = {key: value for key, value in DB_CONFIG.items() if key != 'database'}
+    try:
+        connection = mysql.connector.connect(**server)
+    except mysql.connector.Error as e:
+        print(f"\nSkipping endpoint scenarios: MySQL at {server['host']} is not reachable ({e})")
+        return None
+    cursor = connection.cursor()
+    cursor.execute(f'CREATE DATABASE IF NOT EXISTS `{database}` CHARACTER SET utf8mb4')
+    cursor.close()
+    connection.close()
+
+    DB_CONFIG['database'] = database
+    os.chdir(scratch)
+    os.makedirs('uploads/images', exist_ok=True)
+    import app as app_module
+    app_module.app.config['ASYNC_UPLOADS'] = False
+    return app_module
+
+
+def time_requests(client, method, url, count, **kwargs):
+    samples = []
+    for _ in range(count):
+        started = time.perf_counter()
+        response = client.open(url, method=method, **kwargs)
+        response.get_data()
+        samples.append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            sys.exit(f"{method} {url} returned {response.status_code}: {response.get_data(as_text=True)[:200]}")
+    return samples, response
+
+
+def run_endpoint_scenarios(args, scratch):
+    app_module = load_app(args.database, scratch)
+    if app_module is None:
+        return {}
+    client = app_module.app.test_client()
+    results = {}
+
+    paper = os.path.join(scratch, 'upload.docx')
+    info = build_question_paper(paper, questions=args.upload_size, image_ratio=args.image_ratio, seed=args.seed)
+    samples = []
+    question_ids = []
+    for run in range(args.upload_repeat):
+        # Change the seed so every upload holds new questions and images
+        build_question_paper(paper, questions=args.upload_size, image_ratio=args.image_ratio, seed=args.seed + run)
+        with open(paper, 'rb') as f:
+            started = time.perf_counter()
+            response = client.post('/api/upload-questions', data={'file': (f, 'upload.docx')},
+                                   content_type='multipart/form-data')
+            samples.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            sys.exit(f"upload returned {response.status_code}: {response.get_data(as_text=True)[:200]}")
+        question_ids.extend(response.get_json()['question_ids'])
+    results[f'http/upload/{args.upload_size}q'] = summarize(samples, info['questions'], 'questions/s')
+
+    question_id = question_ids[len(question_ids) // 2]
+    image = None
+    for candidate in question_ids:
+        question = client.get(f'/api/questions/{candidate}').get_json()
+        image = question.get('image_path') or question.get('solution_image_path')
+        if image:
+            break
+    reads = {
+        'http/list/page1': '/api/questions?page=1&per_page=20',
+        'http/list/page1_language': '/api/questions?page=1&per_page=20&language=english',
+        'http/list/cursor': '/api/questions?pagination=cursor&per_page=20',
+        'http/question': f'/api/questions/{question_id}',
+        'http/filter/images': '/api/questions/filter?has_images=true',
+        'http/search': '/api/questions/search?q=missing+series',
+        'http/stats': '/api/questions/stats',
+        'http/metrics': '/api/metrics',
+    }
+    if image:
+        reads['http/image'] = f'/api/images/{image}'
+    for name, url in reads.items():
+        samples, _ = time_requests(client, 'GET', url, args.requests)
+        results[name] = summarize(samples, 1, 'requests/s')
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Print results next to the baseline; returns the names of regressed scenarios"""
+    regressions = []
+    print(f"\n{'scenario':<32} {'p50 ms':>10} {'p99 ms':>10} {'throughput':>24}   vs baseline p50")
+    for name, result in results.items():
+        line = (f"{name:<32} {result['p50_ms']:>10.2f} {result['p99_ms']:>10.2f} "
+                f"{result['throughput'] or 0:>11.1f} {result['unit']:<12}")
+        previous = baseline.get(name)
+        if previous:
+            change = (result['p50_ms'] - previous['p50_ms']) / previous['p50_ms'] if previous['p50_ms'] else 0.0
+            flag = '  REGRESSION' if change > tolerance else ''
+            line += f"   {change:+.1%}{flag}"
+            if flag:
+                regressions.append(name)
+        else:
+            line += '   (new)'
+        print(line)
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--sizes', default='50,200', help='questions per language for parser scenarios')
+    arg_parser.add_argument('--image-ratio', type=float, default=0.2)
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    arg_parser.add_argument('--warmup', type=int, default=1)
+    arg_parser.add_argument('--seed', type=int, default=42)
+    arg_parser.add_argument('--endpoints', action='store_true', help='also run the Flask endpoint scenarios')
+    arg_parser.add_argument('--database', default='qbk_bench', help='scratch MySQL database for --endpoints')
+    arg_parser.add_argument('--upload-size', type=int, default=50)
+    arg_parser.add_argument('--upload-repeat', type=int, default=5)
+    arg_parser.add_argument('--requests', type=int, default=200, help='requests per read endpoint')
+    arg_parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    arg_parser.add_argument('--save-baseline', action='store_true')
+    arg_parser.add_argument('--tolerance', type=float, default=0.25, help='allowed p50 growth before flagging')
+    arg_parser.add_argument('--fail-on-regression', action='store_true')
+    args = arg_parser.parse_args()
+    args.sizes = [int(size) for size in args.sizes.split(',') if size]
+    baseline_path = os.path.abspath(args.baseline)
+
+    scratch = tempfile.mkdtemp(prefix='qbk_bench_')
+    cwd = os.getcwd()
+    try:
+        results = run_parse_scenarios(args, scratch)
+        if args.endpoints:
+            results.update(run_endpoint_scenarios(args, scratch))
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    baseline = {}
+    if os.path.exists(baseline_path):
+        with open(baseline_path) as f:
+            baseline = json.load(f).get('scenarios', {})
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        with open(baseline_path, 'w') as f:
+            json.dump({
+                'recorded_at': datetime.now().isoformat(timespec='seconds'),
+                'machine': {'python': platform.python_version(), 'platform': platform.platform(),
+                            'cpus': os.cpu_count()},
+                'settings': {'sizes': args.sizes, 'image_ratio': args.image_ratio, 'repeat': args.repeat,
+                             'seed': args.seed},
+                'scenarios': dict(baseline, **results),
+            }, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\nBaseline saved to {baseline_path}")
+
+    if regressions:
+        print(f"\n{len(regressions)} scenario(s) slower than baseline by more than {args.tolerance:.0%}")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Micro-benchmarks for the helpers in text_classify against the inline
+regex code they replaced in app.py and docx_parser.py.
+
+Each pair is checked for identical results before it is timed. The keyword
+benchmark also runs with a larger synthetic keyword list to show how the
+single-scan matcher scales compared with testing keywords one by one.
+
+    python benchmarks/bench_text_classify.py --number 20000
+"""
+import argparse
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx_parser import IMAGE_KEYWORDS
+from text_classify import KeywordMatcher, contains_devanagari, count_scripts, find_image_references
+
+ENGLISH = ("A man walks 5 km towards north and then turns to his right and walks 3 km. "
+           "How far is he from the starting point? Refer to the figure in the solution. ")
+HINDI = ("एक व्यक्ति उत्तर की ओर 5 किमी चलता है और फिर अपने दाएं मुड़कर 3 किमी चलता है। "
+         "वह प्रारंभिक बिंदु से कितनी दूर है? ")
+SOLUTION = "Distance = sqrt(5^2 + 3^2). See ![](media/image12.png) and media/image7.png for the path. "
+SAMPLES = {
+    'english': ENGLISH * 3,
+    'hindi': HINDI * 3,
+    'mixed': (ENGLISH + HINDI) * 2,
+    'solution': SOLUTION * 2,
+}
+
+
+def old_language_counts(text):
+    return len(re.findall(r'[ऀ-ॿ]', text)), len(re.findall(r'[a-zA-Z]', text))
+
+
+def old_is_hindi(text):
+    return bool(re.search(r'[ऀ-ॿ]', text))
+
+
+def old_image_references(text):
+    image_refs = []
+    all_matches = (re.findall(r'!\[\]\(media/(image\d+\.png)\)', text)
+                   + re.findall(r'src=["\']media/(image\d+\.png)["\']', text)
+                   + re.findall(r'media/(image\d+\.png)', text)
+                   + re.findall(r'(image\d+\.png)', text))
+    for match in all_matches:
+        if match not in image_refs:
+            image_refs.append(match)
+    return image_refs
+
+
+def compare(name, old, new, samples, number):
+    print(f"\n{name}")
+    for label, text in samples.items():
+        old_result, new_result = old(text), new(text)
+        if old_result != new_result:
+            sys.exit(f"{name} differs on {label}: {old_result!r} != {new_result!r}")
+        old_time = timeit.timeit(lambda: old(text), number=number)
+        new_time = timeit.timeit(lambda: new(text), number=number)
+        print(f"  {label:<10} old {old_time / number * 1e6:>8.2f} us   new {new_time / number * 1e6:>8.2f} us"
+              f"   x{old_time / new_time:.2f}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--number', type=int, default=20000, help='calls per timing')
+    arg_parser.add_argument('--keywords', type=int, default=500, help='size of the synthetic keyword list')
+    args = arg_parser.parse_args()
+
+    compare('count Devanagari/Latin characters', old_language_counts, count_scripts, SAMPLES, args.number)
+    compare('contains Devanagari', old_is_hindi, contains_devanagari, SAMPLES, args.number)
+    compare('image references', old_image_references, find_image_references, SAMPLES, args.number)
+
+    lowered = {label: text.lower() for label, text in SAMPLES.items()}
+    keywords = IMAGE_KEYWORDS.keywords
+    compare(f'image keywords ({len(keywords)})',
+            lambda text: any(keyword in text for keyword in keywords),
+            lambda text: IMAGE_KEYWORDS.search(text) is not None, lowered, args.number)
+
+    synthetic = [f'{word} {index}' for index in range(args.keywords) for word in ('figure', 'pattern')]
+    synthetic_matcher = KeywordMatcher(synthetic)
+    compare(f'synthetic keywords ({len(synthetic)})',
+            lambda text: any(keyword in text for keyword in synthetic),
+            lambda text: synthetic_matcher.search(text) is not None, lowered, max(1, args.number // 10))
+
+
+if __name__ == '__main__':
+    main()
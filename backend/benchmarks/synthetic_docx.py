@@ -0,0 +1,164 @@
+"""Generate synthetic bilingual question-paper DOCX files in the table
+layout DocxQuestionParser reads: one English table and one Hindi table per
+question, with Question/Type/Option/Answer/Solution/Marks rows.
+
+Output is deterministic for a given seed. Every image is a distinct tiny
+PNG, so the content-addressed image store sees each one as new content.
+
+    python benchmarks/synthetic_docx.py paper.docx --questions 500 --image-ratio 0.3 \\
+        --types multiple_choice=70,integer=10,fill_ups=10,true_false=10
+"""
+import argparse
+import io
+import random
+import struct
+import zlib
+
+from docx import Document
+from docx.shared import Inches
+
+QUESTION_TYPES = {
+    # type -> (English label, Hindi label)
+    'multiple_choice': ('Multiple Choice', 'बहुविकल्पीय'),
+    'integer': ('Integer', 'पूर्णांक'),
+    'fill_ups': ('Fill in the blanks', 'रिक्त स्थान'),
+    'true_false': ('True/False', 'सत्य/असत्य'),
+    'comprehension': ('Comprehension', 'अवबोधन'),
+}
+DEFAULT_TYPE_MIX = {'multiple_choice': 70, 'integer': 10, 'fill_ups': 10, 'true_false': 5, 'comprehension': 5}
+
+ENGLISH_STEMS = [
+    'A man walks 5 km towards north and then turns right. How far is he from the start?',
+    'Find the missing term in the series 3, 9, 27, ?, 243.',
+    'Which figure completes the pattern shown in the diagram?',
+    'Statements: All pens are books. Some books are bags. Which conclusions follow?',
+    'The ratio of the ages of A and B is 4:5. Find the age of A after 6 years.',
+]
+HINDI_STEMS = [
+    'एक व्यक्ति उत्तर की ओर 5 किमी चलता है और फिर दाएं मुड़ता है। वह कितनी दूर है?',
+    'श्रृंखला 3, 9, 27, ?, 243 में लुप्त पद ज्ञात कीजिए।',
+    'कौन सी आकृति दिए गए चित्र को पूरा करती है?',
+    'कथन: सभी पेन किताबें हैं। कुछ किताबें बैग हैं। कौन से निष्कर्ष अनुसरण करते हैं?',
+    'A और B की आयु का अनुपात 4:5 है। 6 वर्ष बाद A की आयु ज्ञात कीजिए।',
+]
+
+
+def tiny_png(index):
+    """A distinct 4x4 RGB PNG for every index"""
+    color = bytes([index & 0xFF, (index >> 8) & 0xFF, (index >> 16) & 0xFF])
+    raw = b''.join(b'\x00' + color * 4 for _ in range(4))
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', 4, 4, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(raw)) + chunk(b'IEND', b''))
+
+
+def parse_type_mix(text):
+    """'multiple_choice=70,integer=30' -> {'multiple_choice': 70, 'integer': 30}"""
+    mix = {}
+    for part in filter(None, (item.strip() for item in text.split(','))):
+        name, _, weight = part.partition('=')
+        if name not in QUESTION_TYPES:
+            raise ValueError(f"Unknown question type: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class _ImageCounter:
+    def __init__(self):
+        self.count = 0
+
+    def add(self, cell):
+        cell.paragraphs[0].add_run().add_picture(io.BytesIO(tiny_png(self.count + 1)), width=Inches(0.3))
+        self.count += 1
+
+
+def _add_row(table, *texts):
+    cells = table.add_row().cells
+    for cell, text in zip(cells, texts):
+        cell.text = text
+    return cells
+
+
+def _add_question_table(document, number, question_type, language, rng, images, with_images):
+    english = language == 'english'
+    stems = ENGLISH_STEMS if english else HINDI_STEMS
+    labels = ('Question', 'Type', 'Option', 'Answer', 'Solution', 'Marks') if english else \
+        ('प्रश्न', 'प्रकार', 'विकल्प', 'उत्तर', 'उपाय', 'अंक')
+    correct_word, wrong_word = ('correct', 'wrong') if english else ('सही', 'गलत')
+
+    table = document.add_table(rows=0, cols=3)
+    # The number leads the text so the parser's duplicate check keeps every question
+    cells = _add_row(table, labels[0], f"{number}. {rng.choice(stems)}")
+    if with_images:
+        images.add(cells[1])
+    _add_row(table, labels[1], QUESTION_TYPES[question_type][0 if english else 1])
+
+    correct = rng.randrange(4)
+    option_count = 4 if question_type == 'multiple_choice' else (2 if question_type == 'true_false' else 1)
+    for option in range(option_count):
+        cells = _add_row(table, labels[2], f"{rng.randint(1, 999)}",
+                         correct_word if option == correct % option_count else wrong_word)
+        if with_images and option == 0:
+            images.add(cells[1])
+
+    _add_row(table, labels[3], chr(65 + correct % option_count))
+    cells = _add_row(table, labels[4], f"{'Solution' if english else 'हल'} {number}: {rng.choice(stems)}")
+    if with_images:
+        images.add(cells[1])
+    _add_row(table, labels[5], f"{rng.choice([1, 2, 4])} 0")
+    document.add_paragraph('')
+
+
+def build_question_paper(path, questions=100, image_ratio=0.2, type_mix=None, bilingual=True, seed=42):
+    """Write a synthetic paper to path and return a summary of what it contains.
+
+    Questions with images get one in the question, first option and
+    solution cells of each language table. type_mix maps question types
+    to relative weights.
+    """
+    rng = random.Random(seed)
+    type_mix = type_mix or DEFAULT_TYPE_MIX
+    types, weights = zip(*type_mix.items())
+    document = Document()
+    images = _ImageCounter()
+    counts = dict.fromkeys(types, 0)
+
+    for number in range(1, questions + 1):
+        question_type = rng.choices(types, weights)[0]
+        counts[question_type] += 1
+        with_images = rng.random() < image_ratio
+        _add_question_table(document, number, question_type, 'english', rng, images, with_images)
+        if bilingual:
+            _add_question_table(document, number, question_type, 'hindi', rng, images, with_images)
+
+    document.save(path)
+    return {
+        'path': path,
+        'questions': questions * (2 if bilingual else 1),
+        'tables': questions * (2 if bilingual else 1),
+        'images': images.count,
+        'types': counts,
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('output')
+    arg_parser.add_argument('--questions', type=int, default=100, help='questions per language')
+    arg_parser.add_argument('--image-ratio', type=float, default=0.2, help='share of questions with images')
+    arg_parser.add_argument('--types', type=parse_type_mix, default=DEFAULT_TYPE_MIX,
+                            help='type=weight list, e.g. multiple_choice=70,integer=30')
+    arg_parser.add_argument('--english-only', action='store_true')
+    arg_parser.add_argument('--seed', type=int, default=42)
+    args = arg_parser.parse_args()
+
+    summary = build_question_paper(args.output, args.questions, args.image_ratio, args.types,
+                                   not args.english_only, args.seed)
+    print(summary)
+
+
+if __name__ == '__main__':
+    main()
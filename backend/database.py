@@ -1,42 +1,627 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
 import mysql.connector
 from mysql.connector import Error
+from metrics import DB_HOLD_SECONDS, DB_WAIT_SECONDS, current_operation
+from text_classify import question_fingerprint, text_fingerprint
+
+logger = logging.getLogger(__name__)
+
+DB_CONFIG = {
+    'host': os.environ.get('DB_HOST', 'localhost'),
+    'user': os.environ.get('DB_USER', 'root'),
+    'password': os.environ.get('DB_PASSWORD', ''),
+    'database': os.environ.get('DB_NAME', 'bulk_questions')
+}
+
+# Connection pool settings (overridable through the environment)
+POOL_CONFIG = {
+    'size': int(os.environ.get('DB_POOL_SIZE', 5)),                # connections kept open
+    'max_overflow': int(os.environ.get('DB_POOL_MAX_OVERFLOW', 10)),  # extra connections under bursts
+    'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),       # seconds to wait for a free connection
+    'pre_ping': os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true',  # health-check on borrow
+    'recycle': int(os.environ.get('DB_POOL_RECYCLE', 3600))        # max connection age in seconds (0 = never)
+}
+
+
+class PoolTimeout(Error):
+    """Raised when no pooled connection becomes free within the checkout timeout"""
+
+
+class PooledConnection:
+    """Proxy around a raw connection; close() hands it back to the pool"""
+
+    def __init__(self, pool, raw, created_at):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+        self._acquired_at = time.monotonic()
+
+    def __getattr__(self, name):
+        if self._raw is None:
+            raise Error("Connection already returned to the pool")
+        return getattr(self._raw, name)
+
+    def close(self):
+        if self._raw is not None:
+            raw, self._raw = self._raw, None
+            DB_HOLD_SECONDS.observe(time.monotonic() - self._acquired_at, current_operation())
+            self._pool.release(raw, self._created_at)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConnectionPool:
+    """Thread-safe MySQL connection pool with overflow, checkout timeout,
+    health-check-on-borrow and age based recycling"""
+
+    def __init__(self, size=5, max_overflow=10, timeout=10, pre_ping=True, recycle=3600, connect=None):
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.pre_ping = pre_ping
+        self.recycle = recycle
+        self._connect = connect or (lambda: mysql.connector.connect(**DB_CONFIG))
+        self._idle = deque()  # (raw connection, created_at)
+        self._cond = threading.Condition()
+        self._open = 0
+        self._in_use = 0
+        self._counters = {
+            'checkouts': 0,
+            'timeouts': 0,
+            'connections_created': 0,
+            'connections_recycled': 0,
+            'failed_health_checks': 0,
+            'overflow_closed': 0,
+            'wait_time_total': 0.0
+        }
+
+    def _discard(self, raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    def _new_connection(self):
+        raw = self._connect()
+        with self._cond:
+            self._counters['connections_created'] += 1
+        return raw, time.monotonic()
+
+    def _is_usable(self, raw, created_at):
+        if self.recycle and time.monotonic() - created_at > self.recycle:
+            with self._cond:
+                self._counters['connections_recycled'] += 1
+            return False
+        if self.pre_ping and not raw.is_connected():
+            with self._cond:
+                self._counters['failed_health_checks'] += 1
+            return False
+        return True
+
+    def acquire(self):
+        """Borrow a connection, waiting up to `timeout` seconds when the pool is exhausted"""
+        started = time.monotonic()
+        deadline = started + self.timeout
+        with self._cond:
+            while True:
+                if self._idle:
+                    raw, created_at = self._idle.pop()
+                    break
+                if self._open < self.size + self.max_overflow:
+                    raw, created_at = None, None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters['timeouts'] += 1
+                    raise PoolTimeout(f"No database connection available within {self.timeout}s")
+                self._cond.wait(remaining)
+            # Reserve the slot before doing any network I/O outside the lock
+            if raw is None:
+                self._open += 1
+            self._in_use += 1
+            waited = time.monotonic() - started
+            self._counters['checkouts'] += 1
+            self._counters['wait_time_total'] += waited
+        DB_WAIT_SECONDS.observe(waited)
+
+        try:
+            if raw is not None and not self._is_usable(raw, created_at):
+                self._discard(raw)
+                raw = None
+            if raw is None:
+                raw, created_at = self._new_connection()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        return PooledConnection(self, raw, created_at)
+
+    def release(self, raw, created_at):
+        """Return a connection; uncommitted work is rolled back so the next borrower starts clean"""
+        keep = True
+        try:
+            raw.rollback()
+        except Exception:
+            keep = False
+
+        to_close = None
+        with self._cond:
+            self._in_use -= 1
+            if keep and len(self._idle) < self.size:
+                self._idle.append((raw, created_at))
+            else:
+                self._open -= 1
+                if keep:
+                    self._counters['overflow_closed'] += 1
+                to_close = raw
+            self._cond.notify()
+
+        if to_close is not None:
+            self._discard(to_close)
+
+    def dispose(self):
+        """Close every idle connection (checked out ones are closed when returned)"""
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+            self._open -= len(idle)
+        for raw, _ in idle:
+            self._discard(raw)
+
+    def stats(self):
+        with self._cond:
+            checkouts = self._counters['checkouts']
+            return {
+                'size': self.size,
+                'max_overflow': self.max_overflow,
+                'timeout': self.timeout,
+                'pre_ping': self.pre_ping,
+                'recycle': self.recycle,
+                'open': self._open,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'overflow': max(0, self._open - self.size),
+                'checkouts': checkouts,
+                'timeouts': self._counters['timeouts'],
+                'connections_created': self._counters['connections_created'],
+                'connections_recycled': self._counters['connections_recycled'],
+                'failed_health_checks': self._counters['failed_health_checks'],
+                'overflow_closed': self._counters['overflow_closed'],
+                'avg_wait_ms': round(self._counters['wait_time_total'] * 1000 / checkouts, 3) if checkouts else 0.0
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def init_pool(**overrides):
+    """(Re)create the shared pool; keyword arguments override POOL_CONFIG"""
+    global _pool
+    config = dict(POOL_CONFIG, **overrides)
+    with _pool_lock:
+        old_pool, _pool = _pool, ConnectionPool(**config)
+    if old_pool:
+        old_pool.dispose()
+    return _pool
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(**POOL_CONFIG)
+    return _pool
+
+
+def get_connection():
+    """Borrow a pooled connection; call close() on it to give it back"""
+    try:
+        return get_pool().acquire()
+    except Error as e:
+        logger.error("Error getting pooled MySQL connection: %s", e)
+        return None
+
+
+def pool_stats():
+    return get_pool().stats()
+
+
+# Columns written by the DOCX upload path, in insert order
+QUESTION_INSERT_COLUMNS = (
+    'question_text', 'question_html', 'question_type', 'options', 'correct_answer',
+    'solution', 'marks', 'image_path', 'solution_image_path', 'language', 'created_at', 'text_hash'
+)
+
+# Columns an upsert compares and overwrites on a question whose text_hash (question_fingerprint) already exists
+QUESTION_CONTENT_COLUMNS = (
+    'question_text', 'question_html', 'question_type', 'options', 'correct_answer', 'solution', 'marks',
+    'image_path', 'solution_image_path', 'language'
+)
+
+BULK_INSERT_CHUNK_SIZE = int(os.environ.get('DB_BULK_INSERT_CHUNK_SIZE', 500))
+
+
+def insert_questions_per_row(cursor, rows, table='questions', progress_callback=None):
+    """Insert question rows one statement at a time; returns the new ids in order"""
+    columns = ', '.join(QUESTION_INSERT_COLUMNS)
+    placeholders = ', '.join(['%s'] * len(QUESTION_INSERT_COLUMNS))
+    query = f'INSERT INTO {table} ({columns}) VALUES ({placeholders})'
+
+    inserted_ids = []
+    for row in rows:
+        cursor.execute(query, row)
+        inserted_ids.append(cursor.lastrowid)
+        if progress_callback:
+            progress_callback(len(inserted_ids))
+    return inserted_ids
+
+
+def insert_questions_bulk(cursor, rows, chunk_size=None, table='questions', progress_callback=None):
+    """Insert question rows with chunked multi-row VALUES statements.
+
+    InnoDB hands a single multi-row INSERT a consecutive block of
+    AUTO_INCREMENT values and reports the first one as lastrowid, so the
+    ids of a chunk are lastrowid + n * auto_increment_increment.
+    progress_callback(rows_inserted) is called after every chunk.
+    """
+    chunk_size = max(1, chunk_size or BULK_INSERT_CHUNK_SIZE)
+    if not rows:
+        return []
+
+    cursor.execute('SELECT @@SESSION.auto_increment_increment')
+    increment = int(cursor.fetchone()[0] or 1)
+
+    columns = ', '.join(QUESTION_INSERT_COLUMNS)
+    row_placeholders = '(' + ', '.join(['%s'] * len(QUESTION_INSERT_COLUMNS)) + ')'
+
+    inserted_ids = []
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        query = f'INSERT INTO {table} ({columns}) VALUES ' + ', '.join([row_placeholders] * len(chunk))
+        params = [value for row in chunk for value in row]
+        cursor.execute(query, params)
+        first_id = cursor.lastrowid
+        inserted_ids.extend(first_id + i * increment for i in range(len(chunk)))
+        if progress_callback:
+            progress_callback(len(inserted_ids))
+    return inserted_ids
+
+
+def _same_content(column, old, new):
+    if column == 'options':
+        # MySQL hands JSON back re-serialized, so compare the decoded values
+        try:
+            return json.loads(old or 'null') == json.loads(new or 'null')
+        except ValueError:
+            return old == new
+    if column == 'marks':
+        return str(old) == str(new)
+    return (old or None) == (new or None)
+
+
+def upsert_questions(cursor, rows, chunk_size=None, table='questions', insert=None, progress_callback=None):
+    """Insert rows whose text_hash is new and update the ones already stored.
+
+    rows are in QUESTION_INSERT_COLUMNS order; text_hash is the
+    question_fingerprint of the text, options and images, so only the same
+    question matches. A stored question with the same text_hash (the
+    oldest one, if legacy duplicates exist) is updated
+    when any QUESTION_CONTENT_COLUMNS value differs and left alone
+    otherwise; a repeat of an earlier row in the same call is a duplicate.
+    Matched rows are locked until the caller's transaction ends.
+
+    Returns (outcomes, previous): outcomes[i] is (status, id) for rows[i]
+    with status 'inserted', 'updated', 'unchanged' or 'duplicate', and
+    previous maps each updated id to its old row (a dict) for stats.
+    """
+    insert = insert or (lambda cursor, rows, progress_callback=None: insert_questions_bulk(
+        cursor, rows, chunk_size, table=table, progress_callback=progress_callback))
+    hash_index = QUESTION_INSERT_COLUMNS.index('text_hash')
+    chunk_size = max(1, chunk_size or BULK_INSERT_CHUNK_SIZE)
+
+    hashes = list(dict.fromkeys(row[hash_index] for row in rows))
+    existing = {}
+    select_columns = ', '.join(('id', 'text_hash', 'created_at') + QUESTION_CONTENT_COLUMNS)
+    for start in range(0, len(hashes), chunk_size):
+        chunk = hashes[start:start + chunk_size]
+        cursor.execute(f'SELECT {select_columns} FROM {table} WHERE text_hash IN ({", ".join(["%s"] * len(chunk))}) '
+                       'ORDER BY id FOR UPDATE', chunk)
+        for values in cursor.fetchall():
+            stored = dict(zip(('id', 'text_hash', 'created_at') + QUESTION_CONTENT_COLUMNS, values))
+            existing.setdefault(stored['text_hash'], stored)
+
+    outcomes = [None] * len(rows)
+    previous = {}
+    first_seen = {}
+    new_rows = []  # (position, row)
+    for position, row in enumerate(rows):
+        text_hash = row[hash_index]
+        if text_hash in first_seen:
+            outcomes[position] = ('duplicate', first_seen[text_hash])
+            continue
+        first_seen[text_hash] = position
+        stored = existing.get(text_hash)
+        if stored is None:
+            new_rows.append((position, row))
+            continue
+        values = dict(zip(QUESTION_INSERT_COLUMNS, row))
+        if all(_same_content(column, stored[column], values[column]) for column in QUESTION_CONTENT_COLUMNS):
+            outcomes[position] = ('unchanged', stored['id'])
+            continue
+        # text_hash too, in case the stored one predates a change to its content
+        assignments = ', '.join(f'{column} = %s' for column in QUESTION_CONTENT_COLUMNS + ('text_hash',))
+        cursor.execute(f'UPDATE {table} SET {assignments} WHERE id = %s',
+                       [values[column] for column in QUESTION_CONTENT_COLUMNS] + [text_hash, stored['id']])
+        outcomes[position] = ('updated', stored['id'])
+        previous[stored['id']] = stored
+
+    inserted_ids = insert(cursor, [row for _, row in new_rows], progress_callback=progress_callback)
+    for (position, _), question_id in zip(new_rows, inserted_ids):
+        outcomes[position] = ('inserted', question_id)
+    # Repeats point at whatever their first occurrence became
+    for position, (status, first) in enumerate(outcomes):
+        if status == 'duplicate':
+            outcomes[position] = ('duplicate', outcomes[first][1])
+    return outcomes, previous
+
+
+def find_document(cursor, sha256, parser_version):
+    """Question ids recorded for a document fingerprint parsed by parser_version, or None"""
+    cursor.execute('SELECT question_ids FROM uploaded_documents WHERE sha256 = %s AND parser_version = %s',
+                   (sha256, parser_version))
+    row = cursor.fetchone()
+    if not row:
+        return None
+    question_ids = row['question_ids'] if isinstance(row, dict) else row[0]
+    return json.loads(question_ids) if isinstance(question_ids, (str, bytes)) else question_ids
+
+
+def record_document(cursor, sha256, filename, parser_version, question_ids):
+    """Remember which questions a document produced, so an identical re-upload can skip parsing"""
+    cursor.execute('''
+        INSERT INTO uploaded_documents (sha256, filename, parser_version, question_ids, uploads)
+        VALUES (%s, %s, %s, %s, 1)
+        ON DUPLICATE KEY UPDATE filename = VALUES(filename), parser_version = VALUES(parser_version),
+            question_ids = VALUES(question_ids), uploads = uploads + 1
+    ''', (sha256, filename, parser_version, json.dumps(question_ids)))
+
 
 def create_connection():
     try:
-        connection = mysql.connector.connect(
-            host='localhost',
-            user='root',
-            password='',
-            database='bulk_questions'
-        )
+        connection = mysql.connector.connect(**DB_CONFIG)
         return connection
     except Error as e:
-        print(f"Error connecting to MySQL: {e}")
+        logger.error("Error connecting to MySQL: %s", e)
         return None
 
+QUESTIONS_TABLE_DDL = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        question_text TEXT NOT NULL,
+        question_html TEXT,
+        question_type ENUM('multiple_choice', 'integer', 'fill_ups', 'true_false', 'comprehension') NOT NULL,
+        options JSON,
+        correct_answer VARCHAR(500),
+        solution TEXT,
+        marks INT,
+        image_path VARCHAR(500),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    )
+'''
+
+
+def _column_exists(cursor, table, column):
+    cursor.execute('''
+        SELECT COUNT(*) FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+    ''', (table, column))
+    return cursor.fetchone()[0] > 0
+
+
+def _index_exists(cursor, table, index):
+    cursor.execute('''
+        SELECT COUNT(*) FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+    ''', (table, index))
+    return cursor.fetchone()[0] > 0
+
+
+def _add_column(cursor, table, column, definition):
+    if not _column_exists(cursor, table, column):
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+
+
+def _add_index(cursor, table, index, columns):
+    if not _index_exists(cursor, table, index):
+        cursor.execute(f'ALTER TABLE {table} ADD INDEX {index} ({columns})')
+
+
+# Migrations are checked before every change so they also bring databases
+# that were patched by hand up to date. Never edit an applied migration;
+# append a new one instead.
+def _migration_missing_columns(cursor, table):
+    # app.py has always written these, but the original CREATE TABLE lacked them
+    _add_column(cursor, table, 'solution_image_path', 'VARCHAR(500) NULL AFTER image_path')
+    _add_column(cursor, table, 'language', "VARCHAR(16) NOT NULL DEFAULT 'english' AFTER solution_image_path")
+
+
+def _migration_filter_indexes(cursor, table):
+    # Image presence as an indexable column, mirroring the has_images filter
+    _add_column(cursor, table, 'has_images',
+                'TINYINT(1) AS (image_path IS NOT NULL OR solution_image_path IS NOT NULL) STORED')
+    # Serve the list/filter queries (equality filters + ORDER BY created_at DESC, id DESC)
+    # and the keyset range straight from the index
+    _add_index(cursor, table, 'idx_questions_lang_type_created', 'language, question_type, created_at, id')
+    _add_index(cursor, table, 'idx_questions_type_created', 'question_type, created_at, id')
+    _add_index(cursor, table, 'idx_questions_created', 'created_at, id')
+    _add_index(cursor, table, 'idx_questions_images_created', 'has_images, created_at, id')
+    _add_index(cursor, table, 'idx_questions_lang_images_created', 'language, has_images, created_at, id')
+
+
+def _migration_stats_tables(cursor, table):
+    # Summary tables kept current by the write paths, see question_stats.py
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS question_stats (
+            dimension VARCHAR(32) NOT NULL,
+            bucket VARCHAR(64) NOT NULL,
+            count BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            PRIMARY KEY (dimension, bucket)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS question_daily_counts (
+            day DATE PRIMARY KEY,
+            count BIGINT NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS question_stats_state (
+            id TINYINT PRIMARY KEY,
+            reconciled_at TIMESTAMP NULL
+        )
+    ''')
+
+
+def _migration_fulltext_search(cursor, table):
+    # ngram tokenizes by character runs, so Devanagari (no word spaces needed) is searchable too
+    if not _index_exists(cursor, table, 'ft_questions_text'):
+        cursor.execute(f'ALTER TABLE {table} ADD FULLTEXT INDEX ft_questions_text (question_text, solution) '
+                       'WITH PARSER ngram')
+
+
+
+def _migration_content_fingerprints(cursor, table):
+    # Normalized-text fingerprint of every question (text_classify.text_fingerprint), for upserts
+    _add_column(cursor, table, 'text_hash', 'CHAR(64) NULL')
+    last_id = 0
+    while True:
+        cursor.execute(f'SELECT id, question_text FROM {table} WHERE id > %s AND text_hash IS NULL '
+                       'ORDER BY id LIMIT 1000', (last_id,))
+        batch = cursor.fetchall()
+        if not batch:
+            break
+        cursor.executemany(f'UPDATE {table} SET text_hash = %s WHERE id = %s',
+                           [(text_fingerprint(text), question_id) for question_id, text in batch])
+        last_id = batch[-1][0]
+    _add_index(cursor, table, 'idx_questions_text_hash', 'text_hash')
+    # Whole-document fingerprints: an identical re-upload skips parsing
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS uploaded_documents (
+            sha256 CHAR(64) PRIMARY KEY,
+            filename VARCHAR(255),
+            parser_version INT NOT NULL,
+            question_ids JSON NOT NULL,
+            uploads INT NOT NULL DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+
+def _migration_question_fingerprints(cursor, table):
+    # text_hash becomes text_classify.question_fingerprint (text, options and images), so
+    # questions sharing only a stem no longer match; recompute every row written under migration 5
+    last_id = 0
+    while True:
+        cursor.execute(f'SELECT id, question_text, options, image_path, text_hash FROM {table} '
+                       'WHERE id > %s ORDER BY id LIMIT 1000', (last_id,))
+        batch = cursor.fetchall()
+        if not batch:
+            break
+        updates = []
+        for question_id, text, options, image_path, text_hash in batch:
+            try:
+                options = json.loads(options or '[]')
+            except ValueError:
+                options = []
+            if not isinstance(options, list):
+                options = []
+            options = [option for option in options if isinstance(option, dict)]
+            fingerprint = question_fingerprint(text, options, image_path)
+            if fingerprint != text_hash:
+                updates.append((fingerprint, question_id))
+        if updates:
+            cursor.executemany(f'UPDATE {table} SET text_hash = %s WHERE id = %s', updates)
+        last_id = batch[-1][0]
+
+
+MIGRATIONS = [
+    (1, 'add language and solution_image_path columns', _migration_missing_columns),
+    (2, 'composite indexes for list, filter and stats queries', _migration_filter_indexes),
+    (3, 'incrementally maintained statistics tables', _migration_stats_tables),
+    (4, 'ngram full-text index on question and solution text', _migration_fulltext_search),
+    (5, 'question text fingerprints and uploaded document fingerprints', _migration_content_fingerprints),
+    (6, 'question content fingerprints (text, options and images)', _migration_question_fingerprints),
+]
+
+
+def applied_migrations(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('SELECT version FROM schema_migrations')
+    return {row[0] for row in cursor.fetchall()}
+
+
+def run_migrations(connection, table='questions', target=None):
+    """Apply pending migrations in version order; returns the versions applied.
+
+    A named lock keeps several app processes starting at once from
+    migrating concurrently.
+    """
+    cursor = connection.cursor()
+    applied = []
+    cursor.execute("SELECT GET_LOCK('qbk_schema_migrations', 60)")
+    if cursor.fetchone()[0] != 1:
+        cursor.close()
+        raise Error("Timed out waiting for the schema migration lock")
+    try:
+        done = applied_migrations(cursor)
+        for version, name, migrate in MIGRATIONS:
+            if version in done or (target is not None and version > target):
+                continue
+            logger.info("Applying migration %s: %s", version, name)
+            migrate(cursor, table)
+            cursor.execute('INSERT INTO schema_migrations (version, name) VALUES (%s, %s)', (version, name))
+            connection.commit()
+            applied.append(version)
+    finally:
+        cursor.execute("SELECT RELEASE_LOCK('qbk_schema_migrations')")
+        cursor.fetchone()
+        cursor.close()
+    return applied
+
+
 def init_db():
     connection = create_connection()
     if connection:
         cursor = connection.cursor()
         
-        # Create questions table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS questions (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                question_text TEXT NOT NULL,
-                question_html TEXT,
-                question_type ENUM('multiple_choice', 'integer', 'fill_ups', 'true_false', 'comprehension') NOT NULL,
-                options JSON,
-                correct_answer VARCHAR(500),
-                solution TEXT,
-                marks INT,
-                image_path VARCHAR(500),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
-            )
-        ''')
+        # Create questions table (later columns and indexes come from MIGRATIONS)
+        cursor.execute(QUESTIONS_TABLE_DDL.format(table='questions'))
         
         connection.commit()
         cursor.close()
+        run_migrations(connection)
         connection.close()
-        print("Database initialized successfully")
\ No newline at end of file
+        logger.info("Database initialized successfully")
\ No newline at end of file
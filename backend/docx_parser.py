@@ -1,97 +1,291 @@
 import os
 import json
+import logging
 import zipfile
-import re
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from docx import Document
 from docx.oxml.ns import qn
+from lxml import etree
+from image_store import ImageStore, file_sha256
+from parse_cache import ParseCache
+from text_classify import (KeywordMatcher, WHITESPACE_RE, contains_devanagari, contains_latin, find_image_references,
+                           question_fingerprint)
+from logging_setup import configure_logging, worker_logging_settings
+from metrics import stage_timer
+
+logger = logging.getLogger(__name__)
+
+# 'python-docx' walks the document object model; 'lxml' streams word/document.xml
+PARSE_ENGINES = ('python-docx', 'lxml')
+
+# Bump whenever a change alters the questions parsed from the same document;
+# stored fingerprints of documents parsed by an older version are then ignored
+PARSER_VERSION = 2
+
+RELATIONSHIP = '{http://schemas.openxmlformats.org/package/2006/relationships}Relationship'
+W_BODY, W_TBL, W_TR, W_TC, W_P, W_R = (qn(tag) for tag in ('w:body', 'w:tbl', 'w:tr', 'w:tc', 'w:p', 'w:r'))
+W_T, W_TAB, W_BR, W_CR = (qn(tag) for tag in ('w:t', 'w:tab', 'w:br', 'w:cr'))
+W_TCPR, W_GRIDSPAN, W_VMERGE, W_VAL = (qn(tag) for tag in ('w:tcPr', 'w:gridSpan', 'w:vMerge', 'w:val'))
+
+
+# Keywords that indicate the question likely has an image
+IMAGE_KEYWORDS = KeywordMatcher([
+    # Direction questions
+    'walks straight', 'walks towards', 'turns left', 'turns right', 'direction',
+    'चलता है', 'मुड़ता है', 'दिशा',
+
+    # Family relation questions
+    'brother of', 'daughter of', 'grandmother', 'defeated',
+    'भाई', 'पुत्री', 'दादी', 'हराया',
+
+    # Venn diagram questions
+    'conclusions', 'statements', 'venn',
+    'निष्कर्ष', 'कथन',
+
+    # Pattern/visual questions
+    'find the missing term', 'missing term', 'pattern',
+    'लुप्त पद', 'आकृति',
+
+    # Diagram questions
+    'figure', 'diagram', 'chart', 'table',
+    'चित्र', 'आरेख'
+])
+
+
+def _docx_table_rows(table):
+    """(cells, cell_texts) for every row of a python-docx table, so detection and parsing share one read"""
+    rows = []
+    for row in table.rows:
+        cells = row.cells
+        rows.append(([cell._tc for cell in cells], [cell.text.strip() for cell in cells]))
+    return rows
+
+
+def _run_text(run):
+    parts = []
+    for child in run:
+        if child.tag == W_T:
+            parts.append(child.text or '')
+        elif child.tag == W_TAB:
+            parts.append('\t')
+        elif child.tag in (W_BR, W_CR):
+            parts.append('\n')
+    return ''.join(parts)
+
+
+def _cell_text(tc):
+    """Same text python-docx gives for cell.text: direct paragraphs joined by newlines"""
+    return '\n'.join(''.join(_run_text(run) for run in paragraph.iterchildren(W_R))
+                     for paragraph in tc.iterchildren(W_P))
+
+
+def _xml_table_rows(tbl):
+    """(cells, cell_texts) for every row of a w:tbl element.
+
+    Cells are laid out like python-docx's row.cells: a horizontally merged
+    cell repeats once per grid column it spans and a vertically merged
+    continuation repeats the cell that starts the merge.
+    """
+    rows = []
+    texts = {}
+    above = []
+    for tr in tbl.iterchildren(W_TR):
+        cells = []
+        for tc in tr.iterchildren(W_TC):
+            tc_pr = tc.find(W_TCPR)
+            span, continues = 1, False
+            if tc_pr is not None:
+                grid_span = tc_pr.find(W_GRIDSPAN)
+                if grid_span is not None:
+                    span = int(grid_span.get(W_VAL, 1))
+                v_merge = tc_pr.find(W_VMERGE)
+                continues = v_merge is not None and v_merge.get(W_VAL, 'continue') == 'continue'
+            if continues and len(cells) < len(above):
+                tc = above[len(cells)]
+            cells.extend([tc] * span)
+        for tc in cells:
+            if tc not in texts:
+                texts[tc] = _cell_text(tc).strip()
+        rows.append((cells, [texts[tc] for tc in cells]))
+        above = cells
+    return rows
+
+
+def _iter_xml_tables(docx_zip):
+    """Stream the top-level tables of word/document.xml as rows.
+
+    Only one table is held in memory at a time: each one is dropped from
+    the tree once the caller has consumed its rows. The caller owns (and
+    closes) docx_zip.
+    """
+    with docx_zip.open('word/document.xml') as document_xml:
+        for _, tbl in etree.iterparse(document_xml, events=('end',), tag=W_TBL,
+                                      resolve_entities=False, huge_tree=True):
+            body = tbl.getparent()
+            if body is None or body.tag != W_BODY:
+                continue  # nested table; python-docx's document.tables skips these too
+            yield _xml_table_rows(tbl)
+            tbl.clear()
+            while tbl.getprevious() is not None:
+                del body[0]
+
+
+class ImageIndex:
+    """Image bookkeeping for one document.
+
+    Maps relationship ids (the r:embed of an inline picture) to the media
+    file they point at, and hands every media file out at most once. The
+    keyword fallback (claim_next_unused) only draws from media that no
+    relationship embeds, so it never takes a figure that belongs to a
+    later table. Every lookup and claim is O(1).
+    """
+
+    def __init__(self, images, embed_targets):
+        self.images = images  # media name (image1.png) -> stored name
+        self.embed_targets = embed_targets  # relationship id (rId7) -> media name
+        self._unused = OrderedDict.fromkeys(images)  # not handed out yet
+        embedded = set(embed_targets.values())
+        self._fallback = OrderedDict((name, None) for name in images if name not in embedded)
+
+    @classmethod
+    def from_document(cls, document, images):
+        embed_targets = {}
+        for rel_id, rel in document.part.rels.items():
+            if rel.is_external or not rel.reltype.endswith('/image'):
+                continue
+            media_name = os.path.basename(rel.target_ref)
+            if media_name in images:
+                embed_targets[rel_id] = media_name
+        return cls(images, embed_targets)
+
+    @classmethod
+    def from_rels_xml(cls, rels_xml, images):
+        """Build the index from the raw word/_rels/document.xml.rels part"""
+        embed_targets = {}
+        for rel in etree.fromstring(rels_xml).iterchildren(RELATIONSHIP):
+            if rel.get('TargetMode') == 'External' or not rel.get('Type', '').endswith('/image'):
+                continue
+            media_name = os.path.basename(rel.get('Target', ''))
+            if media_name in images:
+                embed_targets[rel.get('Id')] = media_name
+        return cls(images, embed_targets)
+
+    def _claim(self, media_name):
+        if media_name not in self._unused:
+            return None  # unknown, or already handed out
+        del self._unused[media_name]
+        self._fallback.pop(media_name, None)
+        return media_name
+
+    def claim_embed(self, rel_id):
+        """Media name an r:embed id points at, marking it used; None if unknown or already claimed"""
+        return self._claim(self.embed_targets.get(rel_id))
+
+    def claim_name(self, media_name):
+        """Claim an image referenced by its media name, if the document has it and it is unclaimed"""
+        return self._claim(media_name)
+
+    def claim_next_unused(self):
+        """Oldest unclaimed image that no r:embed points at, or None"""
+        if not self._fallback:
+            return None
+        media_name, _ = self._fallback.popitem(last=False)
+        del self._unused[media_name]
+        return media_name
+
+    @property
+    def used_count(self):
+        return len(self.images) - len(self._unused)
+
+    @property
+    def unused_count(self):
+        return len(self._unused)
+
 
 class DocxQuestionParser:
-    def __init__(self, upload_folder):
+    def __init__(self, upload_folder, engine='python-docx', cache_max_bytes=0):
+        """cache_max_bytes > 0 keeps parse results in <upload_folder>/parse_cache, see ParseCache"""
+        if engine not in PARSE_ENGINES:
+            raise ValueError(f"Unknown parse engine: {engine}")
         self.upload_folder = upload_folder
+        self.engine = engine
         self.images_folder = os.path.join(upload_folder, 'images')
-        os.makedirs(self.images_folder, exist_ok=True)
-
-    def extract_images_from_docx(self, docx_path):
-        """Extract images physically stored in DOCX and save them in images folder"""
+        self.image_store = ImageStore(self.images_folder)
+        self.parse_cache = None
+        if cache_max_bytes:
+            self.parse_cache = ParseCache(os.path.join(upload_folder, 'parse_cache'), PARSER_VERSION,
+                                          cache_max_bytes)
+
+    def extract_images_from_docx(self, docx):
+        """Extract images physically stored in DOCX into the content-addressed image store
+
+        docx may be a path, an open binary file or an open ZipFile, so
+        parse_docx can share one opened package with the table reader.
+        Entries are streamed in fixed-size chunks and content that is
+        already stored is not written again.
+        Returns a dict mapping each media name inside the DOCX (image1.png)
+        to its stored name (<sha256>.png).
+        """
         images = {}
         try:
-            with zipfile.ZipFile(docx_path, 'r') as docx_zip:
-                for file_info in docx_zip.filelist:
-                    if file_info.filename.startswith('word/media/'):
-                        image_filename = os.path.basename(file_info.filename)
-                        image_path = os.path.join(self.images_folder, image_filename)
-
-                        with docx_zip.open(file_info.filename) as img:
-                            with open(image_path, 'wb') as f:
-                                f.write(img.read())
-
-                        images[image_filename] = image_filename
-                        print(f"📸 Extracted: {image_filename}")
+            if isinstance(docx, zipfile.ZipFile):
+                self._extract_media(docx, images)
+            else:
+                with zipfile.ZipFile(docx, 'r') as docx_zip:
+                    self._extract_media(docx_zip, images)
         except Exception as e:
-            print(f"❌ Error extracting images: {e}")
+            logger.error("❌ Error extracting images: %s", e)
 
         return images
 
+    def _extract_media(self, docx_zip, images):
+        """Store every word/media/ entry of an open package, recording name -> stored name in images"""
+        for file_info in docx_zip.filelist:
+            if file_info.filename.startswith('word/media/'):
+                image_filename = os.path.basename(file_info.filename)
+                extension = os.path.splitext(image_filename)[1]
+
+                stored_name, created = self.image_store.put_stream(
+                    lambda: docx_zip.open(file_info), extension,
+                    fingerprint=(file_info.CRC, file_info.file_size))
+
+                images[image_filename] = stored_name
+                status = "Extracted" if created else "Already stored"
+                logger.debug("📸 %s: %s -> %s", status, image_filename, stored_name)
+
     def extract_images_from_cell(self, cell):
-        """Extract image references from a specific table cell"""
+        """Relationship ids (r:embed) of the inline images in a table cell (a w:tc element)"""
         image_refs = []
         try:
             # Check for inline images in the cell
-            for paragraph in cell.paragraphs:
-                for run in paragraph.runs:
+            for paragraph in cell.iterchildren(W_P):
+                for run in paragraph.iterchildren(W_R):
                     # Look for graphic data in the run
-                    drawing = run._element.find('.//' + qn('w:drawing'))
+                    drawing = run.find('.//' + qn('w:drawing'))
                     if drawing is not None:
                         # Try to extract image reference
                         blip = drawing.find('.//' + qn('a:blip'))
                         if blip is not None:
                             embed = blip.get(qn('r:embed'))
                             if embed:
-                                # This is an embedded image reference
-                                image_ref = f"image{embed}.png"  # Simplified reference
-                                image_refs.append(image_ref)
-                                print(f"🖼 Found inline image in cell: {image_ref}")
+                                image_refs.append(embed)
+                                logger.debug("🖼 Found inline image in cell: %s", embed)
         except Exception as e:
-            print(f"⚠️ Error extracting images from cell: {e}")
+            logger.warning("⚠️ Error extracting images from cell: %s", e)
         
         return image_refs
 
     def extract_image_references_from_text(self, text):
-        """Extract image references from text using multiple pattern matching"""
-        image_refs = []
-        
-        if not text:
-            return image_refs
-            
-        # Pattern 1: Markdown style ![](media/imageX.png)
-        pattern1 = r'!\[\]\(media/(image\d+\.png)\)'
-        matches1 = re.findall(pattern1, text)
-        
-        # Pattern 2: HTML style with src attribute
-        pattern2 = r'src=["\']media/(image\d+\.png)["\']'
-        matches2 = re.findall(pattern2, text)
-        
-        # Pattern 3: Just the filename mentioned
-        pattern3 = r'media/(image\d+\.png)'
-        matches3 = re.findall(pattern3, text)
-        
-        # Pattern 4: Direct filename reference
-        pattern4 = r'(image\d+\.png)'
-        matches4 = re.findall(pattern4, text)
-        
-        # Combine all matches
-        all_matches = matches1 + matches2 + matches3 + matches4
-        
-        for match in all_matches:
-            if match not in image_refs:
-                image_refs.append(match)
-                print(f"🖼 Found image reference in text: {match}")
-        
+        """Extract image references (markdown, src attribute, media/ path or bare name) from text"""
+        image_refs = find_image_references(text)
+        for match in image_refs:
+            logger.debug("🖼 Found image reference in text: %s", match)
         return image_refs
 
     def is_hindi_text(self, text):
         """Check if text contains Hindi characters"""
-        return bool(re.search(r'[\u0900-\u097F]', text))
+        return contains_devanagari(text)
 
     def clean_text(self, text):
         """Clean text by removing duplicates but keep original content"""
@@ -99,7 +293,7 @@ class DocxQuestionParser:
             return ""
         
         # Remove extra whitespace but keep the original text structure
-        cleaned = re.sub(r'\s+', ' ', text).strip()
+        cleaned = WHITESPACE_RE.sub(' ', text).strip()
         
         # Remove exact duplicates (entire text repetition)
         if len(cleaned) > 10:
@@ -114,103 +308,184 @@ class DocxQuestionParser:
         question_text = question_data.get("question_text", "").lower()
         solution_text = question_data.get("solution", "").lower()
         
-        # Keywords that indicate the question likely has an image
-        image_keywords = [
-            # Direction questions
-            'walks straight', 'walks towards', 'turns left', 'turns right', 'direction',
-            'चलता है', 'मुड़ता है', 'दिशा',
-            
-            # Family relation questions  
-            'brother of', 'daughter of', 'grandmother', 'defeated',
-            'भाई', 'पुत्री', 'दादी', 'हराया',
-            
-            # Venn diagram questions
-            'conclusions', 'statements', 'venn',
-            'निष्कर्ष', 'कथन',
-            
-            # Pattern/visual questions
-            'find the missing term', 'missing term', 'pattern',
-            'लुप्त पद', 'आकृति',
-            
-            # Diagram questions
-            'figure', 'diagram', 'chart', 'table',
-            'चित्र', 'आरेख'
-        ]
-        
         # Check if question text contains any image-related keywords
-        has_image_indicator = any(keyword in question_text for keyword in image_keywords)
+        has_image_indicator = IMAGE_KEYWORDS.search(question_text) is not None
         
         # Also check solution text for image references
         has_solution_image_ref = bool(self.extract_image_references_from_text(solution_text))
         
         return has_image_indicator or has_solution_image_ref
 
-    def parse_docx(self, docx_path):
-        """Main parse function - STORE ALL QUESTIONS SEPARATELY"""
-        images = self.extract_images_from_docx(docx_path)
-        document = Document(docx_path)
+    def parse_docx(self, docx_path, progress_callback=None, document_sha256=None):
+        """Main parse function - STORE ALL QUESTIONS SEPARATELY
+
+        progress_callback, if given, is called after every table as
+        progress_callback(tables_done, tables_total, questions_parsed);
+        tables_total is None with the streaming lxml engine. With a parse
+        cache, a document parsed before (same SHA-256, computed unless
+        document_sha256 is passed) is returned from the cache as long as
+        its images are still stored.
+        """
+        timings = {}
+        if self.parse_cache:
+            with stage_timer('parse.cache_lookup', timings):
+                document_sha256 = document_sha256 or file_sha256(docx_path)
+                cached = self.parse_cache.get(document_sha256)
+                if cached is not None and not self.stored_images_present(cached):
+                    cached = None
+            if cached is not None:
+                logger.info("♻️ Parse cache hit: %d questions from %s", len(cached), os.path.basename(docx_path),
+                            extra={'event': 'parse_summary', 'file': os.path.basename(docx_path), 'cache': 'hit',
+                                   'questions': len(cached),
+                                   'stage_ms': {stage: round(seconds * 1000, 2)
+                                                for stage, seconds in timings.items()}})
+                return cached
+
+        # One open package (central directory read once) serves both the image extraction and the table reader
+        with open(docx_path, 'rb') as docx_file, zipfile.ZipFile(docx_file) as docx_zip:
+            with stage_timer('parse.extract_images', timings):
+                images = self.extract_images_from_docx(docx_zip)
+            docx_file.seek(0)
+            with stage_timer('parse.load_document', timings):
+                image_index, tables, tables_total = self.open_tables(docx_file, images, docx_zip)
+
+            logger.debug("📸 Total images extracted: %d", len(images))
+            logger.debug("📸 Image files: %s", list(images))
+
+            with stage_timer('parse.tables', timings):
+                questions = self.parse_tables(tables, tables_total, image_index, progress_callback)
+
+        hindi_questions = sum(1 for q in questions if self.is_hindi_text(q.get('question_text', '')))
+        with_images = sum(1 for q in questions if q.get('image_path'))
+        logger.info("🎉 Parsed %d questions from %s", len(questions), os.path.basename(docx_path), extra={
+            'event': 'parse_summary',
+            'file': os.path.basename(docx_path),
+            'engine': self.engine,
+            'questions': len(questions),
+            'english_questions': len(questions) - hindi_questions,
+            'hindi_questions': hindi_questions,
+            'questions_with_images': with_images,
+            'questions_without_images': len(questions) - with_images,
+            'images_extracted': len(images),
+            'images_used': image_index.used_count,
+            'images_unused': image_index.unused_count,
+            'cache': 'miss' if self.parse_cache else 'off',
+            'stage_ms': {stage: round(seconds * 1000, 2) for stage, seconds in timings.items()}
+        })
+
+        if self.parse_cache:
+            try:
+                self.parse_cache.put(document_sha256, questions)
+            except OSError as e:
+                logger.warning("⚠️ Could not cache parse result for %s: %s", os.path.basename(docx_path), e)
+        
+        return questions
 
+    def stored_images_present(self, questions):
+        """Whether every stored image the questions refer to is still in the image store"""
+        for question in questions:
+            names = [question.get("image_path"), question.get("solution_image_path")]
+            names.extend(option.get("image_path") for option in question.get("options") or [])
+            for name in names:
+                path = self.image_store.path_for(name) if name else None
+                if path and not os.path.exists(path):
+                    return False
+        return True
+
+    def open_tables(self, docx_file, images, docx_zip=None):
+        """Set up the configured engine on an open DOCX.
+
+        The lxml engine reads from docx_zip (the package already opened for
+        image extraction) when given; python-docx loads docx_file itself.
+
+        Returns (image_index, tables, tables_total) where tables yields each
+        top-level table as a list of (cells, cell_texts) rows. The lxml
+        engine streams, so it cannot know tables_total up front (None).
+        """
+        if self.engine == 'lxml':
+            docx_zip = docx_zip or zipfile.ZipFile(docx_file)
+            try:
+                rels_xml = docx_zip.read('word/_rels/document.xml.rels')
+            except KeyError:
+                rels_xml = b'<Relationships/>'
+            image_index = ImageIndex.from_rels_xml(rels_xml, images)
+            return image_index, _iter_xml_tables(docx_zip), None
+
+        document = Document(docx_file)
+        image_index = ImageIndex.from_document(document, images)
+        tables = document.tables
+        return image_index, (_docx_table_rows(table) for table in tables), len(tables)
+
+    def parse_tables(self, tables, tables_total, image_index, progress_callback=None):
+        """Classify and parse each table's rows into question dicts.
+
+        Image references are resolved to stored names, and each question
+        carries text_hash, its question_fingerprint, which also drops
+        repeats of a question (same text, options and images) within the
+        document.
+        """
         questions = []
-        image_keys = list(images.keys())
-        image_usage_tracker = {img: False for img in image_keys}  # Track which images are used
-        processed_questions = set()  # Track processed questions to avoid duplicates
-
-        print(f"📸 Total images extracted: {len(image_keys)}")
-        print(f"📸 Image files: {image_keys}")
+        processed_questions = set()  # text_hash of every question kept so far
 
-        for table_index, table in enumerate(document.tables):
-            print(f"\n🔍 Processing Table {table_index + 1}")
+        for table_index, table in enumerate(tables):
+            logger.debug("🔍 Processing Table %d", table_index + 1)
             
             # Check if this table contains English or Hindi
             table_language = self.detect_table_language(table)
-            print(f"📝 Table language: {table_language}")
+            logger.debug("📝 Table language: %s", table_language)
             
             if table_language == "english":
                 # Process English question as separate question
-                english_question = self.parse_question_table(table, "english", images, image_usage_tracker)
+                english_question = self.parse_question_table(table, "english", image_index)
                 if english_question and english_question.get("question_text"):
                     # Avoid duplicate questions
-                    question_hash = hash(english_question["question_text"][:100])  # Use first 100 chars as hash
+                    question_hash = self.fingerprint_question(english_question, image_index)
                     if question_hash not in processed_questions:
+                        english_question["text_hash"] = question_hash
                         questions.append(english_question)
                         processed_questions.add(question_hash)
-                        print(f"✅ Added English question: {english_question['question_text'][:80]}...")
+                        logger.debug("✅ Added English question: %.80s...", english_question['question_text'])
                     else:
-                        print(f"⚠️  Skipped duplicate English question")
+                        logger.debug("⚠️  Skipped duplicate English question")
             
             elif table_language == "hindi":
                 # Process Hindi question as separate question
-                hindi_question = self.parse_question_table(table, "hindi", images, image_usage_tracker)
+                hindi_question = self.parse_question_table(table, "hindi", image_index)
                 if hindi_question and hindi_question.get("question_text"):
                     # Avoid duplicate questions
-                    question_hash = hash(hindi_question["question_text"][:100])  # Use first 100 chars as hash
+                    question_hash = self.fingerprint_question(hindi_question, image_index)
                     if question_hash not in processed_questions:
+                        hindi_question["text_hash"] = question_hash
                         questions.append(hindi_question)
                         processed_questions.add(question_hash)
-                        print(f"✅ Added Hindi question: {hindi_question['question_text'][:80]}...")
+                        logger.debug("✅ Added Hindi question: %.80s...", hindi_question['question_text'])
                     else:
-                        print(f"⚠️  Skipped duplicate Hindi question")
+                        logger.debug("⚠️  Skipped duplicate Hindi question")
+
+            if progress_callback:
+                progress_callback(table_index + 1, tables_total, len(questions))
 
-        # Print image usage summary
-        used_images = [img for img, used in image_usage_tracker.items() if used]
-        unused_images = [img for img, used in image_usage_tracker.items() if not used]
-        
-        print(f"\n🎉 Total Questions Parsed: {len(questions)}")
-        print(f"📊 Language breakdown:")
-        print(f"   English questions: {len([q for q in questions if not self.is_hindi_text(q.get('question_text', ''))])}")
-        print(f"   Hindi questions: {len([q for q in questions if self.is_hindi_text(q.get('question_text', ''))])}")
-        print(f"   Questions with images: {len([q for q in questions if q.get('image_path')])}")
-        print(f"   Questions without images: {len([q for q in questions if not q.get('image_path')])}")
-        print(f"📸 Image Usage:")
-        print(f"   Used images: {len(used_images)}")
-        print(f"   Unused images: {len(unused_images)}")
-        
         return questions
 
-    def detect_table_language(self, table):
-        """Detect if table contains English or Hindi content"""
-        for row in table.rows:
-            cells = [cell.text.strip() for cell in row.cells]
+    def fingerprint_question(self, question_data, image_index):
+        """Point the question at its stored images, then return its question_fingerprint"""
+        # Stored names are content-addressed, so the fingerprint does not depend on the DOCX's media numbering
+        self.resolve_stored_image_names(question_data, image_index.images)
+        return question_fingerprint(question_data["question_text"], question_data.get("options"),
+                                    question_data.get("image_path"))
+
+    def resolve_stored_image_names(self, question_data, images):
+        """Replace DOCX media names (image1.png) with content-addressed store names"""
+        for field in ("image_path", "solution_image_path"):
+            if question_data.get(field):
+                question_data[field] = images.get(question_data[field], question_data[field])
+        for option in question_data.get("options", []):
+            if option.get("image_path"):
+                option["image_path"] = images.get(option["image_path"], option["image_path"])
+
+    def detect_table_language(self, rows):
+        """Detect if a table's (cells, cell_texts) rows contain English or Hindi content"""
+        for _, cells in rows:
             if not any(cells):
                 continue
             
@@ -226,12 +501,12 @@ class DocxQuestionParser:
             for cell_text in cells[1:]:
                 if self.is_hindi_text(cell_text):
                     return "hindi"
-                elif re.search(r'[a-zA-Z]', cell_text):
+                elif contains_latin(cell_text):
                     return "english"
         
         return "unknown"
 
-    def parse_english_option_row(self, cell_texts, option_cell=None, images=None, image_usage_tracker=None):
+    def parse_english_option_row(self, cell_texts, option_cell=None, image_index=None):
         """Parse English option row with format: Option   text   correctness"""
         if len(cell_texts) < 2:
             return None
@@ -252,22 +527,17 @@ class DocxQuestionParser:
         }
         
         # Check if option cell has an image
-        if option_cell and images and image_usage_tracker:
-            option_images = self.extract_images_from_cell(option_cell)
-            if option_images:
-                for img_ref in option_images:
-                    matching_images = [img for img in images 
-                                     if (img_ref in img or img.startswith('image')) 
-                                     and not image_usage_tracker.get(img, False)]
-                    if matching_images:
-                        option_data["image_path"] = matching_images[0]
-                        image_usage_tracker[matching_images[0]] = True
-                        print(f"🖼 Assigned option image: {matching_images[0]}")
-                        break
+        if option_cell is not None and image_index:
+            for rel_id in self.extract_images_from_cell(option_cell):
+                media_name = image_index.claim_embed(rel_id)
+                if media_name:
+                    option_data["image_path"] = media_name
+                    logger.debug("🖼 Assigned option image: %s", media_name)
+                    break
         
         return option_data
 
-    def parse_hindi_option_row(self, cell_texts, option_cell=None, images=None, image_usage_tracker=None):
+    def parse_hindi_option_row(self, cell_texts, option_cell=None, image_index=None):
         """Parse Hindi option row with format: विकल्प   text   correctness"""
         if len(cell_texts) < 2:
             return None
@@ -288,23 +558,18 @@ class DocxQuestionParser:
         }
         
         # Check if option cell has an image
-        if option_cell and images and image_usage_tracker:
-            option_images = self.extract_images_from_cell(option_cell)
-            if option_images:
-                for img_ref in option_images:
-                    matching_images = [img for img in images 
-                                     if (img_ref in img or img.startswith('image')) 
-                                     and not image_usage_tracker.get(img, False)]
-                    if matching_images:
-                        option_data["image_path"] = matching_images[0]
-                        image_usage_tracker[matching_images[0]] = True
-                        print(f"🖼 Assigned option image: {matching_images[0]}")
-                        break
+        if option_cell is not None and image_index:
+            for rel_id in self.extract_images_from_cell(option_cell):
+                media_name = image_index.claim_embed(rel_id)
+                if media_name:
+                    option_data["image_path"] = media_name
+                    logger.debug("🖼 Assigned option image: %s", media_name)
+                    break
         
         return option_data
 
-    def parse_question_table(self, table, language, images, image_usage_tracker):
-        """Parse individual question table for either English or Hindi"""
+    def parse_question_table(self, rows, language, image_index):
+        """Parse one question table, given as (cells, cell_texts) rows, for either English or Hindi"""
         question_data = {
             "question_text": "",
             "type": "multiple_choice",
@@ -319,12 +584,8 @@ class DocxQuestionParser:
 
         option_rows = []
         question_text_found = False
-        image_keys = list(images.keys())
 
-        for row_index, row in enumerate(table.rows):
-            cells = [cell for cell in row.cells]
-            cell_texts = [cell.text.strip() for cell in cells]
-            
+        for cells, cell_texts in rows:
             if not any(cell_texts):
                 continue
 
@@ -339,21 +600,16 @@ class DocxQuestionParser:
                     cleaned_text = self.clean_text(new_text)
                     question_data["question_text"] = cleaned_text
                     question_text_found = True
-                    print(f"✅ {language.title()} question set: {cleaned_text[:80]}...")
+                    logger.debug("✅ %s question set: %.80s...", language.title(), cleaned_text)
 
                     # Check if question cell has an image
-                    if question_cell:
-                        question_cell_images = self.extract_images_from_cell(question_cell)
-                        if question_cell_images:
-                            for img_ref in question_cell_images:
-                                matching_images = [img for img in image_keys 
-                                                 if (img_ref in img or img.startswith('image')) 
-                                                 and not image_usage_tracker.get(img, False)]
-                                if matching_images:
-                                    question_data["image_path"] = matching_images[0]
-                                    image_usage_tracker[matching_images[0]] = True
-                                    print(f"🖼 Assigned question cell image: {matching_images[0]}")
-                                    break
+                    if question_cell is not None:
+                        for rel_id in self.extract_images_from_cell(question_cell):
+                            media_name = image_index.claim_embed(rel_id)
+                            if media_name:
+                                question_data["image_path"] = media_name
+                                logger.debug("🖼 Assigned question cell image: %s", media_name)
+                                break
 
             elif "type" in key or "प्रकार" in key:
                 t = cell_texts[1].lower() if len(cell_texts) > 1 else ""
@@ -367,60 +623,50 @@ class DocxQuestionParser:
                     question_data["type"] = "comprehension"
                 else: 
                     question_data["type"] = "multiple_choice"
-                print(f"📂 Type: {question_data['type']}")
+                logger.debug("📂 Type: %s", question_data['type'])
 
             elif "option" in key or "विकल्प" in key:
                 # Parse options based on language
                 option_cell = cells[1] if len(cells) > 1 else None
                 if language == "english":
-                    option_data = self.parse_english_option_row(cell_texts, option_cell, image_keys, image_usage_tracker)
+                    option_data = self.parse_english_option_row(cell_texts, option_cell, image_index)
                 else:
-                    option_data = self.parse_hindi_option_row(cell_texts, option_cell, image_keys, image_usage_tracker)
+                    option_data = self.parse_hindi_option_row(cell_texts, option_cell, image_index)
                 
                 if option_data and option_data["text"]:
                     option_rows.append(option_data)
                     image_status = " with image" if option_data.get("image_path") else ""
-                    print(f"🔘 {language.title()} option: '{option_data['text']}' | Correct: {option_data['is_correct']}{image_status}")
+                    logger.debug("🔘 %s option: '%s' | Correct: %s%s", language.title(), option_data['text'], option_data['is_correct'], image_status)
 
             elif "answer" in key or "उत्तर" in key:
                 if len(cell_texts) > 1:
                     question_data["correct_answer"] = cell_texts[1]
-                    print(f"✔ Correct Answer from table: {cell_texts[1]}")
+                    logger.debug("✔ Correct Answer from table: %s", cell_texts[1])
 
             elif "solution" in key or "उपाय" in key:
                 solution_cell = cells[1] if len(cells) > 1 else None
                 if len(cell_texts) > 1:
                     solution_text = " ".join(cell_texts[1:]).strip()
                     question_data["solution"] = solution_text
-                    print(f"💡 Solution found for {language} question")
+                    logger.debug("💡 Solution found for %s question", language)
                     
                     # Check if solution cell has an image
-                    if solution_cell:
-                        solution_cell_images = self.extract_images_from_cell(solution_cell)
-                        if solution_cell_images:
-                            for img_ref in solution_cell_images:
-                                matching_images = [img for img in image_keys 
-                                                 if (img_ref in img or img.startswith('image')) 
-                                                 and not image_usage_tracker.get(img, False)]
-                                if matching_images:
-                                    question_data["solution_image_path"] = matching_images[0]
-                                    image_usage_tracker[matching_images[0]] = True
-                                    print(f"🖼 Assigned solution image: {matching_images[0]}")
-                                    break
+                    if solution_cell is not None:
+                        for rel_id in self.extract_images_from_cell(solution_cell):
+                            media_name = image_index.claim_embed(rel_id)
+                            if media_name:
+                                question_data["solution_image_path"] = media_name
+                                logger.debug("🖼 Assigned solution image: %s", media_name)
+                                break
                     
                     # Also check solution text for image references
                     if not question_data.get("solution_image_path"):
-                        solution_image_refs = self.extract_image_references_from_text(solution_text)
-                        if solution_image_refs:
-                            for img_ref in solution_image_refs:
-                                matching_images = [img for img in image_keys 
-                                                 if img_ref in img 
-                                                 and not image_usage_tracker.get(img, False)]
-                                if matching_images:
-                                    question_data["solution_image_path"] = matching_images[0]
-                                    image_usage_tracker[matching_images[0]] = True
-                                    print(f"🖼 Assigned solution text image: {matching_images[0]}")
-                                    break
+                        for img_ref in self.extract_image_references_from_text(solution_text):
+                            media_name = image_index.claim_name(img_ref)
+                            if media_name:
+                                question_data["solution_image_path"] = media_name
+                                logger.debug("🖼 Assigned solution text image: %s", media_name)
+                                break
 
             elif "marks" in key or "अंक" in key:
                 try:
@@ -429,7 +675,7 @@ class DocxQuestionParser:
                         marks_parts = marks_text.split()
                         if marks_parts:
                             question_data["marks"] = int(marks_parts[0])
-                            print(f"📊 Correct Answer Marks: {question_data['marks']}")
+                            logger.debug("📊 Correct Answer Marks: %s", question_data['marks'])
                 except:
                     question_data["marks"] = 1
 
@@ -442,13 +688,12 @@ class DocxQuestionParser:
         # Final image assignment check for question image
         if not question_data.get("image_path"):
             if self.question_has_image(question_data):
-                unused_images = [img for img in image_keys if not image_usage_tracker.get(img, False)]
-                if unused_images:
-                    question_data["image_path"] = unused_images[0]
-                    image_usage_tracker[unused_images[0]] = True
-                    print(f"🖼 Content-based image assignment: {unused_images[0]}")
+                media_name = image_index.claim_next_unused()
+                if media_name:
+                    question_data["image_path"] = media_name
+                    logger.debug("🖼 Content-based image assignment: %s", media_name)
             else:
-                print(f"ℹ️  No image assigned - question doesn't require one")
+                logger.debug("ℹ️  No image assigned - question doesn't require one")
         
         return question_data
 
@@ -460,7 +705,7 @@ class DocxQuestionParser:
             if option["text"] and option["text"].strip():
                 valid_options.append(option)
 
-        print(f"📦 Found {len(valid_options)} valid {language} options")
+        logger.debug("📦 Found %d valid %s options", len(valid_options), language)
         
         # Ensure exactly 4 options for multiple choice
         if len(valid_options) >= 4:
@@ -488,15 +733,16 @@ class DocxQuestionParser:
         if correct_options:
             correct_index = correct_options[0]
             question_data["correct_answer"] = chr(65 + correct_index)
-            print(f"✅ Correct answer set to: {question_data['correct_answer']}")
+            logger.debug("✅ Correct answer set to: %s", question_data['correct_answer'])
         elif question_data.get("correct_answer"):
-            print(f"✅ Using provided correct answer: {question_data['correct_answer']}")
+            logger.debug("✅ Using provided correct answer: %s", question_data['correct_answer'])
         
         # Debug: Print all options
-        for i, opt in enumerate(question_data["options"]):
-            status = "✓" if opt["is_correct"] else "✗"
-            image_status = " 📷" if opt.get("image_path") else ""
-            print(f"  {chr(65+i)}. {opt['text']} [{status}]{image_status}")
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, opt in enumerate(question_data["options"]):
+                status = "✓" if opt["is_correct"] else "✗"
+                image_status = " 📷" if opt.get("image_path") else ""
+                logger.debug("  %s. %s [%s]%s", chr(65+i), opt['text'], status, image_status)
 
     def process_other_options(self, option_rows, question_data, language):
         """Process options for non-multiple_choice questions"""
@@ -511,9 +757,67 @@ class DocxQuestionParser:
         correct_options = [i for i, opt in enumerate(valid_options) if opt["is_correct"]]
         if len(correct_options) == 1:
             question_data["correct_answer"] = chr(65 + correct_options[0])
-            print(f"✅ Correct answer set to: {question_data['correct_answer']}")
-        
-        print(f"📦 {language} options: {len(question_data['options'])}")
+            logger.debug("✅ Correct answer set to: %s", question_data['correct_answer'])
+        
+        logger.debug("📦 %s options: %d", language, len(question_data['options']))
+
+def _parse_docx_worker(upload_folder, docx_path, engine='python-docx', cache_max_bytes=0, document_sha256=None):
+    """Process pool entry point; lives at module level so it can be pickled"""
+    return DocxQuestionParser(upload_folder, engine, cache_max_bytes).parse_docx(
+        docx_path, document_sha256=document_sha256)
+
+
+def parse_docx_files(upload_folder, docx_paths, max_workers=None, progress_callback=None, engine='python-docx',
+                     cache_max_bytes=0, document_hashes=None):
+    """Parse several DOCX files in parallel, one process per core.
+
+    Returns a (questions, error) pair for every path, in input order, so a
+    file that fails to parse does not affect the others. progress_callback,
+    if given, is called as progress_callback(files_done, files_total).
+    cache_max_bytes enables the parse cache in every worker;
+    document_hashes, when given, holds each file's SHA-256.
+    """
+    document_hashes = document_hashes or [None] * len(docx_paths)
+    results = [None] * len(docx_paths)
+    if not docx_paths:
+        return results
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(docx_paths))
+
+    if max_workers == 1:
+        # Not worth the process start-up cost
+        for index, docx_path in enumerate(docx_paths):
+            try:
+                results[index] = (_parse_docx_worker(upload_folder, docx_path, engine, cache_max_bytes,
+                                                     document_hashes[index]), None)
+            except Exception as e:
+                logger.error("❌ Error parsing %s: %s", docx_path, e)
+                results[index] = (None, str(e))
+            if progress_callback:
+                progress_callback(index + 1, len(docx_paths))
+        return results
+
+    # Workers log through their own queue listener with the parent's settings
+    logging_settings = worker_logging_settings()
+    initializer = configure_logging if logging_settings else None
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=initializer,
+                             initargs=logging_settings or ()) as executor:
+        futures = {
+            executor.submit(_parse_docx_worker, upload_folder, docx_path, engine, cache_max_bytes,
+                            document_hashes[index]): index
+            for index, docx_path in enumerate(docx_paths)
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            index = futures[future]
+            try:
+                results[index] = (future.result(), None)
+            except Exception as e:
+                logger.error("❌ Error parsing %s: %s", docx_paths[index], e)
+                results[index] = (None, str(e))
+            if progress_callback:
+                progress_callback(done, len(docx_paths))
+
+    return results
 
 # Usage example:
 if __name__ == "__main__":
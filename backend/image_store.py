@@ -0,0 +1,217 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+
+# <sha256 hex>.<ext>, the only names the store hands out
+HASHED_NAME_RE = re.compile(r'^([0-9a-f]{64})(\.[a-z0-9]{1,8})?$')
+
+CHUNK_SIZE = 256 * 1024  # bytes read/written per step when streaming
+
+# (root, fingerprint, extension) -> stored name, for skipping content seen before
+_known_content = {}
+KNOWN_CONTENT_LIMIT = 100000
+
+
+def file_sha256(path, chunk_size=CHUNK_SIZE):
+    """SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ImageStore:
+    """Content-addressed image storage.
+
+    Files are named by the SHA-256 of their bytes and kept in two levels of
+    shard directories (images/ab/cd/abcd...png) so identical images are
+    stored once across all uploads and a name never changes its content.
+    Callers only ever see the flat '<hash>.<ext>' name; path_for() maps it
+    back to the sharded location.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    @staticmethod
+    def is_hashed_name(name):
+        return bool(HASHED_NAME_RE.match(name or ''))
+
+    def path_for(self, name):
+        """Sharded path of a hashed name, or None for names the store did not issue"""
+        match = HASHED_NAME_RE.match(name or '')
+        if not match:
+            return None
+        digest = match.group(1)
+        return os.path.join(self.root, digest[:2], digest[2:4], name)
+
+    def put_bytes(self, data, extension):
+        """Store data unless an identical file exists; returns (name, created)"""
+        extension = (extension or '').lower()
+        name = hashlib.sha256(data).hexdigest() + extension
+        path = self.path_for(name)
+        if os.path.exists(path):
+            return name, False
+
+        self._write_atomically(path, lambda f: f.write(data))
+        return name, True
+
+    def put_stream(self, open_source, extension, chunk_size=CHUNK_SIZE, fingerprint=None):
+        """Store the content of a stream without holding it in memory; returns (name, created).
+
+        open_source() must return a fresh binary file object. New content is
+        hashed while it is copied in chunk_size blocks to a temp file that is
+        then renamed into place. fingerprint is a cheap identity known up
+        front (a ZIP entry's CRC-32 and size): when it matches content stored
+        before, the stream is only hashed to confirm and nothing is written.
+        """
+        extension = (extension or '').lower()
+        known_key = (self.root, fingerprint, extension) if fingerprint is not None else None
+
+        if known_key:
+            known_name = _known_content.get(known_key)
+            if known_name and os.path.exists(self.path_for(known_name)):
+                digest = hashlib.sha256()
+                with open_source() as source:
+                    for chunk in iter(lambda: source.read(chunk_size), b''):
+                        digest.update(chunk)
+                if digest.hexdigest() + extension == known_name:
+                    return known_name, False
+
+        digest = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as target, open_source() as source:
+                for chunk in iter(lambda: source.read(chunk_size), b''):
+                    digest.update(chunk)
+                    target.write(chunk)
+            name = digest.hexdigest() + extension
+            path = self.path_for(name)
+            created = not os.path.exists(path)
+            if created:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        if known_key:
+            if len(_known_content) >= KNOWN_CONTENT_LIMIT:
+                _known_content.clear()
+            _known_content[known_key] = name
+        return name, created
+
+    def _write_atomically(self, path, write):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write beside the target and rename, so readers never see a partial file
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+class ImageCatalog:
+    """In-memory index of the servable images, so /api/images answers without touching the directory.
+
+    Holds the hashed names in an ImageStore plus the legacy flat files next
+    to its shard directories, the latter also by base name (image1 ->
+    image1.png) for links that lost or changed their extension. Built once
+    with build(); add() records files written afterwards. Names not found
+    are remembered for negative_ttl seconds. A miss on a hashed name that
+    is not negatively cached costs one stat, which picks up files written
+    by other processes (parse workers, other app instances).
+    """
+
+    def __init__(self, store, negative_ttl=60, negative_limit=10000):
+        self.store = store
+        self.negative_ttl = negative_ttl
+        self.negative_limit = negative_limit
+        self._hashed = set()
+        self._legacy = {}        # file name -> file name
+        self._legacy_bases = {}  # base name without extension -> first file name
+        self._missing = {}       # name -> monotonic time it was found missing
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def build(self):
+        """Scan the store root once; returns the number of files indexed"""
+        hashed, legacy, bases = set(), {}, {}
+        for entry in sorted(os.scandir(self.store.root), key=lambda entry: entry.name):
+            if entry.is_file():
+                if not entry.name.endswith('.tmp'):
+                    legacy[entry.name] = entry.name
+                    bases.setdefault(os.path.splitext(entry.name)[0], entry.name)
+            elif entry.is_dir() and len(entry.name) == 2:
+                for root, _, files in os.walk(entry.path):
+                    hashed.update(name for name in files if HASHED_NAME_RE.match(name))
+        with self._lock:
+            self._hashed, self._legacy, self._legacy_bases = hashed, legacy, bases
+            self._missing.clear()
+        return len(hashed) + len(legacy)
+
+    def add(self, name):
+        """Record a name the store just issued (or a legacy file just written)"""
+        if not name:
+            return
+        with self._lock:
+            if HASHED_NAME_RE.match(name):
+                self._hashed.add(name)
+            else:
+                self._legacy[name] = name
+                self._legacy_bases.setdefault(os.path.splitext(name)[0], name)
+            self._missing.pop(name, None)
+
+    def discard(self, name):
+        """Forget a name whose file turned out to be gone"""
+        with self._lock:
+            self._hashed.discard(name)
+            if self._legacy.pop(name, None):
+                base = os.path.splitext(name)[0]
+                if self._legacy_bases.get(base) == name:
+                    del self._legacy_bases[base]
+
+    def resolve(self, name):
+        """(path, immutable) for a requested image name, or None when there is no such image"""
+        if name in self._hashed:
+            self.hits += 1
+            return self.store.path_for(name), True
+        legacy_name = self._legacy.get(name) or self._legacy_bases.get(os.path.splitext(name)[0])
+        if legacy_name:
+            self.hits += 1
+            return os.path.join(self.store.root, legacy_name), False
+
+        missing_since = self._missing.get(name)
+        if missing_since is not None and time.monotonic() - missing_since < self.negative_ttl:
+            self.misses += 1
+            return None
+        path = self.store.path_for(name)
+        if path and os.path.isfile(path):
+            self.add(name)
+            self.hits += 1
+            return path, True
+        with self._lock:
+            if len(self._missing) >= self.negative_limit:
+                self._missing.clear()
+            self._missing[name] = time.monotonic()
+        self.misses += 1
+        return None
+
+    def stats(self):
+        return {
+            'hashed': len(self._hashed),
+            'legacy': len(self._legacy),
+            'negative_entries': len(self._missing),
+            'hits': self.hits,
+            'misses': self.misses
+        }
@@ -0,0 +1,107 @@
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from metrics import set_current_operation
+
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    """State of one background job; all updates go through update() so readers see a consistent snapshot"""
+
+    def __init__(self, kind, description=None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.description = description
+        self.status = 'queued'
+        self.stage = 'queued'
+        self.progress = {}
+        self.result = None
+        self.error = None
+        self.created_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def update(self, stage=None, **progress):
+        with self._lock:
+            if stage:
+                self.stage = stage
+            self.progress.update(progress)
+
+    @property
+    def finished(self):
+        return self.status in ('completed', 'failed')
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'job_id': self.id,
+                'kind': self.kind,
+                'description': self.description,
+                'status': self.status,
+                'stage': self.stage,
+                'progress': dict(self.progress),
+                'result': self.result,
+                'error': self.error,
+                'created_at': self.created_at.isoformat(),
+                'started_at': self.started_at.isoformat() if self.started_at else None,
+                'finished_at': self.finished_at.isoformat() if self.finished_at else None
+            }
+
+
+class JobManager:
+    """Runs jobs on a local thread pool and keeps a bounded registry of their state"""
+
+    def __init__(self, max_workers=2, max_finished_jobs=500):
+        self.max_finished_jobs = max_finished_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ingest')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind, fn, *args, description=None, **kwargs):
+        """Queue fn(job, *args, **kwargs); its return value becomes the job result"""
+        job = Job(kind, description)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job, fn, args, kwargs):
+        with job._lock:
+            job.status = 'running'
+            job.stage = 'running'
+            job.started_at = datetime.now()
+        set_current_operation(f'job:{job.kind}')
+        try:
+            result = fn(job, *args, **kwargs)
+            with job._lock:
+                job.result = result
+                job.status = 'completed'
+                job.stage = 'done'
+        except Exception as e:
+            logger.exception("❌ Job %s failed: %s", job.id, e)
+            with job._lock:
+                job.error = str(e)
+                job.status = 'failed'
+        finally:
+            set_current_operation(None)
+            with job._lock:
+                job.finished_at = datetime.now()
+
+    def _prune(self):
+        # Drop the oldest finished jobs once the registry grows past the limit
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,101 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+
+# Attributes every LogRecord has; anything else came from extra= and is structured data
+_STANDARD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener = None
+_configured_pid = None
+_settings = None  # (level, log_format) of the last configure_logging call
+
+
+def _structured_fields(record):
+    return {key: value for key, value in vars(record).items() if key not in _STANDARD_ATTRS}
+
+
+class KeyValueFormatter(logging.Formatter):
+    """Plain text lines with any extra= fields appended as key=value pairs"""
+
+    def format(self, record):
+        line = super().format(record)
+        fields = _structured_fields(record)
+        if fields:
+            line += ' ' + ' '.join(f'{key}={json.dumps(value, default=str, ensure_ascii=False)}'
+                                   for key, value in fields.items())
+        return line
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, for log collectors"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        entry.update(_structured_fields(record))
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def configure_logging(level=None, log_format=None):
+    """Route all logging through a QueueHandler so emitting never blocks on the output stream.
+
+    A QueueListener thread does the formatting and writing. level and
+    log_format ('text' or 'json') default to the LOG_LEVEL and LOG_FORMAT
+    environment variables. Calling it again reconfigures; in a forked child
+    process it starts the child's own listener.
+    """
+    global _listener, _configured_pid, _settings
+
+    level = (level or os.environ.get('LOG_LEVEL', 'INFO')).upper()
+    log_format = (log_format or os.environ.get('LOG_FORMAT', 'text')).lower()
+
+    if _listener is not None and _configured_pid == os.getpid():
+        _listener.stop()
+    _listener = None
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            root.removeHandler(handler)
+
+    output = logging.StreamHandler(sys.stderr)
+    if log_format == 'json':
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(KeyValueFormatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+
+    log_queue = queue.SimpleQueue()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    _configured_pid = os.getpid()
+    _settings = (level, log_format)
+
+
+def worker_logging_settings():
+    """(level, log_format) for configure_logging in a worker process, or None if logging is not set up"""
+    return _settings
+
+
+def stop_logging():
+    """Flush and stop the listener thread (registered to run at exit)"""
+    global _listener
+    if _listener is not None and _configured_pid == os.getpid():
+        _listener.stop()
+    _listener = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,127 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# Prometheus text exposition format, rendered in-process; nothing external to run
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_current = threading.local()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in list(zip(names, values)) + list(extra)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    if isinstance(value, float):
+        return '+Inf' if value == float('inf') else repr(value)
+    return str(value)
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label values"""
+
+    def __init__(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = sorted((key, list(values)) for key, values in self._series.items())
+        for label_values, values in series:
+            for bound, count in zip(self.buckets + (float('inf'),), values[:-2] + [values[-1]]):
+                labels = _labels(self.label_names, label_values, [('le', _number(float(bound)))])
+                lines.append(f'{self.name}_bucket{labels} {count}')
+            labels = _labels(self.label_names, label_values)
+            lines.append(f'{self.name}_sum{labels} {_number(values[-2])}')
+            lines.append(f'{self.name}_count{labels} {values[-1]}')
+        return lines
+
+
+class MetricsRegistry:
+    """Histograms recorded in-process plus collectors that read gauges/counters at scrape time"""
+
+    def __init__(self):
+        self._histograms = []
+        self._collectors = []
+
+    def histogram(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        histogram = Histogram(name, documentation, label_names, buckets)
+        self._histograms.append(histogram)
+        return histogram
+
+    def add_collector(self, collect):
+        """collect() returns (name, type, help, samples) tuples; samples are (labels dict, value)"""
+        self._collectors.append(collect)
+
+    def render(self):
+        lines = []
+        for histogram in self._histograms:
+            lines.extend(histogram.render())
+        for collect in self._collectors:
+            for name, metric_type, documentation, samples in collect():
+                lines.append(f'# HELP {name} {documentation}')
+                lines.append(f'# TYPE {name} {metric_type}')
+                for labels, value in samples:
+                    lines.append(f'{name}{_labels(labels.keys(), labels.values())} {_number(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    'qbk_http_request_duration_seconds', 'HTTP request latency until the response is returned',
+    ('method', 'endpoint', 'status'))
+STAGE_SECONDS = REGISTRY.histogram(
+    'qbk_stage_duration_seconds', 'Time spent in each upload and parse stage', ('stage',))
+DB_HOLD_SECONDS = REGISTRY.histogram(
+    'qbk_db_connection_hold_seconds', 'Time a pooled connection was held, by the operation that held it',
+    ('operation',))
+DB_WAIT_SECONDS = REGISTRY.histogram(
+    'qbk_db_pool_wait_seconds', 'Time spent waiting for a pooled connection',
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0))
+
+
+@contextmanager
+def stage_timer(stage, timings=None):
+    """Record the duration of a block under `stage`; also stores it in timings[stage] when given"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, stage)
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + elapsed
+
+
+def set_current_operation(operation):
+    """Label for DB time recorded on this thread (the request endpoint or job kind)"""
+    _current.operation = operation
+
+
+def current_operation():
+    return getattr(_current, 'operation', None) or 'background'
@@ -0,0 +1,96 @@
+import logging
+import os
+import pickle
+import tempfile
+import zlib
+
+logger = logging.getLogger(__name__)
+
+# Layout of a cache file; bump when the stored structure changes
+CACHE_FORMAT = 1
+
+
+class ParseCache:
+    """Parsed question lists kept on disk, keyed by document SHA-256 and parser version.
+
+    Each entry is a zlib-compressed pickle of {'format', 'parser_version',
+    'questions'} in its own file (<sha256>.v<version>.pickle.z), so a hit
+    is one read plus unpickling. Entries written by another parser version
+    or cache format are never read and are deleted by the next eviction
+    pass. The directory is kept under max_bytes by removing the least
+    recently used files (hits refresh the mtime). Only the app writes
+    here, so unpickling is safe; the cache holds no state in memory and
+    can be shared by parse worker processes.
+    """
+
+    def __init__(self, root, parser_version, max_bytes=256 * 1024 * 1024):
+        self.root = root
+        self.parser_version = parser_version
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+
+    def _suffix(self):
+        return f'.v{self.parser_version}.pickle.z'
+
+    def path_for(self, sha256):
+        return os.path.join(self.root, sha256 + self._suffix())
+
+    def get(self, sha256):
+        """Cached questions for a document, or None"""
+        path = self.path_for(sha256)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("⚠️ Dropping unreadable parse cache entry %s: %s", os.path.basename(path), e)
+            self._remove(path)
+            return None
+        if entry.get('format') != CACHE_FORMAT or entry.get('parser_version') != self.parser_version:
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return entry['questions']
+
+    def put(self, sha256, questions):
+        entry = {'format': CACHE_FORMAT, 'parser_version': self.parser_version, 'questions': questions}
+        data = zlib.compress(pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL), 1)
+        fd, temp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, self.path_for(sha256))
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        self.evict()
+
+    def evict(self):
+        """Delete entries of other parser versions, then the least recently used ones over max_bytes"""
+        suffix = self._suffix()
+        current = []
+        for entry in os.scandir(self.root):
+            if not entry.is_file() or entry.name.endswith('.tmp'):
+                continue
+            if not entry.name.endswith(suffix):
+                self._remove(entry.path)
+                continue
+            stat = entry.stat()
+            current.append((stat.st_mtime, entry.path, stat.st_size))
+        total = sum(size for _, _, size in current)
+        for _, path, size in sorted(current):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,206 @@
+import json
+import logging
+import threading
+from collections import Counter
+from datetime import date, datetime
+
+# Counters live in question_stats as (dimension, bucket) -> count and daily
+# activity in question_daily_counts; both are created by database.MIGRATIONS.
+# Every write path applies its delta in the same transaction as the write, so
+# reads never have to aggregate over the questions table.
+
+RECENT_ACTIVITY_DAYS = 7
+
+logger = logging.getLogger(__name__)
+
+
+def _has_option_images(options):
+    if isinstance(options, str):
+        try:
+            options = json.loads(options)
+        except ValueError:
+            return False
+    return any(isinstance(option, dict) and option.get('image_path') is not None for option in options or [])
+
+
+def stat_deltas(question, sign=1):
+    """Counter changes contributed by one questions row (sign=-1 to remove it)"""
+    deltas = Counter()
+    deltas[('total', 'all')] += sign
+    deltas[('language', question.get('language') or 'english')] += sign
+    deltas[('type', question.get('question_type') or 'multiple_choice')] += sign
+    # Same semantics as COUNT(column): any non-NULL path counts
+    if question.get('image_path') is not None:
+        deltas[('image', 'question')] += sign
+    if question.get('solution_image_path') is not None:
+        deltas[('image', 'solution')] += sign
+    if _has_option_images(question.get('options')):
+        deltas[('image', 'option')] += sign
+
+    created_at = question.get('created_at')
+    if isinstance(created_at, datetime):
+        deltas[('day', created_at.date())] += sign
+    elif isinstance(created_at, date):
+        deltas[('day', created_at)] += sign
+    return deltas
+
+
+def apply_stat_deltas(cursor, deltas):
+    """Apply a Counter from stat_deltas inside the caller's transaction.
+
+    Rows are touched in sorted order so concurrent writers lock them in
+    the same order and cannot deadlock each other.
+    """
+    counters = sorted((key, value) for key, value in deltas.items() if key[0] != 'day' and value)
+    days = sorted((key[1], value) for key, value in deltas.items() if key[0] == 'day' and value)
+
+    for (dimension, bucket), value in counters:
+        cursor.execute('''
+            INSERT INTO question_stats (dimension, bucket, count) VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE count = count + VALUES(count)
+        ''', (dimension, str(bucket), value))
+    for day, value in days:
+        cursor.execute('''
+            INSERT INTO question_daily_counts (day, count) VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE count = count + VALUES(count)
+        ''', (day, value))
+
+
+def read_stats(cursor):
+    """Stats response body, built from the summary tables only"""
+    cursor.execute('SELECT dimension, bucket, count, updated_at FROM question_stats WHERE count <> 0')
+    rows = cursor.fetchall()
+    cursor.execute('''
+        SELECT day AS date, count FROM question_daily_counts
+        WHERE day >= CURDATE() - INTERVAL %s DAY AND count > 0
+        ORDER BY day DESC
+    ''', (RECENT_ACTIVITY_DAYS,))
+    recent_activity = cursor.fetchall()
+    cursor.execute('SELECT reconciled_at FROM question_stats_state WHERE id = 1')
+    state = cursor.fetchone()
+
+    counts = {(row['dimension'], row['bucket']): row['count'] for row in rows}
+    language_stats = [{'language': bucket, 'count': count}
+                      for (dimension, bucket), count in sorted(counts.items()) if dimension == 'language']
+    type_stats = [{'question_type': bucket, 'count': count}
+                  for (dimension, bucket), count in sorted(counts.items()) if dimension == 'type']
+    total = counts.get(('total', 'all'), 0)
+    with_question_images = counts.get(('image', 'question'), 0)
+    with_solution_images = counts.get(('image', 'solution'), 0)
+    updated_at = max((row['updated_at'] for row in rows if row['updated_at']), default=None)
+
+    return {
+        'language_distribution': language_stats,
+        'type_distribution': type_stats,
+        'image_stats': {
+            'total': total,
+            'with_question_images': with_question_images,
+            'with_solution_images': with_solution_images,
+            'with_option_images': counts.get(('image', 'option'), 0),
+            'without_images': total - with_question_images - with_solution_images
+        },
+        'recent_activity': recent_activity,
+        'summary': {
+            'total_questions': total,
+            'total_languages': len(language_stats),
+            'total_types': len(type_stats)
+        },
+        'freshness': {
+            'updated_at': updated_at.isoformat() if updated_at else None,
+            'reconciled_at': state['reconciled_at'].isoformat() if state and state['reconciled_at'] else None,
+            'served_at': datetime.now().isoformat()
+        }
+    }
+
+
+def reconcile_stats(connection):
+    """Recompute every counter from the questions table and overwrite the summary.
+
+    The summary rows are locked first, so writers that commit during the
+    recount block until it is stored and then apply their own deltas on top.
+    Returns the number of counters whose stored value had drifted.
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute('SELECT dimension, bucket, count FROM question_stats FOR UPDATE')
+        stored = {(dimension, bucket): count for dimension, bucket, count in cursor.fetchall()}
+        cursor.execute('SELECT day, count FROM question_daily_counts FOR UPDATE')
+        stored.update({('day', day.isoformat()): count for day, count in cursor.fetchall()})
+
+        actual = Counter()
+        cursor.execute('SELECT language, COUNT(*) FROM questions GROUP BY language')
+        actual.update({('language', language): count for language, count in cursor.fetchall()})
+        cursor.execute('SELECT question_type, COUNT(*) FROM questions GROUP BY question_type')
+        actual.update({('type', question_type): count for question_type, count in cursor.fetchall()})
+        cursor.execute('SELECT COUNT(*), COUNT(image_path), COUNT(solution_image_path) FROM questions')
+        total, with_question_images, with_solution_images = cursor.fetchone()
+        actual[('total', 'all')] = total
+        actual[('image', 'question')] = with_question_images
+        actual[('image', 'solution')] = with_solution_images
+        cursor.execute('''
+            SELECT COUNT(*) FROM questions q
+            WHERE EXISTS (
+                SELECT 1 FROM JSON_TABLE(q.options, '$[*]' COLUMNS (image_path VARCHAR(500) PATH '$.image_path')) o
+                WHERE o.image_path IS NOT NULL AND o.image_path <> 'null'
+            )
+        ''')
+        actual[('image', 'option')] = cursor.fetchone()[0]
+        cursor.execute('SELECT DATE(created_at), COUNT(*) FROM questions GROUP BY DATE(created_at)')
+        actual.update({('day', day.isoformat()): count for day, count in cursor.fetchall() if day})
+
+        drifted = sum(1 for key in set(stored) | set(actual) if stored.get(key, 0) != actual.get(key, 0))
+
+        cursor.execute('DELETE FROM question_stats')
+        cursor.execute('DELETE FROM question_daily_counts')
+        for (dimension, bucket), count in sorted(actual.items()):
+            if dimension == 'day':
+                cursor.execute('INSERT INTO question_daily_counts (day, count) VALUES (%s, %s)', (bucket, count))
+            else:
+                cursor.execute('INSERT INTO question_stats (dimension, bucket, count) VALUES (%s, %s, %s)',
+                               (dimension, bucket, count))
+        cursor.execute('''
+            INSERT INTO question_stats_state (id, reconciled_at) VALUES (1, NOW())
+            ON DUPLICATE KEY UPDATE reconciled_at = NOW()
+        ''')
+        connection.commit()
+        return drifted
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def ensure_stats_seeded(connection):
+    """Run the first reconciliation if the summary tables have never been filled"""
+    cursor = connection.cursor()
+    cursor.execute('SELECT reconciled_at FROM question_stats_state WHERE id = 1')
+    state = cursor.fetchone()
+    cursor.close()
+    if not state or not state[0]:
+        logger.info("Seeding question statistics summary tables")
+        reconcile_stats(connection)
+
+
+def start_reconciler(get_connection, interval):
+    """Reconcile the summary tables every `interval` seconds on a daemon thread"""
+    stop = threading.Event()
+
+    def loop():
+        while not stop.wait(interval):
+            connection = get_connection()
+            if not connection:
+                continue
+            try:
+                drifted = reconcile_stats(connection)
+                if drifted:
+                    logger.warning("⚠️ Stats reconciliation corrected %d counters", drifted,
+                                   extra={'event': 'stats_reconciled', 'drifted': drifted})
+            except Exception as e:
+                logger.error("❌ Stats reconciliation failed: %s", e)
+            finally:
+                connection.close()
+
+    thread = threading.Thread(target=loop, name='stats-reconciler', daemon=True)
+    thread.start()
+    return stop
@@ -0,0 +1,54 @@
+"""Shared fixtures.
+
+Tests that need MySQL run against a scratch database (DB_HOST/DB_USER/
+DB_PASSWORD as for the app, QBK_TEST_DATABASE for the name; it is created
+if missing) and are skipped when the server cannot be reached. The app
+relies on MySQL-only SQL, so there is no SQLite stand-in.
+
+    python -m pytest -q tests
+"""
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'benchmarks'))  # synthetic_docx
+
+
+@pytest.fixture(scope='session')
+def mysql_database():
+    import mysql.connector
+    from database import DB_CONFIG
+
+    database = os.environ.get('QBK_TEST_DATABASE', 'qbk_test')
+    server = {key: value for key, value in DB_CONFIG.items() if key != 'database'}
+    try:
+        connection = mysql.connector.connect(**server)
+    except mysql.connector.Error as e:
+        pytest.skip(f"MySQL at {server['host']} is not reachable ({e})")
+    cursor = connection.cursor()
+    cursor.execute(f'CREATE DATABASE IF NOT EXISTS `{database}` CHARACTER SET utf8mb4')
+    cursor.close()
+    connection.close()
+    DB_CONFIG['database'] = database
+    return database
+
+
+@pytest.fixture(scope='session')
+def app_module(mysql_database, tmp_path_factory):
+    """The app imported against the scratch database, with uploads kept in a temp folder"""
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('app'))
+    os.makedirs('uploads/images', exist_ok=True)
+    import app as app_module
+    app_module.app.config['ASYNC_UPLOADS'] = False
+    yield app_module
+    os.chdir(cwd)
+
+
+@pytest.fixture
+def client(app_module):
+    app_module.query_cache.clear()
+    return app_module.app.test_client()
@@ -0,0 +1,53 @@
+import io
+
+import pytest
+from docx import Document
+from docx.shared import Inches
+
+from docx_parser import PARSE_ENGINES, DocxQuestionParser
+from synthetic_docx import build_question_paper, tiny_png
+
+
+def image_paths(questions):
+    paths = []
+    for question in questions:
+        paths += [question.get('image_path'), question.get('solution_image_path')]
+        paths += [option.get('image_path') for option in question.get('options') or []]
+    return [path for path in paths if path]
+
+
+def add_question(document, text, picture=None):
+    table = document.add_table(rows=0, cols=3)
+    cells = table.add_row().cells
+    cells[0].text, cells[1].text = 'Question', text
+    if picture is not None:
+        cells[1].paragraphs[0].add_run().add_picture(io.BytesIO(tiny_png(picture)), width=Inches(0.3))
+    for option in ('12', '14', '16', '18'):
+        cells = table.add_row().cells
+        cells[0].text, cells[1].text, cells[2].text = 'Option', option, 'wrong'
+    document.add_paragraph('')
+
+
+@pytest.mark.parametrize('engine', PARSE_ENGINES)
+def test_keyword_fallback_does_not_take_a_later_embedded_image(tmp_path, engine):
+    document = Document()
+    # Mentions a figure but embeds none, so only the keyword fallback could give it one
+    add_question(document, '1. Find the area of the shaded region in the figure.')
+    add_question(document, '2. What is the perimeter of the figure shown?', picture=1)
+    paper = str(tmp_path / 'paper.docx')
+    document.save(paper)
+
+    first, second = DocxQuestionParser(str(tmp_path / 'uploads'), engine=engine).parse_docx(paper)
+    assert first['image_path'] is None
+    assert second['image_path'] is not None
+
+
+@pytest.mark.parametrize('engine', PARSE_ENGINES)
+def test_no_image_is_assigned_twice(tmp_path, engine):
+    paper = str(tmp_path / 'paper.docx')
+    info = build_question_paper(paper, questions=60, image_ratio=0.5, seed=42)
+
+    questions = DocxQuestionParser(str(tmp_path / 'uploads'), engine=engine).parse_docx(paper)
+    paths = image_paths(questions)
+    assert len(paths) == len(set(paths))
+    assert len(paths) == info['images']
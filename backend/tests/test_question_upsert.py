@@ -0,0 +1,32 @@
+import uuid
+
+
+def paper_question(text):
+    return {
+        'question_text': text,
+        'type': 'multiple_choice',
+        'options': [{'text': option, 'is_correct': option == '14', 'marks': 0, 'image_path': None}
+                    for option in ('12', '14', '16', '18')],
+        'correct_answer': 'B',
+        'solution': 'Count the unit squares.',
+        'marks': 2,
+        'image_path': None,
+        'solution_image_path': None,
+    }
+
+
+def test_reupload_after_edit_is_unchanged(app_module, client):
+    original = paper_question(f'Find the area of the shaded region {uuid.uuid4().hex}.')
+    [(status, question_id)] = app_module.save_questions([original])
+    assert status == 'inserted'
+
+    corrected = paper_question(original['question_text'].replace('area', 'total area'))
+    response = client.put(f'/api/questions/{question_id}', json=dict(
+        corrected, question_type=corrected['type']))
+    assert response.status_code == 200
+
+    # The corrected paper now matches the edited row exactly
+    assert app_module.save_questions([corrected]) == [('unchanged', question_id)]
+    # and the original no longer matches it
+    [(status, other_id)] = app_module.save_questions([original])
+    assert status == 'inserted' and other_id != question_id
@@ -0,0 +1,14 @@
+def test_cursor_pagination_clamps_zero_per_page(client):
+    response = client.get('/api/questions?pagination=cursor&per_page=0')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['pagination']['per_page'] == 1
+    assert len(body['questions']) <= 1
+
+
+def test_offset_pagination_clamps_negative_values(client):
+    response = client.get('/api/questions?page=-3&per_page=-5')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['pagination']['per_page'] == 1
+    assert body['pagination']['page'] == 1
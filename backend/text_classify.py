@@ -0,0 +1,165 @@
+import hashlib
+import html
+import re
+import unicodedata
+
+# Shared by the parser and the API so every pattern is compiled once per process
+DEVANAGARI_RE = re.compile(r'[\u0900-\u097F]')
+LATIN_RE = re.compile(r'[a-zA-Z]')
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Characters with a meaning in MySQL BOOLEAN MODE full-text queries
+SEARCH_OPERATOR_RE = re.compile(r'[+\-<>()~*"@]+')
+
+# imageN.png references; the text around each match tells which reference style it is
+IMAGE_NAME_RE = re.compile(r'image\d+\.png')
+
+# Devanagari -> \x01, ASCII letters -> \x02; existing \x01/\x02 are dropped so they cannot be miscounted
+_SCRIPT_TABLE = {code: '\x01' for code in range(0x0900, 0x0980)}
+_SCRIPT_TABLE.update({ord(letter): '\x02' for letter in 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'})
+_SCRIPT_TABLE.update({0x01: None, 0x02: None})
+
+
+def count_scripts(text):
+    """(devanagari, latin) character counts, classified in one translate pass"""
+    if not text:
+        return 0, 0
+    classified = text.translate(_SCRIPT_TABLE)
+    return classified.count('\x01'), classified.count('\x02')
+
+
+def contains_devanagari(text):
+    return bool(text) and DEVANAGARI_RE.search(text) is not None
+
+
+def contains_latin(text):
+    return bool(text) and LATIN_RE.search(text) is not None
+
+
+def find_image_references(text):
+    """imageN.png names referenced in text, most specific reference style first.
+
+    Markdown links come first, then src attributes, then media/ paths and
+    finally bare names; each name is listed once.
+    """
+    if not text:
+        return []
+    ranked = []
+    for match in IMAGE_NAME_RE.finditer(text):
+        start, end = match.span()
+        before = text[max(0, start - 11):start]
+        after = text[end:end + 1]
+        if before.endswith('![](media/') and after == ')':
+            rank = 0
+        elif before[-11:-6] in ('src="', "src='") and before.endswith('media/') and after in ('"', "'"):
+            rank = 1
+        elif before.endswith('media/'):
+            rank = 2
+        else:
+            rank = 3
+        ranked.append((rank, start, match.group(0)))
+    ranked.sort()
+    return list(dict.fromkeys(name for _, _, name in ranked))
+
+
+class KeywordMatcher:
+    """Finds any of a fixed set of keywords in one scan of the text.
+
+    The keywords are folded into a trie and compiled into a single regular
+    expression (Aho-Corasick style: shared prefixes are tried once per
+    position), so the cost of a search barely grows with the number of
+    keywords, unlike testing each keyword with `in`.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = tuple(dict.fromkeys(keyword for keyword in keywords if keyword))
+        trie = {}
+        for keyword in self.keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = True
+        self.pattern = re.compile(self._trie_pattern(trie)) if self.keywords else None
+
+    @classmethod
+    def _trie_pattern(cls, node):
+        branches = [re.escape(char) + cls._trie_pattern(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            # A keyword ends here; longer keywords sharing the prefix are optional
+            pattern = '(?:' + pattern + ')?'
+        return pattern
+
+    def search(self, text):
+        """First keyword found in text (the longest one at the earliest position), or None"""
+        if not text or self.pattern is None:
+            return None
+        match = self.pattern.search(text)
+        return match.group(0) if match else None
+
+
+def normalize_text(text):
+    """NFKC-normalized, case-folded text with whitespace collapsed, for comparisons"""
+    return WHITESPACE_RE.sub(' ', unicodedata.normalize('NFKC', text or '').casefold()).strip()
+
+
+def text_fingerprint(text):
+    """SHA-256 hex of normalize_text(text).
+
+    Stable across processes and runs (unlike hash()), so it can be stored
+    and compared between uploads.
+    """
+    return hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+def question_fingerprint(question_text, options=None, image_path=None):
+    """SHA-256 hex identifying a question by its normalized text, option texts and images.
+
+    Image names are content-addressed, so questions sharing a short stem
+    ("Find the area of the shaded region.") but with different options or
+    figures get different fingerprints. The answer, solution and marks are
+    left out: changing them updates the same question.
+    """
+    parts = [normalize_text(question_text), image_path or '']
+    for option in options or []:
+        parts.append(normalize_text(option.get('text')) + '\x1f' + (option.get('image_path') or ''))
+    return hashlib.sha256('\x1e'.join(parts).encode('utf-8')).hexdigest()
+
+
+def search_terms(query, min_length=2):
+    """Distinct whitespace-separated terms of a search query, boolean-mode operators removed.
+
+    Terms shorter than min_length (the server's ngram_token_size) can never
+    match an ngram index and are dropped.
+    """
+    terms = SEARCH_OPERATOR_RE.sub(' ', query or '').split()
+    return list(dict.fromkeys(term for term in terms if len(term) >= min_length))
+
+
+def highlight_snippet(text, terms, width=160):
+    """HTML-escaped excerpt of text around the first term found, every match wrapped in <mark>.
+
+    Falls back to the start of the text when no term occurs in it; returns
+    '' for empty text.
+    """
+    if not text:
+        return ''
+    text = WHITESPACE_RE.sub(' ', text).strip()
+    pattern = re.compile('|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True)),
+                         re.IGNORECASE) if terms else None
+    first = pattern.search(text) if pattern else None
+    start = max(0, first.start() - width // 3) if first else 0
+    end = min(len(text), start + width)
+    start = max(0, end - width)
+    excerpt = text[start:end]
+
+    parts = []
+    position = 0
+    for match in (pattern.finditer(excerpt) if pattern else ()):
+        parts.append(html.escape(excerpt[position:match.start()]))
+        parts.append('<mark>' + html.escape(match.group(0)) + '</mark>')
+        position = match.end()
+    parts.append(html.escape(excerpt[position:]))
+    return ('…' if start > 0 else '') + ''.join(parts) + ('…' if end < len(text) else '')
@@ -0,0 +1,207 @@
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; without it /api/images serves originals only
+    Image = None
+
+# format parameter -> (Pillow format, mimetype, file extension)
+OUTPUT_FORMATS = {
+    'webp': ('WEBP', 'image/webp', '.webp'),
+    'png': ('PNG', 'image/png', '.png'),
+}
+
+FAILED_LIMIT = 10000  # derivatives remembered as unrenderable before the list is reset
+
+
+class ThumbnailError(Exception):
+    """The source image cannot be rendered (unsupported format such as EMF/WMF, or corrupt)"""
+
+
+def thumbnails_available():
+    return Image is not None
+
+
+class _Flight:
+    """One in-progress render that concurrent requests for the same derivative wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.error = None
+
+
+class ThumbnailCache:
+    """Resized / re-encoded image derivatives, rendered once and kept in a size-bounded directory.
+
+    A derivative is identified by its source name, the source file's size
+    and mtime, the requested bounds and the output format, so a changed
+    source never serves a stale rendering. Files are evicted least recently
+    used first once the directory holds more than max_bytes. Requests for a
+    derivative that is being rendered wait for that render instead of
+    starting their own. Sources Pillow cannot decode (EMF/WMF, corrupt
+    files) are remembered per derivative name and not reopened; errors
+    writing a derivative (ENOSPC, EMFILE) are raised as they are and
+    retried on the next request. The bound
+    is per process; other processes sharing the directory adopt each
+    other's files but evict independently, so a returned path can vanish
+    before it is read (see discard).
+    """
+
+    def __init__(self, root, max_bytes=256 * 1024 * 1024):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # file name -> size in bytes, least recently used first
+        self._flights = {}
+        self._failed = {}  # derivative name -> ThumbnailError
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.renders = 0
+        self.evictions = 0
+        self.failures = 0
+        os.makedirs(root, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        """Adopt derivatives left by an earlier run, oldest first"""
+        existing = []
+        for entry in os.scandir(self.root):
+            if entry.is_file() and not entry.name.endswith('.tmp'):
+                stat = entry.stat()
+                existing.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, name, size in sorted(existing):
+            self._entries[name] = size
+            self.total_bytes += size
+        with self._lock:
+            self._evict()
+
+    @staticmethod
+    def derivative_name(source_name, source_path, width, height, output_format):
+        stat = os.stat(source_path)
+        stem = os.path.splitext(source_name)[0]
+        return (f'{stem}-{stat.st_size:x}-{stat.st_mtime_ns:x}-w{width or 0}-h{height or 0}'
+                f'{OUTPUT_FORMATS[output_format][2]}')
+
+    def get(self, source_name, source_path, width=None, height=None, output_format='webp'):
+        """Path of the derivative, rendering it first if needed.
+
+        Raises ThumbnailError when Pillow is missing or cannot decode the
+        source, FileNotFoundError when the source is gone and other OSErrors
+        when the derivative cannot be written.
+        """
+        if Image is None:
+            raise ThumbnailError('Pillow is not installed')
+        name = self.derivative_name(source_name, source_path, width, height, output_format)
+        path = os.path.join(self.root, name)
+
+        with self._lock:
+            if name in self._entries:
+                self._entries.move_to_end(name)
+                self.hits += 1
+                return path
+            failed = self._failed.get(name)
+            if failed is not None:
+                raise failed
+            flight = self._flights.get(name)
+            leader = flight is None
+            if leader:
+                flight = self._flights[name] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error:
+                raise flight.error
+            return path
+
+        try:
+            if os.path.isfile(path):
+                size = os.path.getsize(path)  # rendered by another process
+            else:
+                size = self._render(source_path, path, width, height, output_format)
+                with self._lock:
+                    self.renders += 1
+            with self._lock:
+                self._entries[name] = size
+                self.total_bytes += size
+                self._evict()
+            return path
+        except ThumbnailError as e:
+            flight.error = e
+            with self._lock:
+                if len(self._failed) >= FAILED_LIMIT:
+                    self._failed.clear()
+                self._failed[name] = e
+                self.failures += 1
+            raise
+        except Exception as e:
+            flight.error = e  # waiters see it too, but the next request tries again
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(name, None)
+            flight.done.set()
+
+    def _render(self, source_path, path, width, height, output_format):
+        pillow_format = OUTPUT_FORMATS[output_format][0]
+        try:
+            source = Image.open(source_path)
+        except FileNotFoundError:
+            raise  # gone, not broken
+        except (OSError, ValueError, Image.DecompressionBombError) as e:
+            raise ThumbnailError(f'Cannot render {os.path.basename(source_path)}: {e}')
+        with source:
+            try:
+                source.load()
+                image = source
+                if width or height:
+                    # Fit inside the requested box, keeping the aspect ratio and never upscaling
+                    image.thumbnail((width or image.width, height or image.height), Image.LANCZOS)
+                if image.mode not in ('RGB', 'RGBA', 'L', 'LA', 'P'):
+                    image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+            except (OSError, ValueError, Image.DecompressionBombError) as e:
+                raise ThumbnailError(f'Cannot render {os.path.basename(source_path)}: {e}')
+            # Write errors are about the destination, so they are not ThumbnailErrors
+            fd, temp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    if pillow_format == 'WEBP':
+                        image.save(f, pillow_format, quality=80, method=4)
+                    else:
+                        image.save(f, pillow_format, optimize=True)
+                os.replace(temp_path, path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+        return os.path.getsize(path)
+
+    def discard(self, path):
+        """Forget a derivative whose file is gone (evicted by another thread or process)"""
+        with self._lock:
+            size = self._entries.pop(os.path.basename(path), None)
+            if size is not None:
+                self.total_bytes -= size
+
+    def _evict(self):
+        # Called with the lock held; the newest entry stays even if it alone exceeds the budget
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            name, size = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(os.path.join(self.root, name))
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'renders': self.renders,
+            'evictions': self.evictions,
+            'failures': self.failures
+        }
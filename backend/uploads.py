@@ -0,0 +1,100 @@
+import hashlib
+import logging
+import os
+import tempfile
+
+from flask import Request, current_app
+from werkzeug.utils import secure_filename
+
+logger = logging.getLogger(__name__)
+
+
+class UploadTempFile:
+    """Uniquely named file in the upload temp folder that hashes the bytes as they are written.
+
+    Werkzeug's multipart parser writes each uploaded file into the stream
+    returned by Request._get_file_stream chunk by chunk, so the upload goes
+    to disk as it arrives and is never copied afterwards.
+    """
+
+    def __init__(self, directory, filename=None, checksum='sha256'):
+        os.makedirs(directory, exist_ok=True)
+        suffix = os.path.splitext(secure_filename(filename or ''))[1]
+        fd, self.path = tempfile.mkstemp(prefix='upload_', suffix=suffix, dir=directory)
+        self._file = os.fdopen(fd, 'w+b')
+        self._digest = hashlib.new(checksum) if checksum else None
+        self.checksum_name = checksum or None
+        self.size = 0
+
+    def write(self, data):
+        if self._digest:
+            self._digest.update(data)
+        self.size += len(data)
+        return self._file.write(data)
+
+    @property
+    def checksum(self):
+        """Hex digest of everything written, or None when checksums are disabled"""
+        return self._digest.hexdigest() if self._digest else None
+
+    def __getattr__(self, name):
+        # read/seek/tell/flush/close etc. go to the underlying file
+        if name == '_file':
+            raise AttributeError(name)
+        return getattr(self._file, name)
+
+    def __iter__(self):
+        return iter(self._file)
+
+
+class StreamingUploadRequest(Request):
+    """Request whose uploaded files stream into UploadTempFile objects.
+
+    The temp files are removed when the request ends unless a handler
+    claimed them with claim_upload() to pass them on (to a background job).
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        stream = UploadTempFile(current_app.config['UPLOAD_TEMP_FOLDER'], filename,
+                                current_app.config['UPLOAD_CHECKSUM'] or None)
+        self.upload_temp_files.append(stream)
+        return stream
+
+    @property
+    def upload_temp_files(self):
+        if 'upload_temp_files' not in self.__dict__:
+            self.__dict__['upload_temp_files'] = []
+        return self.__dict__['upload_temp_files']
+
+    def cleanup_uploads(self):
+        for stream in self.__dict__.pop('upload_temp_files', []):
+            try:
+                stream.close()
+                if os.path.exists(stream.path):
+                    os.remove(stream.path)
+            except OSError as e:
+                logger.warning("⚠️ Error removing upload temp file %s: %s", stream.path, e)
+
+
+def claim_upload(request, file_storage):
+    """Path of an uploaded file's temp copy, now owned by the caller rather than the request"""
+    stream = file_storage.stream
+    stream.close()
+    if stream in request.upload_temp_files:
+        request.upload_temp_files.remove(stream)
+    return stream.path
+
+
+def upload_sha256(file_storage):
+    """SHA-256 computed while the upload streamed in, or None if another (or no) checksum was configured"""
+    stream = file_storage.stream
+    return stream.checksum if getattr(stream, 'checksum_name', None) == 'sha256' else None
+
+
+def upload_info(file_storage):
+    """Size and on-the-fly checksum of an uploaded file, for responses and logs"""
+    stream = file_storage.stream
+    info = {'filename': file_storage.filename, 'size': getattr(stream, 'size', None)}
+    if getattr(stream, 'checksum_name', None):
+        info[stream.checksum_name] = stream.checksum
+    return info
@@ -6,6 +6,9 @@ const QuestionList = () => {
   const [questions, setQuestions] = useState([]);
   const [loading, setLoading] = useState(true);
   const [editingQuestion, setEditingQuestion] = useState(null);
+  // Full questions fetched on demand; the list endpoint only returns a compact summary
+  const [details, setDetails] = useState({});
+  const [expanded, setExpanded] = useState({});
   const [error, setError] = useState('');
   const [filters, setFilters] = useState({
     language: '',
@@ -38,7 +41,7 @@ const QuestionList = () => {
       const queryString = params.toString();
       const url = queryString ? `/api/questions/filter?${queryString}` : '/api/questions';
       
-      const response = await questionService.getQuestions(queryString ? { params: filterParams } : {});
+      const response = await questionService.getQuestions(Object.fromEntries(params));
       setQuestions(response.data.questions || response.data);
     } catch (error) {
       setError('Error loading questions: ' + error.message);
@@ -64,12 +67,13 @@ const QuestionList = () => {
     }
   };
 
-  const getImageUrl = (imagePath) => {
+  // Cards show images at most ~350px wide; ask for a resized copy (2x for high-DPI screens)
+  const getImageUrl = (imagePath, width = 700) => {
     if (!imagePath || imagePath === 'null' || imagePath === 'None') return null;
     
     // Extract filename from path (handles both / and \ separators)
     const filename = imagePath.split(/[\\/]/).pop();
-    return `http://localhost:5000/api/images/${filename}`;
+    return `http://localhost:5000/api/images/${filename}?w=${width}`;
   };
 
   const handleFilterChange = (filterType, value) => {
@@ -83,8 +87,32 @@ const QuestionList = () => {
     loadQuestions();
   };
 
-  const handleEdit = (question) => {
-    setEditingQuestion(question);
+  const loadDetails = async (id) => {
+    if (details[id]) return details[id];
+    const response = await questionService.getQuestion(id);
+    setDetails(current => ({ ...current, [id]: response.data }));
+    return response.data;
+  };
+
+  const toggleDetails = async (id) => {
+    if (expanded[id]) {
+      setExpanded({ ...expanded, [id]: false });
+      return;
+    }
+    try {
+      await loadDetails(id);
+      setExpanded(current => ({ ...current, [id]: true }));
+    } catch (error) {
+      setError('Error loading question: ' + error.message);
+    }
+  };
+
+  const handleEdit = async (question) => {
+    try {
+      setEditingQuestion(await loadDetails(question.id));
+    } catch (error) {
+      setError('Error loading question: ' + error.message);
+    }
   };
 
   const handleDelete = async (id) => {
@@ -102,9 +130,8 @@ const QuestionList = () => {
   const handleUpdate = async (updatedQuestion) => {
     try {
       await questionService.updateQuestion(updatedQuestion.id, updatedQuestion);
-      setQuestions(questions.map(q => 
-        q.id === updatedQuestion.id ? updatedQuestion : q
-      ));
+      setDetails({ ...details, [updatedQuestion.id]: updatedQuestion });
+      loadQuestions(filters);
       setEditingQuestion(null);
       loadStats(); // Refresh stats after update
     } catch (error) {
@@ -325,14 +352,16 @@ const QuestionList = () => {
             </div>
           ) : (
             <div className="row">
-              {questions.map((question) => {
-                const questionImageUrl = getImageUrl(question.image_path);
-                const solutionImageUrl = getImageUrl(question.solution_image_path);
-                const hasQuestionImage = !!questionImageUrl;
-                const hasSolutionImage = !!solutionImageUrl;
-                const options = getOptions(question);
-                const correctAnswer = getCorrectAnswer(question);
-                const hasOptionImages = options.some(opt => getOptionImage(opt));
+              {questions.map((summary) => {
+                const isExpanded = !!expanded[summary.id];
+                const question = (isExpanded && details[summary.id]) || summary;
+                const questionImageUrl = isExpanded ? getImageUrl(question.image_path) : null;
+                const solutionImageUrl = isExpanded ? getImageUrl(question.solution_image_path) : null;
+                const hasQuestionImage = summary.has_question_image;
+                const hasSolutionImage = summary.has_solution_image;
+                const hasOptionImages = summary.has_option_images;
+                const options = isExpanded ? getOptions(question) : [];
+                const correctAnswer = isExpanded ? getCorrectAnswer(question) : null;
                 
                 return (
                   <div key={question.id} className="col-md-6 col-lg-4 mb-4">
@@ -361,10 +390,18 @@ const QuestionList = () => {
                         <h6 className="card-title text-primary">Question:</h6>
                         <p className="card-text question-text" style={{ whiteSpace: 'pre-wrap' }}>
                           {question.question_text}
+                          {!isExpanded && summary.question_text_truncated && '…'}
                         </p>
                         
+                        <button
+                          className="btn btn-sm btn-link px-0 mb-2"
+                          onClick={() => toggleDetails(summary.id)}
+                        >
+                          {isExpanded ? 'Hide details' : 'Show options, answer and solution'}
+                        </button>
+                        
                         {/* Question Image Section */}
-                        {hasQuestionImage ? (
+                        {isExpanded && (questionImageUrl ? (
                           <div className="mb-3">
                             <div className="d-flex justify-content-between align-items-center mb-2">
                               <small className="text-success">
@@ -404,7 +441,7 @@ const QuestionList = () => {
                               No question image
                             </small>
                           </div>
-                        )}
+                        ))}
 
                         {/* Options */}
                         {options.length > 0 && (
@@ -489,7 +526,7 @@ const QuestionList = () => {
                         )}
 
                         {/* Solution */}
-                        {question.solution && (
+                        {isExpanded && question.solution && (
                           <div className="mt-3">
                             <div className="d-flex justify-content-between align-items-center">
                               <strong className="text-primary">Solution:</strong>
@@ -505,7 +542,7 @@ const QuestionList = () => {
                             </div>
                             
                             {/* Solution Image */}
-                            {hasSolutionImage && (
+                            {solutionImageUrl && (
                               <div className="mt-2">
                                 <div className="d-flex justify-content-between align-items-center mb-2">
                                   <small className="text-success">
@@ -25,7 +25,7 @@ const QuestionUpload = () => {
     setUploading(true);
     try {
       const response = await questionService.uploadQuestions(file);
-      setMessage(`Successfully uploaded ${response.data.question_ids.length} questions`);
+      setMessage(response.data.message);
       setFile(null);
       document.getElementById('file-input').value = '';
     } catch (error) {
@@ -19,9 +19,9 @@ export const questionService = {
     });
   },
 
-  // Get all questions
-  getQuestions: () => {
-    return api.get('/questions');
+  // Get questions (compact list view unless params.fields says otherwise)
+  getQuestions: (params = {}) => {
+    return api.get('/questions', { params });
   },
 
   // Get single question